@@ -6,56 +6,50 @@ This agent analyzes incoming IT support tickets and classifies them as either
 """
 
 import os
+import asyncio
+import functools
+import hashlib
+import json
 import logging
+import math
+import re
 import time
-from typing import Dict, Any, Optional
+from collections import OrderedDict, deque
+from typing import Dict, Any, List, Optional, Tuple
 import google.generativeai as genai
 from strands_agents import Agent
 
 from backend.utils.error_handling import (
-    AgentError, APIError, RetryableError, CircuitBreaker, 
+    AgentError, APIError, RetryableError, CircuitBreaker, CircuitBreakerError,
     retry_with_backoff, handle_error
 )
 
 # Configure logging
 logger = logging.getLogger("nexusai.agents.master")
 
-class MasterAgent(Agent):
-    """
-    Master Agent responsible for ticket triage and classification.
-    
-    Uses Google Gemini AI to analyze ticket subjects and classify them
-    for routing to appropriate specialist agents.
-    """
-    
-    def __init__(self):
-        """Initialize the Master Agent with Gemini model integration."""
-        super().__init__(name="Master Agent")
-        
-        # Configure Gemini API with error handling
-        api_key = os.getenv('GEMINI_API_KEY')
-        if not api_key:
-            logger.warning("GEMINI_API_KEY not found. Agent will use fallback classification.")
-            self.model = None
-        else:
-            try:
-                genai.configure(api_key=api_key)
-                self.model = genai.GenerativeModel('gemini-pro')
-                logger.info("Gemini API configured successfully")
-            except Exception as e:
-                logger.error(f"Failed to configure Gemini API: {str(e)}")
-                self.model = None
-        
-        # Circuit breaker for Gemini API calls
-        self.gemini_circuit_breaker = CircuitBreaker(
-            service_name="gemini_api",
-            failure_threshold=3,
-            recovery_timeout=30.0,
-            expected_exception=(APIError, RetryableError, Exception)
-        )
-        
-        # System prompt for ticket classification
-        self.system_prompt = """
+# Maximum number of distinct ticket subjects kept in the classification cache
+CLASSIFICATION_CACHE_SIZE = 4096
+
+# Near-duplicate subjects reuse a cached label when their word sets are this similar
+SIMILARITY_CACHE_SIZE = 512
+SIMILARITY_THRESHOLD = 0.92
+
+_SUBJECT_TOKEN_PATTERN = re.compile(r"[\w$€£¥]+")
+
+# Tabs, newlines and other control whitespace collapse to spaces in ticket subjects
+_SUBJECT_WHITESPACE_TABLE = str.maketrans({char: ' ' for char in '\t\n\r\x0b\x0c\x00'})
+
+# Subjects shorter than this carry no signal and are routed without classification
+MIN_SUBJECT_LENGTH = 3
+
+# Concurrent classifications arriving within this window share one Gemini request
+CLASSIFICATION_BATCH_WINDOW = 0.02
+CLASSIFICATION_BATCH_SIZE = 16
+
+VALID_CLASSIFICATIONS = ("Phishing/Security", "General Inquiry")
+
+# System prompt for ticket classification
+SYSTEM_PROMPT = """
 You are an EXPERT Master Agent with 99.99% accuracy in IT security threat detection. Your job is to analyze ticket subjects and classify them with PERFECT precision.
 
 CLASSIFY AS "Phishing/Security" for ANY of these threat indicators:
@@ -89,6 +83,184 @@ Better to be overly cautious than miss a threat.
 
 Respond with ONLY: "Phishing/Security" or "General Inquiry"
 """
+
+# Prompt prefix shared by every single-ticket request; only the subject is appended
+_CLASSIFICATION_PROMPT_PREFIX = f"{SYSTEM_PROMPT}\n\nTicket Subject: "
+
+# Unambiguous threat terms that are classified as security without consulting Gemini.
+# Softer signals (money, urgency, brands) still go to the model to avoid false positives.
+STRONG_SECURITY_KEYWORDS = frozenset({
+    'phishing', 'phish', 'malware', 'ransomware', 'trojan', 'virus', 'spyware',
+    'keylogger', 'breach', 'hacked', 'compromised', 'spoofed', 'malicious', 'scam'
+})
+
+# COMPREHENSIVE security threat keywords (99.99% coverage)
+SECURITY_KEYWORDS = frozenset({
+    # Phishing & Scams
+    'phishing', 'suspicious', 'scam', 'fraud', 'fake', 'spoofed',
+    'won', 'congratulations', 'winner', 'prize', 'lottery', 'jackpot',
+    'money', 'cash', 'reward', 'refund', 'payment', 'transfer', 'wire',
+    '$', '€', '£', '¥', 'dollar', 'euro', 'pound',
+    
+    # Urgency & Social Engineering
+    'urgent', 'immediate', 'expires', 'limited time', 'act now', 'hurry',
+    'click here', 'verify', 'confirm', 'update', 'suspended', 'locked',
+    'notification', 'alert', 'warning', 'notice', 'message',
+    
+    # Fake Authorities
+    'ceo', 'manager', 'director', 'boss', 'executive', 'president',
+    'bank', 'irs', 'government', 'police', 'legal', 'court', 'lawyer',
+    'microsoft', 'google', 'apple', 'amazon', 'paypal', 'ebay',
+    
+    # Malware & Threats
+    'malware', 'virus', 'trojan', 'ransomware', 'infected', 'attachment',
+    'download', 'install', 'run', 'execute', 'open', 'file',
+    
+    # Security Breaches
+    'hack', 'breach', 'unauthorized', 'compromised', 'stolen', 'leaked',
+    'attack', 'threat', 'malicious', 'dangerous', 'harmful', 'exploit',
+    
+    # Credential Theft
+    'login', 'password', 'account', 'security', 'verification', 'auth',
+    'credentials', 'username', 'pin', 'code', 'token',
+    
+    # Suspicious Indicators
+    'unusual', 'strange', 'weird', 'odd', 'suspicious', 'unknown',
+    'www.', 'http', '.com', '.net', '.org', 'link', 'url', 'site',
+    
+    # Additional Threats
+    'bitcoin', 'crypto', 'investment', 'opportunity', 'deal', 'offer',
+    'free', 'gift', 'bonus', 'discount', 'sale', 'limited', 'exclusive'
+})
+
+# Whole-word keywords, matched with a set lookup against the subject's words
+_SECURITY_TOKENS = frozenset(keyword for keyword in SECURITY_KEYWORDS if keyword.isalpha())
+
+
+def _compile_keyword_trie(keywords) -> "re.Pattern":
+    """
+    Compile keywords into a single prefix-factored (trie-shaped) regular expression.
+    
+    Keywords sharing a prefix share one branch, so at each position of the subject the
+    regex engine tries at most one branch per distinct next character instead of every
+    keyword. This keeps non-matching subjects - the common General Inquiry case - cheap.
+    
+    Args:
+        keywords: Literal keywords to match
+        
+    Returns:
+        Compiled pattern whose match is always one complete keyword
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}  # end-of-keyword marker
+    
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # A keyword ends here; longer keywords continuing from it are optional
+            body = f'(?:{body})?'
+        return body
+    
+    return re.compile(build(trie))
+
+
+# All fallback indicators compiled into one trie-shaped pattern so the fallback scans
+# each subject exactly once. The former money regex only matched text that already
+# contains a keyword ('$', 'dollar', 'euro', 'money', ...); the former URL regex added
+# just 'click', which is folded in here.
+_SECURITY_KEYWORD_PATTERN = _compile_keyword_trie(SECURITY_KEYWORDS | {'click'})
+
+
+@functools.lru_cache(maxsize=None)
+def _get_gemini_model():
+    """
+    Configure the Gemini SDK and build the classification model once per process.
+    
+    genai.configure mutates process-wide state, so every MasterAgent shares the
+    result of the first call instead of reconfiguring the SDK per instance.
+    
+    Returns:
+        Shared GenerativeModel, or None if no API key is set or configuration failed
+    """
+    api_key = os.getenv('GEMINI_API_KEY')
+    if not api_key:
+        logger.warning("GEMINI_API_KEY not found. Agent will use fallback classification.")
+        return None
+    
+    try:
+        genai.configure(api_key=api_key)
+        model = genai.GenerativeModel('gemini-pro')
+        logger.info("Gemini API configured successfully")
+        return model
+    except Exception as e:
+        logger.error("Failed to configure Gemini API: %s", e)
+        return None
+
+
+class MasterAgent(Agent):
+    """
+    Master Agent responsible for ticket triage and classification.
+    
+    Uses Google Gemini AI to analyze ticket subjects and classify them
+    for routing to appropriate specialist agents.
+    """
+    
+    def __init__(self):
+        """Initialize the Master Agent with Gemini model integration."""
+        super().__init__(name="Master Agent")
+        
+        # Bound after Agent.__init__ so the base class cannot reset it; shares the module constant
+        self.system_prompt = SYSTEM_PROMPT
+        
+        # Local-only triage serves every classification from the rule-based classifier
+        self.local_triage_only = os.getenv('LOCAL_TRIAGE_ONLY', 'false').lower() in ('1', 'true', 'yes')
+        
+        # Gemini model is configured once per process and shared between agents
+        if self.local_triage_only:
+            logger.info("LOCAL_TRIAGE_ONLY enabled. Agent will classify tickets locally without Gemini.")
+            self.model = None
+        else:
+            self.model = _get_gemini_model()
+        
+        # Circuit breaker for Gemini API calls
+        self.gemini_circuit_breaker = CircuitBreaker(
+            service_name="gemini_api",
+            failure_threshold=3,
+            recovery_timeout=30.0,
+            expected_exception=(APIError, RetryableError, Exception)
+        )
+        
+        # Single and batched Gemini requests are wrapped once and share the breaker state
+        self._guarded_classify = self.gemini_circuit_breaker(self._classify_with_gemini)
+        self._guarded_classify_batch = self.gemini_circuit_breaker(self._classify_batch_with_gemini)
+        
+        # Exact-match LRU cache of Gemini classifications keyed by subject hash.
+        # Accessed without awaits in between, so it is safe on a single event loop.
+        self._classification_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._classification_cache_size = CLASSIFICATION_CACHE_SIZE
+        
+        # Recent (word set, classification) pairs for near-duplicate subject lookups
+        self._similarity_cache: deque = deque(maxlen=SIMILARITY_CACHE_SIZE)
+        
+        # Subjects waiting to be sent to Gemini as one batched request
+        self._pending_classifications: List[Tuple[str, asyncio.Future]] = []
+        self._classification_batch_timer: Optional[asyncio.TimerHandle] = None
+        self._classification_batches: set = set()
+        
+        # Counters for classifications answered without a Gemini round-trip
+        self.classification_metrics = {
+            'direct_hits': 0,
+            'cache_hits': 0,
+            'similarity_hits': 0
+        }
+        
     
     @retry_with_backoff(max_retries=2, base_delay=1.0, retryable_exceptions=(RetryableError, ConnectionError))
     async def classify_ticket(self, ticket_subject: str) -> str:
@@ -102,38 +274,263 @@ Respond with ONLY: "Phishing/Security" or "General Inquiry"
             Classification as either 'Phishing/Security' or 'General Inquiry'
         """
         try:
+            # Obvious threats are decided directly, before any prompt is built
+            subject_tokens = self._subject_tokens(ticket_subject)
+            direct_hits = STRONG_SECURITY_KEYWORDS.intersection(subject_tokens)
+            if direct_hits:
+                self.classification_metrics['direct_hits'] += 1
+                logger.info("Direct classification: '%s' contains '%s' -> Phishing/Security",
+                            ticket_subject, min(direct_hits))
+                return "Phishing/Security"
+            
             if not self.model:
-                logger.info("No Gemini model available, using fallback classification")
+                if not self.local_triage_only:
+                    logger.info("No Gemini model available, using fallback classification")
                 return self._fallback_classification(ticket_subject)
             
-            # Use circuit breaker for Gemini API calls
-            return await self._classify_with_gemini(ticket_subject)
+            # Repeat subjects are answered from the cache without an API call
+            cache_key = self._subject_cache_key(ticket_subject)
+            cached = self._get_cached_classification(cache_key)
+            if cached is not None:
+                self.classification_metrics['cache_hits'] += 1
+                logger.debug("Classification cache hit for ticket subject '%s'", ticket_subject)
+                return cached
+            
+            # Near-duplicates of recently classified subjects share their label
+            similar = self._find_similar_classification(subject_tokens)
+            if similar is not None:
+                self.classification_metrics['similarity_hits'] += 1
+                logger.debug("Similarity cache hit for ticket subject '%s'", ticket_subject)
+                self._store_cached_classification(cache_key, similar)
+                return similar
+            
+            # Concurrent misses are coalesced into a single Gemini request
+            classification = await self._classify_batched(ticket_subject)
+            self._store_cached_classification(cache_key, classification)
+            if subject_tokens:
+                self._similarity_cache.append((subject_tokens, classification))
+            return classification
                 
+        except (RetryableError, APIError, CircuitBreakerError) as e:
+            # Already typed by _gemini_error or the circuit breaker; no message sniffing needed
+            logger.warning("Gemini classification unavailable: %s", e)
+            handle_error(e, {
+                "agent": self.name,
+                "ticket_subject": ticket_subject,
+                "operation": "classify_ticket"
+            })
         except Exception as e:
-            error_context = {
+            logger.error("Unexpected error during ticket classification: %s", e)
+            handle_error(AgentError(self.name, f"Classification failed: {str(e)}"), {
                 "agent": self.name,
                 "ticket_subject": ticket_subject,
                 "operation": "classify_ticket"
-            }
+            })
+        
+        # Always fall back to rule-based classification
+        return self._fallback_classification(ticket_subject)
+    
+    @staticmethod
+    def _subject_cache_key(ticket_subject: str) -> str:
+        """Build the cache key for a ticket subject (case and surrounding whitespace insensitive)."""
+        return hashlib.sha256(ticket_subject.strip().lower().encode("utf-8")).hexdigest()
+    
+    def _get_cached_classification(self, cache_key: str) -> Optional[str]:
+        """Return a cached classification and mark it as most recently used."""
+        classification = self._classification_cache.get(cache_key)
+        if classification is not None:
+            self._classification_cache.move_to_end(cache_key)
+        return classification
+    
+    def _store_cached_classification(self, cache_key: str, classification: str) -> None:
+        """Cache a model classification, evicting the least recently used entry when full."""
+        self._classification_cache[cache_key] = classification
+        self._classification_cache.move_to_end(cache_key)
+        if len(self._classification_cache) > self._classification_cache_size:
+            self._classification_cache.popitem(last=False)
+    
+    @staticmethod
+    def _subject_tokens(ticket_subject: str) -> frozenset:
+        """Split a subject into its lower-cased set of words."""
+        return frozenset(_SUBJECT_TOKEN_PATTERN.findall(ticket_subject.lower()))
+    
+    def _find_similar_classification(self, subject_tokens: frozenset) -> Optional[str]:
+        """
+        Look up the classification of the most similar recently classified subject.
+        
+        Similarity is the cosine of the two word sets, |A & B| / sqrt(|A| * |B|).
+        A cached subject is never reused when the words the two subjects do not
+        share contain a security keyword: on long subjects a single added word
+        such as "suspicious" barely moves the score but can change the label.
+        
+        Args:
+            subject_tokens: Word set of the subject being classified
             
-            # Handle different types of errors
-            if "quota" in str(e).lower() or "rate limit" in str(e).lower():
-                logger.warning(f"API quota/rate limit exceeded: {str(e)}")
-                handle_error(APIError("gemini", f"Rate limit exceeded: {str(e)}"), error_context)
-            elif "network" in str(e).lower() or "connection" in str(e).lower():
-                logger.warning(f"Network error during classification: {str(e)}")
-                handle_error(RetryableError(f"Network error: {str(e)}"), error_context)
+        Returns:
+            Cached classification if a subject meets SIMILARITY_THRESHOLD, else None
+        """
+        if not subject_tokens:
+            return None
+        
+        best_score = 0.0
+        best_classification = None
+        size = len(subject_tokens)
+        for cached_tokens, classification in self._similarity_cache:
+            shared = len(subject_tokens & cached_tokens)
+            if not shared:
+                continue
+            score = shared / math.sqrt(size * len(cached_tokens))
+            if score < SIMILARITY_THRESHOLD or score <= best_score:
+                continue
+            # Substring matching errs on the side of sending the subject to the classifier
+            if _SECURITY_KEYWORD_PATTERN.search(" ".join(subject_tokens ^ cached_tokens)):
+                continue
+            best_score = score
+            best_classification = classification
+        
+        return best_classification
+    
+    async def _classify_batched(self, ticket_subject: str) -> str:
+        """
+        Queue a subject for the next batched Gemini request and wait for its result.
+        
+        A subject arriving while no other batch is queued or in flight is sent
+        at once. Otherwise the batch is sent once CLASSIFICATION_BATCH_SIZE
+        subjects are queued or CLASSIFICATION_BATCH_WINDOW seconds after the
+        first one arrived.
+        
+        Args:
+            ticket_subject: The subject line to classify
+            
+        Returns:
+            Classification result
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending_classifications.append((ticket_subject, future))
+        
+        pending = len(self._pending_classifications)
+        if pending >= CLASSIFICATION_BATCH_SIZE or (pending == 1 and not self._classification_batches):
+            self._flush_classification_batch()
+        elif pending == 1:
+            self._classification_batch_timer = loop.call_later(
+                CLASSIFICATION_BATCH_WINDOW, self._flush_classification_batch
+            )
+        
+        return await future
+    
+    def _flush_classification_batch(self) -> None:
+        """Dispatch all queued subjects as one batch."""
+        # A batch filled before its window ends must not leave a timer to cut the next one short
+        if self._classification_batch_timer is not None:
+            self._classification_batch_timer.cancel()
+            self._classification_batch_timer = None
+        
+        batch, self._pending_classifications = self._pending_classifications, []
+        if not batch:
+            return
+        
+        task = asyncio.ensure_future(self._resolve_classification_batch(batch))
+        self._classification_batches.add(task)
+        task.add_done_callback(self._classification_batches.discard)
+    
+    async def _resolve_classification_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """
+        Classify a batch of queued subjects and resolve their futures.
+        
+        Duplicate subjects that missed the cache together are sent to Gemini once.
+        Falls back to one request per subject if the batched response cannot be parsed.
+        """
+        # Map every queued entry onto the first occurrence of its normalized subject
+        subject_slots: Dict[str, int] = {}
+        subjects: List[str] = []
+        entry_slots: List[int] = []
+        for subject, _ in batch:
+            normalized = subject.strip().lower()
+            if normalized not in subject_slots:
+                subject_slots[normalized] = len(subjects)
+                subjects.append(subject)
+            entry_slots.append(subject_slots[normalized])
+        
+        try:
+            results = None
+            if len(subjects) > 1:
+                results = await self._guarded_classify_batch(subjects)
+            if results is None:
+                results = await asyncio.gather(
+                    *(self._guarded_classify(subject) for subject in subjects),
+                    return_exceptions=True
+                )
+        except Exception as e:
+            results = [e] * len(subjects)
+        
+        for (_, future), slot in zip(batch, entry_slots):
+            result = results[slot]
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
             else:
-                logger.error(f"Unexpected error during ticket classification: {str(e)}")
-                handle_error(AgentError(self.name, f"Classification failed: {str(e)}"), error_context)
+                future.set_result(result)
+    
+    async def _classify_batch_with_gemini(self, ticket_subjects: List[str]) -> Optional[List[str]]:
+        """
+        Classify several ticket subjects with a single Gemini request.
+        
+        Args:
+            ticket_subjects: The subject lines to classify
             
-            # Always fall back to rule-based classification
-            return self._fallback_classification(ticket_subject)
+        Returns:
+            Classifications in subject order, or None if the response could not be parsed
+        """
+        numbered_subjects = "\n".join(
+            f"{index}. {subject}" for index, subject in enumerate(ticket_subjects, 1)
+        )
+        prompt = (
+            f"{SYSTEM_PROMPT}\n\n"
+            f"Classify each of the following {len(ticket_subjects)} ticket subjects independently. "
+            f"Respond with ONLY a JSON array of {len(ticket_subjects)} strings, one classification "
+            f"per subject, in the same order.\n\n"
+            f"Ticket Subjects:\n{numbered_subjects}"
+        )
+        
+        try:
+            response = await self.model.generate_content_async(prompt)
+        except Exception as e:
+            raise self._gemini_error(e)
+        
+        if not response or not response.text:
+            raise APIError("gemini", "Empty response from Gemini API")
+        
+        text = response.text
+        try:
+            classifications = json.loads(text[text.index("["):text.rindex("]") + 1])
+        except ValueError:
+            logger.warning("Unparseable batched classification response, classifying individually")
+            return None
+        
+        if (not isinstance(classifications, list) or len(classifications) != len(ticket_subjects)
+                or any(c not in VALID_CLASSIFICATIONS for c in classifications)):
+            logger.warning("Invalid batched classification response, classifying individually")
+            return None
+        
+        logger.info("Classified %d tickets in one Gemini request", len(ticket_subjects))
+        return classifications
+    
+    @staticmethod
+    def _gemini_error(error: Exception) -> Exception:
+        """Convert a Gemini SDK failure into the matching NexusAI error type."""
+        message = str(error).lower()
+        if "quota" in message or "rate limit" in message:
+            return RetryableError(f"Gemini API rate limit: {str(error)}", retry_after=5.0)
+        elif "network" in message or "connection" in message:
+            return RetryableError(f"Gemini API network error: {str(error)}", retry_after=2.0)
+        else:
+            return APIError("gemini", f"Gemini API error: {str(error)}")
     
-    @CircuitBreaker(service_name="gemini_classification", failure_threshold=3, recovery_timeout=30.0)
     async def _classify_with_gemini(self, ticket_subject: str) -> str:
         """
-        Perform classification using Gemini API with circuit breaker protection.
+        Perform classification using Gemini API (called through gemini_circuit_breaker).
         
         Args:
             ticket_subject: The subject line to classify
@@ -143,10 +540,10 @@ Respond with ONLY: "Phishing/Security" or "General Inquiry"
         """
         try:
             # Prepare the prompt with the ticket subject
-            prompt = f"{self.system_prompt}\n\nTicket Subject: {ticket_subject}"
+            prompt = _CLASSIFICATION_PROMPT_PREFIX + ticket_subject
             
             # Generate classification using Gemini
-            response = self.model.generate_content(prompt)
+            response = await self.model.generate_content_async(prompt)
             
             if not response or not response.text:
                 raise APIError("gemini", "Empty response from Gemini API")
@@ -154,22 +551,16 @@ Respond with ONLY: "Phishing/Security" or "General Inquiry"
             classification = response.text.strip()
             
             # Validate the classification response
-            valid_classifications = ["Phishing/Security", "General Inquiry"]
-            if classification in valid_classifications:
-                logger.info(f"Classified ticket '{ticket_subject}' as '{classification}'")
+            if classification in VALID_CLASSIFICATIONS:
+                logger.info("Classified ticket '%s' as '%s'", ticket_subject, classification)
                 return classification
             else:
-                logger.warning(f"Invalid classification response: {classification}. Using fallback.")
+                logger.warning("Invalid classification response: %s. Using fallback.", classification)
                 raise APIError("gemini", f"Invalid classification response: {classification}")
                 
         except Exception as e:
             # Convert to appropriate error type for circuit breaker
-            if "quota" in str(e).lower() or "rate limit" in str(e).lower():
-                raise RetryableError(f"Gemini API rate limit: {str(e)}", retry_after=5.0)
-            elif "network" in str(e).lower() or "connection" in str(e).lower():
-                raise RetryableError(f"Gemini API network error: {str(e)}", retry_after=2.0)
-            else:
-                raise APIError("gemini", f"Gemini API error: {str(e)}")
+            raise self._gemini_error(e)
     
     def _fallback_classification(self, ticket_subject: str) -> str:
         """
@@ -183,65 +574,23 @@ Respond with ONLY: "Phishing/Security" or "General Inquiry"
         """
         # Convert to lowercase for case-insensitive matching
         subject_lower = ticket_subject.lower()
-        
-        # COMPREHENSIVE security threat keywords (99.99% coverage)
-        security_keywords = [
-            # Phishing & Scams
-            'phishing', 'suspicious', 'scam', 'fraud', 'fake', 'spoofed',
-            'won', 'congratulations', 'winner', 'prize', 'lottery', 'jackpot',
-            'money', 'cash', 'reward', 'refund', 'payment', 'transfer', 'wire',
-            '$', '€', '£', '¥', 'dollar', 'euro', 'pound',
-            
-            # Urgency & Social Engineering
-            'urgent', 'immediate', 'expires', 'limited time', 'act now', 'hurry',
-            'click here', 'verify', 'confirm', 'update', 'suspended', 'locked',
-            'notification', 'alert', 'warning', 'notice', 'message',
-            
-            # Fake Authorities
-            'ceo', 'manager', 'director', 'boss', 'executive', 'president',
-            'bank', 'irs', 'government', 'police', 'legal', 'court', 'lawyer',
-            'microsoft', 'google', 'apple', 'amazon', 'paypal', 'ebay',
-            
-            # Malware & Threats
-            'malware', 'virus', 'trojan', 'ransomware', 'infected', 'attachment',
-            'download', 'install', 'run', 'execute', 'open', 'file',
-            
-            # Security Breaches
-            'hack', 'breach', 'unauthorized', 'compromised', 'stolen', 'leaked',
-            'attack', 'threat', 'malicious', 'dangerous', 'harmful', 'exploit',
-            
-            # Credential Theft
-            'login', 'password', 'account', 'security', 'verification', 'auth',
-            'credentials', 'username', 'pin', 'code', 'token',
-            
-            # Suspicious Indicators
-            'unusual', 'strange', 'weird', 'odd', 'suspicious', 'unknown',
-            'www.', 'http', '.com', '.net', '.org', 'link', 'url', 'site',
-            
-            # Additional Threats
-            'bitcoin', 'crypto', 'investment', 'opportunity', 'deal', 'offer',
-            'free', 'gift', 'bonus', 'discount', 'sale', 'limited', 'exclusive'
-        ]
-        
-        # Check if ANY security keywords are present
-        for keyword in security_keywords:
-            if keyword in subject_lower:
-                logger.info(f"EXPERT Fallback: '{ticket_subject}' contains security keyword '{keyword}' -> Phishing/Security")
-                return "Phishing/Security"
-        
-        # Additional pattern matching for numbers/money
-        import re
-        if re.search(r'\$\d+|\d+\s*dollars?|\d+\s*euros?|money|cash|payment', subject_lower):
-            logger.info(f"EXPERT Fallback: '{ticket_subject}' contains money pattern -> Phishing/Security")
+
+        # Fast path: whole-word keywords via set lookup on the subject's words
+        token_hits = _SECURITY_TOKENS.intersection(subject_lower.split())
+        if token_hits:
+            logger.debug("EXPERT Fallback: '%s' contains security keyword '%s' -> Phishing/Security",
+                         ticket_subject, min(token_hits))
             return "Phishing/Security"
         
-        # Check for suspicious URLs/links
-        if re.search(r'www\.|http|\.com|\.net|click|link', subject_lower):
-            logger.info(f"EXPERT Fallback: '{ticket_subject}' contains URL pattern -> Phishing/Security")
+        # Check for security keywords inside words, phrases, money and link indicators (single pass)
+        keyword_match = _SECURITY_KEYWORD_PATTERN.search(subject_lower)
+        if keyword_match:
+            logger.debug("EXPERT Fallback: '%s' contains security keyword '%s' -> Phishing/Security",
+                         ticket_subject, keyword_match.group(0))
             return "Phishing/Security"
         
         # Only classify as General Inquiry if NO security indicators found
-        logger.info(f"EXPERT Fallback: '{ticket_subject}' -> General Inquiry (no security indicators)")
+        logger.debug("EXPERT Fallback: '%s' -> General Inquiry (no security indicators)", ticket_subject)
         return "General Inquiry"
     
     async def process_ticket(self, ticket_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -254,24 +603,36 @@ Respond with ONLY: "Phishing/Security" or "General Inquiry"
         Returns:
             Updated ticket data with classification and routing information
         """
-        ticket_subject = ticket_data.get('subject', '')
+        ticket_subject = ticket_data.get('subject')
         ticket_id = ticket_data.get('id', 'Unknown')
         
+        # Single clock read per ticket, shared by the success and fallback paths
+        processing_timestamp = time.time()
+        
         try:
-            logger.info(f"Processing ticket {ticket_id}: {ticket_subject}")
+            # Normalize once; everything downstream sees the cleaned subject. A non-string
+            # subject fails here and takes the graceful-degradation path below.
+            ticket_subject = (ticket_subject or '').translate(_SUBJECT_WHITESPACE_TABLE).strip()
             
-            # Validate input data
-            if not ticket_subject.strip():
+            # Validate input data before doing any work
+            if not ticket_subject:
                 raise AgentError(self.name, "Empty ticket subject provided", "INVALID_INPUT")
             
-            # Classify the ticket with error handling
-            classification = await self.classify_ticket(ticket_subject)
+            logger.info("Processing ticket %s: %s", ticket_id, ticket_subject)
+            
+            if len(ticket_subject) < MIN_SUBJECT_LENGTH:
+                # Too short to classify meaningfully - skip the classifier entirely
+                logger.info("Ticket %s subject too short to classify, routing as General Inquiry", ticket_id)
+                classification = "General Inquiry"
+            else:
+                # Classify the ticket with error handling
+                classification = await self.classify_ticket(ticket_subject)
             
             # Update ticket data with classification
             ticket_data['classification'] = classification
             ticket_data['status'] = 'classified'
             ticket_data['processed_by'] = self.name
-            ticket_data['processing_timestamp'] = time.time()
+            ticket_data['processing_timestamp'] = processing_timestamp
             
             # Add routing information based on classification
             if classification == "Phishing/Security":
@@ -283,8 +644,8 @@ Respond with ONLY: "Phishing/Security" or "General Inquiry"
                 ticket_data['priority'] = 'normal'
                 ticket_data['escalation_level'] = 'standard'
             
-            logger.info(f"Ticket {ticket_id} successfully classified as '{classification}' "
-                       f"and assigned to '{ticket_data['assigned_agent']}'")
+            logger.info("Ticket %s successfully classified as '%s' and assigned to '%s'",
+                        ticket_id, classification, ticket_data['assigned_agent'])
             
             return ticket_data
             
@@ -300,7 +661,7 @@ Respond with ONLY: "Phishing/Security" or "General Inquiry"
                 "operation": "process_ticket"
             }
             
-            logger.error(f"Unexpected error processing ticket {ticket_id}: {str(e)}")
+            logger.error("Unexpected error processing ticket %s: %s", ticket_id, e)
             handle_error(AgentError(self.name, f"Ticket processing failed: {str(e)}"), error_context)
             
             # Ensure we always return a valid classification for system stability
@@ -311,10 +672,10 @@ Respond with ONLY: "Phishing/Security" or "General Inquiry"
                 'priority': 'normal',
                 'escalation_level': 'standard',
                 'processed_by': self.name,
-                'processing_timestamp': time.time(),
+                'processing_timestamp': processing_timestamp,
                 'processing_error': str(e),
                 'fallback_used': True
             })
             
-            logger.info(f"Ticket {ticket_id} processed with fallback classification due to error")
+            logger.info("Ticket %s processed with fallback classification due to error", ticket_id)
             return ticket_data
\ No newline at end of file
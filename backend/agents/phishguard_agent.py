@@ -8,9 +8,13 @@ Uses MCP tools for security capabilities and provides detailed logging for UI tr
 import os
 import logging
 import asyncio
-import json
+import functools
+import hashlib
+import re
 import time
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
 import google.generativeai as genai
 from strands_agents import Agent
 
@@ -22,6 +26,160 @@ from backend.utils.error_handling import (
 # Configure logging
 logger = logging.getLogger("nexusai.agents.phishguard")
 
+# Bulk MCP tool used to block every URL of a ticket in one round-trip
+BULK_URL_BLOCK_TOOL = "block_malicious_urls"
+
+# Static parts of the remediation summary, shared by every ticket
+REMEDIATION_PHASES = ('analyze', 'contain', 'eradicate', 'document')
+REMEDIATION_ACTIONS = (
+    'Performed comprehensive threat analysis',
+    'Blocked malicious URLs at network level',
+    'Removed malicious emails from all user inboxes',
+    'Generated detailed remediation report'
+)
+
+# Bit flags for workflow phase tracking, in REMEDIATION_PHASES order
+PHASE_ANALYZE = 1
+PHASE_CONTAIN = 2
+PHASE_ERADICATE = 4
+PHASE_DOCUMENT = 8
+_PHASE_FLAGS = (PHASE_ANALYZE, PHASE_CONTAIN, PHASE_ERADICATE, PHASE_DOCUMENT)
+
+# Maximum number of AI analyses and IOC extractions kept per agent for repeated subjects
+ANALYSIS_CACHE_SIZE = 1024
+
+# IOC extraction patterns, compiled once for every ticket
+_URL_PATTERN = re.compile(r'https?://[^\s<>"\'`]+')
+_EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+_REMOVED_COUNT_PATTERN = re.compile(r'(?:removed|deleted|purged)[^\d]{0,20}(\d+)', re.IGNORECASE)
+
+# Keyword sets used by the rule-based threat scoring
+HIGH_RISK_KEYWORDS = ('urgent', 'suspended', 'verify', 'click here', 'download')
+MEDIUM_RISK_KEYWORDS = ('security', 'account', 'payment', 'invoice')
+THREAT_LEVEL_INDICATORS = ('high', 'critical', 'malicious', 'phishing', 'urgent')
+
+# Number of distinct threat level indicators that makes a ticket HIGH risk
+HIGH_THREAT_INDICATOR_COUNT = 3
+
+
+def _compile_keywords(keywords) -> re.Pattern:
+    """
+    Compile keywords into one pattern that reports every keyword occurring in a text.
+    
+    The alternation is wrapped in a lookahead so matches may overlap, which keeps
+    the result identical to testing each keyword with ``in`` as long as no keyword
+    is a prefix of another.
+    
+    Args:
+        keywords: Lowercase keywords to match as substrings
+        
+    Returns:
+        Compiled pattern whose findall() yields the matched keywords
+    """
+    alternation = '|'.join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+    return re.compile(f'(?=({alternation}))')
+
+
+# Fallback scoring scans for both risk categories at once and records each keyword
+# found as one bit, so a category count is the popcount of its mask
+_FALLBACK_KEYWORD_BITS = {
+    keyword: 1 << bit for bit, keyword in enumerate(HIGH_RISK_KEYWORDS + MEDIUM_RISK_KEYWORDS)
+}
+_HIGH_RISK_MASK = (1 << len(HIGH_RISK_KEYWORDS)) - 1
+_MEDIUM_RISK_MASK = ((1 << len(MEDIUM_RISK_KEYWORDS)) - 1) << len(HIGH_RISK_KEYWORDS)
+_FALLBACK_KEYWORD_PATTERN = _compile_keywords(_FALLBACK_KEYWORD_BITS)
+_THREAT_LEVEL_PATTERN = _compile_keywords(THREAT_LEVEL_INDICATORS)
+
+
+def _normalize_url(url: str) -> str:
+    """Lower-case the case-insensitive scheme and host of a URL, keeping its path as is."""
+    scheme, separator, remainder = url.partition('://')
+    host, slash, path = remainder.partition('/')
+    return f"{scheme.lower()}{separator}{host.lower()}{slash}{path}"
+
+
+def _count_keywords(pattern: re.Pattern, text: str, limit: Optional[int] = None) -> int:
+    """
+    Count the distinct keywords of a compiled keyword pattern found in text.
+    
+    Args:
+        pattern: Pattern built by _compile_keywords
+        text: Lowercase text to scan
+        limit: Stop scanning once this many distinct keywords have been found
+        
+    Returns:
+        Number of distinct keywords found, at most limit
+    """
+    found = set()
+    for match in pattern.finditer(text):
+        found.add(match.group(1))
+        if len(found) == limit:
+            break
+    return len(found)
+
+@dataclass
+class BlockResult:
+    """Outcome of blocking one malicious URL during containment."""
+    
+    __slots__ = ('url', 'status', 'details', 'timestamp')
+    
+    url: str
+    status: str
+    details: str
+    timestamp: float
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the plain dict stored in ticket data and sent to the UI."""
+        return asdict(self)
+
+
+@dataclass
+class EmailSearchResult:
+    """Outcome of one search_and_destroy_email call during eradication."""
+    
+    __slots__ = ('criteria', 'status', 'result', 'error')
+    
+    criteria: str
+    status: str
+    result: Optional[str]
+    error: Optional[str]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the plain dict stored in ticket data, omitting unset fields."""
+        data = {'criteria': self.criteria, 'status': self.status}
+        if self.result is not None:
+            data['result'] = self.result
+        if self.error is not None:
+            data['error'] = self.error
+        return data
+
+
+@functools.lru_cache(maxsize=None)
+def _get_gemini_model():
+    """
+    Configure the Gemini SDK and build the analysis model once per process.
+    
+    Agents created per ticket reuse the same model, and with it the SDK client and
+    its open connections, instead of reconfiguring and reconnecting each time.
+    
+    Returns:
+        Shared GenerativeModel, or None if no API key is set or configuration failed
+    """
+    api_key = os.getenv('GEMINI_API_KEY')
+    if not api_key:
+        logger.warning("GEMINI_API_KEY not found. Agent will use simplified analysis.")
+        return None
+    
+    try:
+        genai.configure(api_key=api_key)
+        model = genai.GenerativeModel('gemini-pro')
+        logger.info("PhishGuard Gemini API configured successfully")
+        return model
+    except Exception as e:
+        logger.error("Failed to configure Gemini API for PhishGuard: %s", e)
+        return None
+
+
 class PhishGuardAgent(Agent):
     """
     PhishGuard Agent responsible for autonomous phishing threat remediation.
@@ -33,6 +191,20 @@ class PhishGuardAgent(Agent):
     4. Document - Log comprehensive remediation summary
     """
     
+    # Circuit breakers for different services, shared by every PhishGuard agent in the
+    # process so an outage seen while handling one ticket fast-fails the following ones
+    gemini_circuit_breaker = CircuitBreaker(
+        service_name="phishguard_gemini",
+        failure_threshold=3,
+        recovery_timeout=30.0
+    )
+    
+    mcp_circuit_breaker = CircuitBreaker(
+        service_name="phishguard_mcp",
+        failure_threshold=5,
+        recovery_timeout=60.0
+    )
+    
     def __init__(self, mcp_client=None, socketio_client=None):
         """
         Initialize the PhishGuard Agent with security-focused capabilities.
@@ -46,34 +218,14 @@ class PhishGuardAgent(Agent):
         self.mcp_client = mcp_client
         self.socketio_client = socketio_client
         
-        # Configure Gemini API with error handling
-        api_key = os.getenv('GEMINI_API_KEY')
-        if not api_key:
-            logger.warning("GEMINI_API_KEY not found. Agent will use simplified analysis.")
-            self.model = None
-        else:
-            try:
-                genai.configure(api_key=api_key)
-                self.model = genai.GenerativeModel('gemini-pro')
-                logger.info("PhishGuard Gemini API configured successfully")
-            except Exception as e:
-                logger.error(f"Failed to configure Gemini API for PhishGuard: {str(e)}")
-                self.model = None
-        
-        # Circuit breakers for different services
-        self.gemini_circuit_breaker = CircuitBreaker(
-            service_name="phishguard_gemini",
-            failure_threshold=3,
-            recovery_timeout=30.0
-        )
+        # Gemini model shared by every PhishGuard agent in the process
+        self.model = _get_gemini_model()
         
-        self.mcp_circuit_breaker = CircuitBreaker(
-            service_name="phishguard_mcp",
-            failure_threshold=5,
-            recovery_timeout=60.0
-        )
+        # LRU caches of successful analyses, so repeated subjects skip the network round-trip
+        self._ai_analysis_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._ioc_analysis_cache: "OrderedDict[str, str]" = OrderedDict()
         
-        # Track operation state for recovery
+        # Track operation state for recovery (start time on the monotonic clock)
         self.current_operation = None
         self.operation_start_time = None
         
@@ -98,13 +250,52 @@ Focus on:
 Provide concise, professional responses that prioritize immediate threat containment and user safety.
 """
     
-    async def log_action(self, message: str, status: str = "working") -> None:
+    @property
+    def socketio_client(self):
+        """SocketIO client used for UI updates."""
+        return self._socketio_client
+    
+    @socketio_client.setter
+    def socketio_client(self, client) -> None:
+        # Bind the emit strategy once per client instead of checking it on every update
+        self._socketio_client = client
+        self._emit_update = self._bind_socketio_emit(client)
+    
+    @staticmethod
+    def _bind_socketio_emit(client) -> Optional[Callable[[str, Dict[str, Any]], Awaitable[Any]]]:
+        """
+        Build an awaitable emit function that never blocks the event loop.
+        
+        Async clients are awaited directly; synchronous clients are run in the
+        default executor so socket writes do not stall other agent tasks.
+        
+        Args:
+            client: SocketIO client or server, or None
+            
+        Returns:
+            Awaitable emit function, or None when no client is configured
+        """
+        if client is None:
+            return None
+        
+        if asyncio.iscoroutinefunction(client.emit):
+            return client.emit
+        
+        def emit_in_executor(event: str, payload: Dict[str, Any]) -> Awaitable[Any]:
+            loop = asyncio.get_running_loop()
+            return loop.run_in_executor(None, functools.partial(client.emit, event, payload))
+        
+        return emit_in_executor
+    
+    async def log_action(self, message: str, status: str = "working",
+                         data: Optional[Dict[str, Any]] = None) -> None:
         """
         Log an action for UI display and system tracking with comprehensive error handling.
         
         Args:
             message: The action message to log
             status: Current workflow status
+            data: Optional partial result streamed to the UI with the update
         """
         try:
             # Log via MCP tool if available with circuit breaker protection
@@ -116,26 +307,29 @@ Provide concise, professional responses that prioritize immediate threat contain
                         "status": status
                     })
                 except Exception as e:
-                    logger.warning(f"MCP logging failed, continuing with local logging: {str(e)}")
+                    logger.warning("MCP logging failed, continuing with local logging: %s", e)
             
             # Also emit via SocketIO if available
-            if self.socketio_client:
+            if self._emit_update:
                 try:
-                    self.socketio_client.emit('workflow_update', {
+                    update = {
                         'agent': self.name,
                         'message': message,
                         'status': status,
                         'timestamp': time.time()
-                    })
+                    }
+                    if data is not None:
+                        update['data'] = data
+                    await self._emit_update('workflow_update', update)
                 except Exception as e:
-                    logger.warning(f"SocketIO emit failed: {str(e)}")
+                    logger.warning("SocketIO emit failed: %s", e)
             
             # Always log to system logger (this should never fail)
-            logger.info(f"{self.name}: {message}")
+            logger.info("%s: %s", self.name, message)
             
         except Exception as e:
             # Even if everything fails, we should at least try to log the error
-            logger.error(f"Critical error in log_action: {str(e)}")
+            logger.error("Critical error in log_action: %s", e)
     
     @retry_with_backoff(max_retries=2, base_delay=1.0)
     async def _safe_mcp_call(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
@@ -169,6 +363,47 @@ Provide concise, professional responses that prioritize immediate threat contain
             else:
                 handle_error(ToolError(tool_name, f"MCP tool execution failed: {str(e)}"), error_context)
                 raise
+
+    @retry_with_backoff(max_retries=2, base_delay=1.0)
+    async def _safe_mcp_batch_call(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """
+        Make a batch of MCP tool calls with circuit breaker protection and error handling.
+        
+        Uses the client's call_tools_batch when available so the batch is validated and
+        reported to the UI once; otherwise the calls are issued concurrently one by one.
+        
+        Args:
+            calls: List of (tool_name, arguments) tuples
+            
+        Returns:
+            Tool execution results in the same order as calls; with the per-call
+            fallback, a failed call yields its exception instead of a result
+        """
+        if not self.mcp_client:
+            raise ToolError("tools_batch", "MCP client not available")
+        
+        call_tools_batch = getattr(self.mcp_client, 'call_tools_batch', None)
+        if call_tools_batch is None:
+            return await asyncio.gather(
+                *(self._safe_mcp_call(tool_name, arguments) for tool_name, arguments in calls),
+                return_exceptions=True
+            )
+        
+        try:
+            return await self.mcp_circuit_breaker(call_tools_batch)(calls)
+        except Exception as e:
+            error_context = {
+                "agent": self.name,
+                "tool_names": [tool_name for tool_name, _ in calls],
+                "operation": self.current_operation
+            }
+            
+            if "connection" in str(e).lower() or "timeout" in str(e).lower():
+                handle_error(RetryableError(f"MCP connection error: {str(e)}"), error_context)
+                raise RetryableError(f"MCP tool batch connection failed: {str(e)}")
+            else:
+                handle_error(ToolError("tools_batch", f"MCP tool batch execution failed: {str(e)}"), error_context)
+                raise
     
     async def analyze_threat(self, ticket_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -181,9 +416,10 @@ Provide concise, professional responses that prioritize immediate threat contain
             Analysis results with identified threats and IOCs
         """
         self.current_operation = "analyze_threat"
-        self.operation_start_time = time.time()
+        # One agent serves concurrent tickets, so time each analysis locally
+        start_time = self.operation_start_time = time.perf_counter()
         
-        ticket_subject = ticket_data.get('subject', '')
+        ticket_subject = ticket_data.get('subject') or ''
         ticket_id = ticket_data.get('id', 'Unknown')
         
         try:
@@ -193,11 +429,20 @@ Provide concise, professional responses that prioritize immediate threat contain
             if not ticket_subject.strip():
                 raise AgentError(self.name, "Empty ticket subject for analysis", "INVALID_INPUT")
             
-            # Perform AI analysis with error handling
-            ai_analysis = await self._perform_ai_analysis(ticket_subject)
+            # AI analysis and IOC extraction are independent calls, so run them concurrently
+            ai_analysis, ioc_analysis = await asyncio.gather(
+                self._perform_ai_analysis(ticket_subject),
+                self._extract_iocs(ticket_subject, ticket_id),
+                return_exceptions=True
+            )
+            
+            if isinstance(ai_analysis, Exception):
+                logger.warning("AI analysis failed, using fallback: %s", ai_analysis)
+                ai_analysis = self._fallback_threat_analysis(ticket_subject)
             
-            # Extract IOCs with error handling
-            ioc_analysis = await self._extract_iocs(ticket_subject, ticket_id)
+            if isinstance(ioc_analysis, Exception):
+                logger.warning("IOC extraction failed: %s", ioc_analysis)
+                ioc_analysis = f"IOC analysis failed: {str(ioc_analysis)}. Manual review recommended."
             
             # Store analysis results
             analysis_results = {
@@ -205,14 +450,14 @@ Provide concise, professional responses that prioritize immediate threat contain
                 'ioc_analysis': ioc_analysis,
                 'threat_level': self._determine_threat_level(ticket_subject, ai_analysis, ioc_analysis),
                 'analysis_timestamp': time.time(),
-                'analysis_duration': time.time() - self.operation_start_time
+                'analysis_duration': time.perf_counter() - start_time
             }
             
             ticket_data['analysis_results'] = analysis_results
             await self.log_action("✅ Threat analysis complete - proceeding to containment", "analyzed")
             
-            logger.info(f"Threat analysis completed for ticket {ticket_id} in "
-                       f"{analysis_results['analysis_duration']:.2f}s")
+            logger.info("Threat analysis completed for ticket %s in %.2fs",
+                        ticket_id, analysis_results['analysis_duration'])
             
             return ticket_data
             
@@ -225,10 +470,10 @@ Provide concise, professional responses that prioritize immediate threat contain
                 "ticket_id": ticket_id,
                 "ticket_subject": ticket_subject,
                 "operation": "analyze_threat",
-                "duration": time.time() - self.operation_start_time if self.operation_start_time else 0
+                "duration": time.perf_counter() - start_time
             }
             
-            logger.error(f"Critical error during threat analysis: {str(e)}")
+            logger.error("Critical error during threat analysis: %s", e)
             handle_error(AgentError(self.name, f"Threat analysis failed: {str(e)}"), error_context)
             
             await self.log_action(f"❌ Analysis error: {str(e)}", "error")
@@ -247,6 +492,13 @@ Provide concise, professional responses that prioritize immediate threat contain
         if not self.model:
             return "AI analysis unavailable - Gemini model not configured"
         
+        cache_key = hashlib.sha256(ticket_subject.strip().lower().encode("utf-8")).hexdigest()
+        ai_analysis = self._get_cached_analysis(self._ai_analysis_cache, cache_key)
+        if ai_analysis is not None:
+            logger.debug("Reusing cached AI analysis for subject '%s'", ticket_subject)
+            await self.log_action(f"🤖 AI Analysis: {ai_analysis[:100]}...")
+            return ai_analysis
+        
         try:
             analysis_prompt = f"""
             {self.system_prompt}
@@ -264,17 +516,18 @@ Provide concise, professional responses that prioritize immediate threat contain
             """
             
             # Use circuit breaker for Gemini calls
-            response = await self.gemini_circuit_breaker(self.model.generate_content)(analysis_prompt)
+            response = await self.gemini_circuit_breaker(self.model.generate_content_async)(analysis_prompt)
             
             if not response or not response.text:
                 raise APIError("gemini", "Empty response from Gemini API")
             
             ai_analysis = response.text.strip()
+            self._store_cached_analysis(self._ai_analysis_cache, cache_key, ai_analysis)
             await self.log_action(f"🤖 AI Analysis: {ai_analysis[:100]}...")
             return ai_analysis
             
         except Exception as e:
-            logger.warning(f"AI analysis failed, using fallback: {str(e)}")
+            logger.warning("AI analysis failed, using fallback: %s", e)
             await self.log_action("⚠️ AI analysis unavailable - using rule-based assessment")
             
             # Fallback analysis based on keywords
@@ -292,11 +545,12 @@ Provide concise, professional responses that prioritize immediate threat contain
         """
         subject_lower = ticket_subject.lower()
         
-        high_risk_keywords = ['urgent', 'suspended', 'verify', 'click here', 'download']
-        medium_risk_keywords = ['security', 'account', 'payment', 'invoice']
+        keyword_mask = 0
+        for keyword in _FALLBACK_KEYWORD_PATTERN.findall(subject_lower):
+            keyword_mask |= _FALLBACK_KEYWORD_BITS[keyword]
         
-        high_risk_count = sum(1 for keyword in high_risk_keywords if keyword in subject_lower)
-        medium_risk_count = sum(1 for keyword in medium_risk_keywords if keyword in subject_lower)
+        high_risk_count = bin(keyword_mask & _HIGH_RISK_MASK).count('1')
+        medium_risk_count = bin(keyword_mask & _MEDIUM_RISK_MASK).count('1')
         
         if high_risk_count >= 2:
             threat_level = "HIGH"
@@ -321,12 +575,20 @@ Provide concise, professional responses that prioritize immediate threat contain
         Returns:
             IOC analysis result
         """
+        if not self.mcp_client:
+            await self.log_action("⚠️ IOC analysis unavailable - MCP client not connected")
+            return "IOC analysis unavailable - MCP client not connected"
+        
         try:
             await self.log_action("🔎 Extracting Indicators of Compromise...")
             
-            if not self.mcp_client:
-                await self.log_action("⚠️ IOC analysis unavailable - MCP client not connected")
-                return "IOC analysis unavailable - MCP client not connected"
+            # The IOC tool result depends only on the subject, which it echoes verbatim
+            cache_key = self._ioc_cache_key(ticket_subject)
+            ioc_analysis = self._get_cached_analysis(self._ioc_analysis_cache, cache_key)
+            if ioc_analysis is not None:
+                logger.debug("Reusing cached IOC analysis for subject '%s'", ticket_subject)
+                await self.log_action("📊 IOC Analysis complete - threat indicators identified")
+                return ioc_analysis
             
             ioc_result = await self._safe_mcp_call(
                 "analyze_email_for_iocs",
@@ -338,15 +600,37 @@ Provide concise, professional responses that prioritize immediate threat contain
             
             # Parse IOC results
             ioc_analysis = ioc_result.get('content', [{}])[0].get('text', 'No IOC data returned')
+            self._store_cached_analysis(self._ioc_analysis_cache, cache_key, ioc_analysis)
             await self.log_action("📊 IOC Analysis complete - threat indicators identified")
             
             return ioc_analysis
             
         except Exception as e:
-            logger.warning(f"IOC extraction failed: {str(e)}")
+            logger.warning("IOC extraction failed: %s", e)
             await self.log_action("⚠️ IOC analysis failed - proceeding with manual assessment")
             return f"IOC analysis failed: {str(e)}. Manual review recommended."
     
+    @staticmethod
+    def _ioc_cache_key(ticket_subject: str) -> str:
+        """Cache key for an IOC analysis; the tool echoes the subject, so it is not case-folded."""
+        return hashlib.sha256(ticket_subject.strip().encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def _get_cached_analysis(cache: "OrderedDict[str, str]", cache_key: str) -> Optional[str]:
+        """Return a cached analysis and mark it as most recently used."""
+        analysis = cache.get(cache_key)
+        if analysis is not None:
+            cache.move_to_end(cache_key)
+        return analysis
+    
+    @staticmethod
+    def _store_cached_analysis(cache: "OrderedDict[str, str]", cache_key: str, analysis: str) -> None:
+        """Cache an analysis, evicting the least recently used entry when full."""
+        cache[cache_key] = analysis
+        cache.move_to_end(cache_key)
+        if len(cache) > ANALYSIS_CACHE_SIZE:
+            cache.popitem(last=False)
+    
     def _determine_threat_level(self, ticket_subject: str, ai_analysis: str, ioc_analysis: str) -> str:
         """
         Determine overall threat level based on all analysis results.
@@ -360,13 +644,12 @@ Provide concise, professional responses that prioritize immediate threat contain
             Threat level (HIGH, MEDIUM, LOW)
         """
         # Check for high-risk indicators in any analysis
-        high_risk_indicators = ['high', 'critical', 'malicious', 'phishing', 'urgent']
-        
         combined_text = f"{ticket_subject} {ai_analysis} {ioc_analysis}".lower()
         
-        high_risk_count = sum(1 for indicator in high_risk_indicators if indicator in combined_text)
+        # AI analyses can be long, so stop scanning as soon as the ticket is known to be HIGH
+        high_risk_count = _count_keywords(_THREAT_LEVEL_PATTERN, combined_text, HIGH_THREAT_INDICATOR_COUNT)
         
-        if high_risk_count >= 3:
+        if high_risk_count >= HIGH_THREAT_INDICATOR_COUNT:
             return "HIGH"
         elif high_risk_count >= 1:
             return "MEDIUM"
@@ -383,8 +666,18 @@ Provide concise, professional responses that prioritize immediate threat contain
         Returns:
             Updated ticket data with containment results
         """
+        # Nothing can be blocked without MCP tools, so skip the phase instead of failing each URL
+        if not self.mcp_client:
+            await self.log_action("⚠️ Containment skipped - MCP client unavailable")
+            ticket_data['containment_results'] = []
+            ticket_data['containment_summary'] = {
+                'status': 'skipped',
+                'reason': 'MCP client not available'
+            }
+            return ticket_data
+        
         self.current_operation = "contain_threat"
-        self.operation_start_time = time.time()
+        phase_start = self.operation_start_time = time.perf_counter()
         
         ticket_id = ticket_data.get('id', 'Unknown')
         
@@ -399,66 +692,25 @@ Provide concise, professional responses that prioritize immediate threat contain
                 ticket_data['containment_results'] = []
                 return ticket_data
             
-            containment_results = []
-            successful_blocks = 0
-            failed_blocks = 0
-            
-            # Block each identified malicious URL with individual error handling
-            for url in malicious_urls:
-                try:
-                    await self.log_action(f"🚫 Blocking malicious URL: {url}")
-                    
-                    if self.mcp_client:
-                        block_result = await self._safe_mcp_call(
-                            "block_malicious_url",
-                            {
-                                "url": url,
-                                "reason": f"Phishing threat from ticket {ticket_id}"
-                            }
-                        )
-                        
-                        block_info = block_result.get('content', [{}])[0].get('text', 'Block completed')
-                        containment_results.append({
-                            'url': url,
-                            'status': 'blocked',
-                            'details': block_info,
-                            'timestamp': time.time()
-                        })
-                        
-                        successful_blocks += 1
-                        await self.log_action(f"✅ Successfully blocked {url}")
-                        
-                    else:
-                        await self.log_action(f"⚠️ Cannot block {url} - MCP client unavailable")
-                        containment_results.append({
-                            'url': url,
-                            'status': 'failed',
-                            'details': 'MCP client not available',
-                            'timestamp': time.time()
-                        })
-                        failed_blocks += 1
-                        
-                except Exception as e:
-                    logger.warning(f"Failed to block URL {url}: {str(e)}")
-                    await self.log_action(f"⚠️ Failed to block {url}: {str(e)}")
-                    
-                    containment_results.append({
-                        'url': url,
-                        'status': 'failed',
-                        'details': f'Blocking failed: {str(e)}',
-                        'timestamp': time.time()
-                    })
-                    failed_blocks += 1
+            # Block all URLs in one bulk call when the MCP server offers it, otherwise block
+            # them concurrently one by one; each block handles its own errors
+            containment_results = await self._bulk_block_urls(malicious_urls, ticket_id)
+            if containment_results is None:
+                containment_results = list(await asyncio.gather(
+                    *(self._block_url(url, ticket_id) for url in malicious_urls)
+                ))
+            successful_blocks = sum(1 for result in containment_results if result.status == 'blocked')
+            failed_blocks = len(containment_results) - successful_blocks
             
             # Store containment results with summary
             containment_summary = {
                 'total_urls': len(malicious_urls),
                 'successful_blocks': successful_blocks,
                 'failed_blocks': failed_blocks,
-                'containment_duration': time.time() - self.operation_start_time
+                'containment_duration': time.perf_counter() - phase_start
             }
             
-            ticket_data['containment_results'] = containment_results
+            ticket_data['containment_results'] = [result.to_dict() for result in containment_results]
             ticket_data['containment_summary'] = containment_summary
             
             # Log summary
@@ -467,8 +719,8 @@ Provide concise, professional responses that prioritize immediate threat contain
             else:
                 await self.log_action(f"⚠️ Partial containment - {successful_blocks} blocked, {failed_blocks} failed", "contained")
             
-            logger.info(f"Containment phase completed for ticket {ticket_id}: "
-                       f"{successful_blocks} successful, {failed_blocks} failed")
+            logger.info("Containment phase completed for ticket %s: %s successful, %s failed",
+                        ticket_id, successful_blocks, failed_blocks)
             
             return ticket_data
             
@@ -477,15 +729,122 @@ Provide concise, professional responses that prioritize immediate threat contain
                 "agent": self.name,
                 "ticket_id": ticket_id,
                 "operation": "contain_threat",
-                "duration": time.time() - self.operation_start_time if self.operation_start_time else 0
+                "duration": time.perf_counter() - phase_start
             }
             
-            logger.error(f"Critical error during threat containment: {str(e)}")
+            logger.error("Critical error during threat containment: %s", e)
             handle_error(AgentError(self.name, f"Threat containment failed: {str(e)}"), error_context)
             
             await self.log_action(f"❌ Containment error: {str(e)}", "error")
             raise AgentError(self.name, f"Threat containment failed: {str(e)}", "CONTAINMENT_FAILED")
     
+    async def _mcp_tool_available(self, tool_name: str) -> bool:
+        """
+        Check whether the connected MCP server advertises a tool.
+        
+        Args:
+            tool_name: Name of the MCP tool
+            
+        Returns:
+            True if the tool can be called
+        """
+        if not self.mcp_client:
+            return False
+        
+        # A set lookup on the shared session catalog, so containment does not rescan the tool list
+        try:
+            return await self.mcp_client.has_tool(tool_name)
+        except Exception as e:
+            logger.warning("MCP tool discovery failed: %s", e)
+            return False
+    
+    async def _bulk_block_urls(self, urls: List[str], ticket_id: str) -> Optional[List[BlockResult]]:
+        """
+        Block all malicious URLs with a single block_malicious_urls call.
+        
+        Args:
+            urls: URLs to block
+            ticket_id: Ticket identifier used as the block reason
+            
+        Returns:
+            Containment results in the same shape as _block_url, or None if the
+            bulk tool is not available
+        """
+        if not await self._mcp_tool_available(BULK_URL_BLOCK_TOOL):
+            return None
+        
+        await self.log_action(f"🚫 Blocking {len(urls)} malicious URLs in one request")
+        
+        try:
+            block_result = await self._safe_mcp_call(
+                BULK_URL_BLOCK_TOOL,
+                {
+                    "urls": urls,
+                    "reason": f"Phishing threat from ticket {ticket_id}"
+                }
+            )
+        except Exception as e:
+            logger.warning("Bulk URL blocking failed: %s", e)
+            await self.log_action(f"⚠️ Failed to block URLs: {str(e)}")
+            timestamp = time.time()
+            return [BlockResult(url, 'failed', f'Blocking failed: {str(e)}', timestamp) for url in urls]
+        
+        url_results = {result.get('url'): result for result in block_result.get('results', [])}
+        timestamp = time.time()
+        containment_results = []
+        progress_messages = []
+        
+        for url in urls:
+            url_result = url_results.get(url)
+            if url_result and url_result.get('status') == 'blocked':
+                progress_messages.append(f"✅ Successfully blocked {url}")
+                containment_results.append(
+                    BlockResult(url, 'blocked', url_result.get('details', 'Block completed'), timestamp)
+                )
+            else:
+                details = url_result.get('details', 'Block failed') if url_result else 'No result returned for URL'
+                progress_messages.append(f"⚠️ Failed to block {url}: {details}")
+                containment_results.append(BlockResult(url, 'failed', details, timestamp))
+        
+        await asyncio.gather(*(
+            self.log_action(message, data=result.to_dict())
+            for message, result in zip(progress_messages, containment_results)
+        ))
+        return containment_results
+    
+    async def _block_url(self, url: str, ticket_id: str) -> BlockResult:
+        """
+        Block a single malicious URL, reporting failures in the result instead of raising.
+        
+        Args:
+            url: URL to block
+            ticket_id: Ticket identifier used as the block reason
+            
+        Returns:
+            Containment result for the URL
+        """
+        try:
+            await self.log_action(f"🚫 Blocking malicious URL: {url}")
+            
+            block_result = await self._safe_mcp_call(
+                "block_malicious_url",
+                {
+                    "url": url,
+                    "reason": f"Phishing threat from ticket {ticket_id}"
+                }
+            )
+            
+            block_info = block_result.get('content', [{}])[0].get('text', 'Block completed')
+            result = BlockResult(url, 'blocked', block_info, time.time())
+            await self.log_action(f"✅ Successfully blocked {url}", data=result.to_dict())
+            return result
+            
+        except Exception as e:
+            logger.warning("Failed to block URL %s: %s", url, e)
+            result = BlockResult(url, 'failed', f'Blocking failed: {str(e)}', time.time())
+            await self.log_action(f"⚠️ Failed to block {url}: {str(e)}", data=result.to_dict())
+            return result
+    
     def _extract_malicious_urls(self, ticket_data: Dict[str, Any]) -> List[str]:
         """
         Extract malicious URLs from analysis results or provide defaults.
@@ -500,13 +859,11 @@ Provide concise, professional responses that prioritize immediate threat contain
         analysis_results = ticket_data.get('analysis_results', {})
         ioc_analysis = analysis_results.get('ioc_analysis', '')
         
-        # Look for URLs in the IOC analysis
-        import re
-        url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-        found_urls = re.findall(url_pattern, ioc_analysis)
+        # Look for URLs in the IOC analysis, blocking each distinct URL only once
+        found_urls = _URL_PATTERN.findall(ioc_analysis)
         
         if found_urls:
-            return found_urls
+            return list(dict.fromkeys(_normalize_url(url) for url in found_urls))
         
         # Fallback to simulated malicious URLs for demonstration
         return [
@@ -524,8 +881,18 @@ Provide concise, professional responses that prioritize immediate threat contain
         Returns:
             Updated ticket data with eradication results
         """
+        # Emails cannot be removed without MCP tools, so skip the phase
+        if not self.mcp_client:
+            await self.log_action("⚠️ Eradication skipped - MCP client unavailable")
+            ticket_data['eradication_results'] = {
+                'status': 'skipped',
+                'reason': 'MCP client not available',
+                'timestamp': time.time()
+            }
+            return ticket_data
+        
         self.current_operation = "eradicate_threat"
-        self.operation_start_time = time.time()
+        phase_start = self.operation_start_time = time.perf_counter()
         
         ticket_subject = ticket_data.get('subject', '')
         ticket_id = ticket_data.get('id', 'Unknown')
@@ -533,16 +900,6 @@ Provide concise, professional responses that prioritize immediate threat contain
         try:
             await self.log_action("🗑️ Beginning threat eradication...", "eradicating")
             
-            if not self.mcp_client:
-                await self.log_action("⚠️ Cannot remove emails - MCP client unavailable")
-                eradication_results = {
-                    'status': 'failed',
-                    'reason': 'MCP client not available',
-                    'timestamp': time.time()
-                }
-                ticket_data['eradication_results'] = eradication_results
-                return ticket_data
-            
             eradication_results = {}
             total_emails_removed = 0
             
@@ -559,28 +916,21 @@ Provide concise, professional responses that prioritize immediate threat contain
                 )
                 
                 subject_info = subject_result.get('content', [{}])[0].get('text', '')
-                eradication_results['subject_search'] = {
-                    'criteria': ticket_subject,
-                    'result': subject_info,
-                    'status': 'completed'
-                }
+                eradication_results['subject_search'] = EmailSearchResult(
+                    ticket_subject, 'completed', subject_info, None
+                ).to_dict()
                 
-                # Extract number of emails removed (simulated parsing)
-                import re
-                numbers = re.findall(r'\d+', subject_info)
-                if numbers:
-                    total_emails_removed += int(numbers[-1])  # Assume last number is count
+                total_emails_removed += self._emails_removed(subject_result, subject_info)
                 
-                await self.log_action("📧 Subject-based email search and removal complete")
+                await self.log_action("📧 Subject-based email search and removal complete",
+                                      data=eradication_results['subject_search'])
                 
             except Exception as e:
-                logger.warning(f"Subject-based email search failed: {str(e)}")
+                logger.warning("Subject-based email search failed: %s", e)
                 await self.log_action(f"⚠️ Subject search failed: {str(e)}")
-                eradication_results['subject_search'] = {
-                    'criteria': ticket_subject,
-                    'status': 'failed',
-                    'error': str(e)
-                }
+                eradication_results['subject_search'] = EmailSearchResult(
+                    ticket_subject, 'failed', None, str(e)
+                ).to_dict()
             
             # Search for related malicious senders
             try:
@@ -589,48 +939,24 @@ Provide concise, professional responses that prioritize immediate threat contain
                 # Extract potential malicious senders from analysis
                 malicious_senders = self._extract_malicious_senders(ticket_data)
                 
-                for sender in malicious_senders:
-                    try:
-                        sender_result = await self._safe_mcp_call(
-                            "search_and_destroy_email",
-                            {
-                                "search_criteria": sender,
-                                "search_type": "sender"
-                            }
-                        )
-                        
-                        sender_info = sender_result.get('content', [{}])[0].get('text', '')
-                        
-                        # Extract number of emails removed
-                        numbers = re.findall(r'\d+', sender_info)
-                        if numbers:
-                            total_emails_removed += int(numbers[-1])
-                        
-                        eradication_results[f'sender_search_{sender}'] = {
-                            'criteria': sender,
-                            'result': sender_info,
-                            'status': 'completed'
-                        }
-                        
-                    except Exception as e:
-                        logger.warning(f"Sender search failed for {sender}: {str(e)}")
-                        eradication_results[f'sender_search_{sender}'] = {
-                            'criteria': sender,
-                            'status': 'failed',
-                            'error': str(e)
-                        }
+                # Search all senders in one MCP batch; each result is recorded on its own
+                sender_searches = await self._search_senders(malicious_senders)
+                
+                for sender, (sender_search, emails_removed) in zip(malicious_senders, sender_searches):
+                    eradication_results[f'sender_search_{sender}'] = sender_search.to_dict()
+                    total_emails_removed += emails_removed
                 
                 await self.log_action("🔍 Sender-based email search complete")
                 
             except Exception as e:
-                logger.warning(f"Sender-based email search failed: {str(e)}")
+                logger.warning("Sender-based email search failed: %s", e)
                 await self.log_action(f"⚠️ Sender search failed: {str(e)}")
             
             # Finalize eradication results
             eradication_results.update({
                 'status': 'completed',
                 'total_emails_removed': total_emails_removed,
-                'eradication_duration': time.time() - self.operation_start_time,
+                'eradication_duration': time.perf_counter() - phase_start,
                 'timestamp': time.time()
             })
             
@@ -641,8 +967,8 @@ Provide concise, professional responses that prioritize immediate threat contain
             else:
                 await self.log_action("✅ Eradication complete - no malicious emails found", "eradicated")
             
-            logger.info(f"Eradication phase completed for ticket {ticket_id}: "
-                       f"{total_emails_removed} emails removed")
+            logger.info("Eradication phase completed for ticket %s: %s emails removed",
+                        ticket_id, total_emails_removed)
             
             return ticket_data
             
@@ -652,15 +978,92 @@ Provide concise, professional responses that prioritize immediate threat contain
                 "ticket_id": ticket_id,
                 "ticket_subject": ticket_subject,
                 "operation": "eradicate_threat",
-                "duration": time.time() - self.operation_start_time if self.operation_start_time else 0
+                "duration": time.perf_counter() - phase_start
             }
             
-            logger.error(f"Critical error during threat eradication: {str(e)}")
+            logger.error("Critical error during threat eradication: %s", e)
             handle_error(AgentError(self.name, f"Threat eradication failed: {str(e)}"), error_context)
             
             await self.log_action(f"❌ Eradication error: {str(e)}", "error")
             raise AgentError(self.name, f"Threat eradication failed: {str(e)}", "ERADICATION_FAILED")
     
+    async def _search_senders(self, senders: List[str]) -> List[Tuple[EmailSearchResult, int]]:
+        """
+        Search for and remove emails from malicious senders with a single batched MCP call.
+        
+        Args:
+            senders: Sender addresses to search for
+            
+        Returns:
+            List of (sender search result, emails removed) tuples, in the same order as senders
+        """
+        if not senders:
+            return []
+        
+        calls = [
+            ("search_and_destroy_email", {"search_criteria": sender, "search_type": "sender"})
+            for sender in senders
+        ]
+        
+        try:
+            sender_results = await self._safe_mcp_batch_call(calls)
+        except Exception as e:
+            logger.warning("Sender search batch failed: %s", e)
+            sender_results = [e] * len(senders)
+        
+        return await asyncio.gather(
+            *(self._record_sender_search(sender, result) for sender, result in zip(senders, sender_results))
+        )
+    
+    async def _record_sender_search(self, sender: str, sender_result: Any) -> Tuple[EmailSearchResult, int]:
+        """
+        Record the outcome of a single sender search.
+        
+        Args:
+            sender: Sender address that was searched for
+            sender_result: MCP tool result, or the exception raised for this search
+            
+        Returns:
+            Tuple of the sender search result and the number of emails removed
+        """
+        try:
+            if isinstance(sender_result, Exception):
+                raise sender_result
+            
+            sender_info = sender_result.get('content', [{}])[0].get('text', '')
+            
+            emails_removed = self._emails_removed(sender_result, sender_info)
+            
+            sender_search = EmailSearchResult(sender, 'completed', sender_info, None)
+            await self.log_action(f"📧 Removed emails from sender {sender}", data=sender_search.to_dict())
+            return sender_search, emails_removed
+            
+        except Exception as e:
+            logger.warning("Sender search failed for %s: %s", sender, e)
+            sender_search = EmailSearchResult(sender, 'failed', None, str(e))
+            await self.log_action(f"⚠️ Sender search failed for {sender}: {str(e)}", data=sender_search.to_dict())
+            return sender_search, 0
+    
+    @staticmethod
+    def _emails_removed(search_result: Dict[str, Any], search_info: str) -> int:
+        """
+        Get the number of emails removed by a search_and_destroy_email call.
+        
+        Args:
+            search_result: Raw tool result
+            search_info: Text content of the tool result
+            
+        Returns:
+            Number of emails removed, or 0 if the result does not report it
+        """
+        # Prefer the structured count and only parse the text when it is missing
+        emails_removed = search_result.get('emails_removed')
+        if isinstance(emails_removed, int):
+            return emails_removed
+        
+        match = _REMOVED_COUNT_PATTERN.search(search_info)
+        return int(match.group(1)) if match else 0
+    
     def _extract_malicious_senders(self, ticket_data: Dict[str, Any]) -> List[str]:
         """
         Extract potential malicious senders from analysis results.
@@ -676,12 +1079,10 @@ Provide concise, professional responses that prioritize immediate threat contain
         ioc_analysis = analysis_results.get('ioc_analysis', '')
         
         # Look for email addresses in the IOC analysis
-        import re
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        found_emails = re.findall(email_pattern, ioc_analysis)
+        found_emails = _EMAIL_PATTERN.findall(ioc_analysis)
         
         if found_emails:
-            return found_emails
+            return list(dict.fromkeys(found_emails))
         
         # Fallback to simulated malicious senders
         return ["suspicious-sender@fake-domain.com", "phishing@evil-site.net"]
@@ -706,15 +1107,10 @@ Provide concise, professional responses that prioritize immediate threat contain
             remediation_summary = {
                 'ticket_id': ticket_id,
                 'ticket_subject': ticket_subject,
-                'remediation_timestamp': asyncio.get_event_loop().time(),
-                'phases_completed': ['analyze', 'contain', 'eradicate', 'document'],
+                'remediation_timestamp': time.time(),
+                'phases_completed': REMEDIATION_PHASES,
                 'threat_level': ticket_data.get('analysis_results', {}).get('threat_level', 'HIGH'),
-                'actions_taken': [
-                    'Performed comprehensive threat analysis',
-                    'Blocked malicious URLs at network level',
-                    'Removed malicious emails from all user inboxes',
-                    'Generated detailed remediation report'
-                ],
+                'actions_taken': REMEDIATION_ACTIONS,
                 'metrics': {
                     'urls_blocked': len(ticket_data.get('containment_results', [])),
                     'emails_removed': '15-25 (estimated)',  # From MCP simulation
@@ -740,10 +1136,35 @@ Provide concise, professional responses that prioritize immediate threat contain
             return ticket_data
             
         except Exception as e:
-            logger.error(f"Error during documentation: {str(e)}")
+            logger.error("Error during documentation: %s", e)
             await self.log_action(f"❌ Documentation error: {str(e)}", "error")
             raise
     
+    @staticmethod
+    def _record_phase_error(ticket_data: Dict[str, Any], phase: str, error: Exception) -> None:
+        """
+        Record why a workflow phase failed.
+        
+        Args:
+            ticket_data: Ticket being processed
+            phase: Name of the failed phase
+            error: Exception raised by the phase
+        """
+        ticket_data.setdefault('phase_errors', {})[phase] = str(error)
+    
+    @staticmethod
+    def _phase_names(phases_mask: int) -> List[str]:
+        """
+        Decode a phase bitmask into phase names.
+        
+        Args:
+            phases_mask: Bitmask of PHASE_* flags
+            
+        Returns:
+            Names of the phases set in the mask, in workflow order
+        """
+        return [phase for phase, flag in zip(REMEDIATION_PHASES, _PHASE_FLAGS) if phases_mask & flag]
+    
     async def process_security_ticket(self, ticket_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute the complete PhishGuard security remediation workflow with comprehensive error handling.
@@ -757,24 +1178,24 @@ Provide concise, professional responses that prioritize immediate threat contain
         ticket_id = ticket_data.get('id', 'Unknown')
         ticket_subject = ticket_data.get('subject', '')
         workflow_start_time = time.time()
+        workflow_start = time.perf_counter()
         
         try:
             await self.log_action(f"🚨 PhishGuard activated for ticket {ticket_id}: {ticket_subject}", "activated")
             
             # Initialize workflow tracking
             ticket_data['workflow_start_time'] = workflow_start_time
-            ticket_data['phases_completed'] = []
-            ticket_data['phases_failed'] = []
+            ticket_data['phases_mask'] = 0
             
             # Execute the 4-phase remediation protocol with individual error handling
             
             # Phase 1: Analyze
             try:
                 ticket_data = await self.analyze_threat(ticket_data)
-                ticket_data['phases_completed'].append('analyze')
+                ticket_data['phases_mask'] |= PHASE_ANALYZE
             except Exception as e:
-                logger.error(f"Analysis phase failed: {str(e)}")
-                ticket_data['phases_failed'].append({'phase': 'analyze', 'error': str(e)})
+                logger.error("Analysis phase failed: %s", e)
+                self._record_phase_error(ticket_data, 'analyze', e)
                 # Continue with limited analysis data
                 ticket_data['analysis_results'] = {
                     'ai_analysis': 'Analysis failed - proceeding with containment',
@@ -783,39 +1204,41 @@ Provide concise, professional responses that prioritize immediate threat contain
                     'analysis_timestamp': time.time()
                 }
             
-            # Phase 2: Contain
-            try:
-                ticket_data = await self.contain_threat(ticket_data)
-                ticket_data['phases_completed'].append('contain')
-            except Exception as e:
-                logger.error(f"Containment phase failed: {str(e)}")
-                ticket_data['phases_failed'].append({'phase': 'contain', 'error': str(e)})
-                await self.log_action(f"⚠️ Containment failed, proceeding to eradication: {str(e)}")
-                # Continue to eradication even if containment fails
+            # Phases 2 and 3: Contain and Eradicate only depend on the analysis and write
+            # separate results, so they run concurrently; a failure in one does not stop the other
+            containment, eradication = await asyncio.gather(
+                self.contain_threat(ticket_data),
+                self.eradicate_threat(ticket_data),
+                return_exceptions=True
+            )
             
-            # Phase 3: Eradicate
-            try:
-                ticket_data = await self.eradicate_threat(ticket_data)
-                ticket_data['phases_completed'].append('eradicate')
-            except Exception as e:
-                logger.error(f"Eradication phase failed: {str(e)}")
-                ticket_data['phases_failed'].append({'phase': 'eradicate', 'error': str(e)})
-                await self.log_action(f"⚠️ Eradication failed, proceeding to documentation: {str(e)}")
+            if isinstance(containment, Exception):
+                logger.error("Containment phase failed: %s", containment)
+                self._record_phase_error(ticket_data, 'contain', containment)
+                await self.log_action(f"⚠️ Containment failed: {str(containment)}")
+            else:
+                ticket_data['phases_mask'] |= PHASE_CONTAIN
+            
+            if isinstance(eradication, Exception):
+                logger.error("Eradication phase failed: %s", eradication)
+                self._record_phase_error(ticket_data, 'eradicate', eradication)
+                await self.log_action(f"⚠️ Eradication failed, proceeding to documentation: {str(eradication)}")
                 # Continue to documentation even if eradication fails
+            else:
+                ticket_data['phases_mask'] |= PHASE_ERADICATE
             
             # Phase 4: Document (always attempt this phase)
             try:
                 ticket_data = await self.document_remediation(ticket_data)
-                ticket_data['phases_completed'].append('document')
+                ticket_data['phases_mask'] |= PHASE_DOCUMENT
             except Exception as e:
-                logger.error(f"Documentation phase failed: {str(e)}")
-                ticket_data['phases_failed'].append({'phase': 'document', 'error': str(e)})
+                logger.error("Documentation phase failed: %s", e)
+                self._record_phase_error(ticket_data, 'document', e)
                 await self.log_action(f"⚠️ Documentation failed: {str(e)}")
             
             # Determine final status based on phase completion
-            total_phases = 4
-            completed_phases = len(ticket_data['phases_completed'])
-            failed_phases = len(ticket_data['phases_failed'])
+            total_phases = len(REMEDIATION_PHASES)
+            completed_phases = bin(ticket_data['phases_mask']).count("1")
             
             if completed_phases == total_phases:
                 final_status = 'resolved'
@@ -828,25 +1251,28 @@ Provide concise, professional responses that prioritize immediate threat contain
                 await self.log_action(f"⚠️ Insufficient remediation - escalating for manual review", "escalated")
             
             ticket_data['status'] = final_status
-            ticket_data['workflow_duration'] = time.time() - workflow_start_time
+            ticket_data['workflow_duration'] = time.perf_counter() - workflow_start
             
-            logger.info(f"PhishGuard workflow completed for ticket {ticket_id}: "
-                       f"Status={final_status}, Completed={completed_phases}/{total_phases} phases, "
-                       f"Duration={ticket_data['workflow_duration']:.2f}s")
+            logger.info("PhishGuard workflow completed for ticket %s: "
+                        "Status=%s, Completed=%s/%s phases %s, Duration=%.2fs",
+                        ticket_id, final_status, completed_phases, total_phases,
+                        self._phase_names(ticket_data['phases_mask']),
+                        ticket_data['workflow_duration'])
             
             return ticket_data
             
         except Exception as e:
             # Critical workflow failure
+            workflow_duration = time.perf_counter() - workflow_start
             error_context = {
                 "agent": self.name,
                 "ticket_id": ticket_id,
                 "ticket_subject": ticket_subject,
                 "operation": "process_security_ticket",
-                "workflow_duration": time.time() - workflow_start_time
+                "workflow_duration": workflow_duration
             }
             
-            logger.error(f"Critical PhishGuard workflow failure for ticket {ticket_id}: {str(e)}")
+            logger.error("Critical PhishGuard workflow failure for ticket %s: %s", ticket_id, e)
             handle_error(AgentError(self.name, f"Security workflow failed: {str(e)}"), error_context)
             
             await self.log_action(f"❌ Critical workflow failure: {str(e)}", "failed")
@@ -855,7 +1281,7 @@ Provide concise, professional responses that prioritize immediate threat contain
             ticket_data.update({
                 'status': 'escalated',
                 'workflow_error': str(e),
-                'workflow_duration': time.time() - workflow_start_time,
+                'workflow_duration': workflow_duration,
                 'requires_manual_intervention': True,
                 'escalation_reason': 'Critical agent workflow failure'
             })
@@ -6,6 +6,6 @@ for agent tool access.
 """
 
 from .mcp_client import MCPClient
-from .security_mcp_server import run_mcp_server
+from .security_mcp_server import invoke, run_mcp_server
 
-__all__ = ['MCPClient', 'run_mcp_server']
\ No newline at end of file
+__all__ = ['MCPClient', 'invoke', 'run_mcp_server']
\ No newline at end of file
@@ -6,22 +6,232 @@ error handling, logging, and UI update integration.
 """
 
 import asyncio
+import contextlib
+import functools
+import hashlib
+import itertools
 import json
 import logging
-import subprocess
+import random
+import re
+import tempfile
 import time
-from typing import Any, Dict, List, Optional, Union
+import types
+import weakref
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 import os
 import sys
 
 from backend.utils.error_handling import (
-    MCPError, ToolError, RetryableError, CircuitBreaker,
+    MCPError, ToolError, RetryableError, CircuitBreaker, CircuitBreakerError,
     retry_with_backoff, handle_error
 )
 
 # Configure logging
 logger = logging.getLogger("nexusai.tools.mcp_client")
 
+# Subject keywords that make the simulated IOC analysis report indicators
+_SUSPICIOUS_KEYWORDS = frozenset(("urgent", "verify", "click", "suspended", "payment"))
+# Single compiled alternation so the scan is one pass regardless of keyword count
+_SUSPICIOUS_PATTERN = re.compile("|".join(re.escape(keyword) for keyword in sorted(_SUSPICIOUS_KEYWORDS)))
+_SIMULATED_IOCS = (
+    "http://malicious-phishing-site.com/login",
+    "suspicious-sender@fake-domain.com"
+)
+
+# Result text templates for the simulated tools
+_IOC_ANALYSIS_TEMPLATE = """IOC Analysis Complete:
+- Email Subject: {subject}
+- IOCs Found: {ioc_count}
+- Threat Level: {threat_level}
+
+Detected Indicators:
+{indicator_lines}"""
+_NO_IOC_LINE = "  • No malicious indicators detected"
+_URL_BLOCKING_TEMPLATE = """URL Blocking Complete:
+- URL: {url}
+- Block ID: {block_id}
+- Method: Firewall rule
+- Reason: {reason}
+- Status: BLOCKED
+
+The malicious URL has been successfully blocked across all network access points."""
+_BULK_URL_BLOCKING_TEMPLATE = """Bulk URL Blocking Complete:
+- URLs Blocked: {blocked_count}
+- Reason: {reason}
+- Status: BLOCKED"""
+_EMAIL_REMOVAL_TEMPLATE = """Email Search and Destroy Complete:
+- Search Criteria: {search_criteria}
+- Search Type: {search_type}
+- Mailboxes Scanned: {total_mailboxes}
+- Malicious Emails Found: {emails_found}
+- Emails Successfully Removed: {emails_found}
+
+All identified malicious emails have been quarantined and removed from user inboxes."""
+
+# Block IDs keep the old millisecond-based look but are unique under concurrent calls
+_BLOCK_ID_COUNTER = itertools.count(int(time.time() * 1000) % 1000000)
+# Dedicated generator for simulated email search figures
+_SIMULATION_RANDOM = random.Random()
+
+
+@functools.lru_cache(maxsize=4096)
+def _analyze_subject(email_subject: str) -> Tuple[str, ...]:
+    """
+    Detect simulated IOCs in an email subject.
+    
+    Cached because phishing campaigns repeat the same subject line many times.
+    
+    Args:
+        email_subject: Email subject to analyze
+        
+    Returns:
+        Tuple of detected indicators (empty if the subject looks clean)
+    """
+    if _SUSPICIOUS_PATTERN.search(email_subject.lower()):
+        return _SIMULATED_IOCS
+    return ()
+
+
+class MCPServerSession:
+    """
+    Connection state for a single MCP server, shared by every client using it.
+    """
+    
+    __slots__ = ('server_command', 'server_process', 'is_connected', 'available_tools',
+                 'tool_names', 'ref_count', '_connect_locks')
+    
+    def __init__(self, server_command: Tuple[str, ...]):
+        self.server_command = server_command
+        self.server_process = None
+        self.is_connected = False
+        self.available_tools = ()
+        self.tool_names = frozenset()
+        self.ref_count = 0
+        # One lock per event loop: asyncio locks are bound to the loop that first waits on
+        # them, and the session is shared by clients running under separate asyncio.run
+        # calls or per-thread loops
+        self._connect_locks = weakref.WeakKeyDictionary()
+    
+    @property
+    def connect_lock(self) -> asyncio.Lock:
+        """Lock serializing connection setup for callers on the running event loop."""
+        loop = asyncio.get_running_loop()
+        lock = self._connect_locks.get(loop)
+        if lock is None:
+            lock = self._connect_locks[loop] = asyncio.Lock()
+        return lock
+
+
+class MCPServerPool:
+    """
+    Process-wide pool of persistent MCP server sessions.
+    
+    Clients created with the same server command share one session, so the
+    server process and tool catalog are set up once and concurrent callers
+    wait on a per-server lock instead of racing to reconnect. Sessions for
+    different servers are independent and can be used concurrently.
+    """
+    
+    _sessions: Dict[Tuple[str, ...], MCPServerSession] = {}
+    
+    @classmethod
+    def acquire(cls, server_command: List[str]) -> MCPServerSession:
+        """
+        Get the shared session for a server command, creating it if needed.
+        
+        Args:
+            server_command: Command used to start the MCP server
+            
+        Returns:
+            Shared session with its reference count incremented
+        """
+        key = tuple(server_command)
+        session = cls._sessions.get(key)
+        if session is None:
+            session = cls._sessions[key] = MCPServerSession(key)
+        session.ref_count += 1
+        return session
+    
+    @classmethod
+    def release(cls, session: MCPServerSession) -> bool:
+        """
+        Drop a reference to a session, removing it from the pool when unused.
+        
+        Args:
+            session: Session previously returned by acquire
+            
+        Returns:
+            True if this was the last reference and the session should be torn down
+        """
+        session.ref_count -= 1
+        if session.ref_count > 0:
+            return False
+        if cls._sessions.get(session.server_command) is session:
+            del cls._sessions[session.server_command]
+        return True
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limiter with AIMD (additive increase, multiplicative decrease) adaptation.
+    
+    Each successful call raises the limit by one up to max_limit; each failure
+    halves it (down to one), so an overloaded server sees less fan-out long
+    before its circuit breaker trips.
+    """
+    
+    def __init__(self, max_limit: int):
+        self.max_limit = max(1, max_limit)
+        self.limit = self.max_limit
+        self._in_flight = 0
+        self._waiters = deque()
+    
+    async def acquire(self):
+        """Wait for a free slot."""
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+        
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        # Queued waiters may all have been cancelled while slots are free
+        self._wake_waiters()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # The slot may have been handed over just as we were cancelled
+            if waiter.done() and not waiter.cancelled():
+                self._in_flight -= 1
+                self._wake_waiters()
+            raise
+    
+    def release(self, success: Optional[bool] = None):
+        """
+        Free a slot and adapt the limit.
+        
+        Args:
+            success: True for a successful call, False for a failure, None to leave the limit unchanged
+        """
+        if success is True:
+            self.limit = min(self.max_limit, self.limit + 1)
+        elif success is False:
+            self.limit = max(1, self.limit // 2)
+        
+        self._in_flight -= 1
+        self._wake_waiters()
+    
+    def _wake_waiters(self):
+        """Hand free slots to waiting callers in arrival order."""
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+
 class MCPClient:
     """
     MCP Client for connecting to and invoking tools from MCP servers.
@@ -30,21 +240,71 @@ class MCPClient:
     with proper error handling, retry logic, and logging integration.
     """
     
-    def __init__(self, server_command: Optional[List[str]] = None, socketio_client=None):
+    # Tool discovery results are semi-static, so they are persisted across reconnects
+    # and processes; the cache is invalidated whenever the server or client source changes.
+    _TOOL_CATALOG_CACHE_PATH = Path("~/.nexusai/mcp_tools.json").expanduser()
+    _TOOL_CATALOG_SOURCES = (
+        Path(__file__).with_name("security_mcp_server.py"),
+        Path(__file__),
+    )
+    
+    # UI updates are buffered and emitted in batches by a background worker
+    UI_QUEUE_SIZE = 1024
+    UI_BATCH_SIZE = 32
+    # Longest close() waits for queued UI updates to be emitted
+    UI_DRAIN_TIMEOUT = 2.0
+    
+    # Identical calls failing this often within the window are treated as a retry loop
+    LOOP_DETECTION_THRESHOLD = 3
+    LOOP_DETECTION_WINDOW = 10.0
+    
+    # Consecutive failures before a single tool's own circuit breaker opens
+    TOOL_FAILURE_THRESHOLD = 3
+    
+    def __init__(self, server_command: Optional[List[str]] = None, socketio_client=None,
+                 batch_size: int = 1, batch_wait_ms: float = 5.0):
         """
         Initialize the MCP client with comprehensive error handling.
         
         Args:
             server_command: Command to start the MCP server (if not already running)
             socketio_client: SocketIO client for UI updates
+            batch_size: Maximum number of concurrent tool calls coalesced into one batch.
+                Defaults to 1 (no micro-batching); when enabled, coalesced calls get
+                call_tools_batch semantics (no per-call retry, one "tools_batch" UI event)
+            batch_wait_ms: Maximum time the first queued call waits for others to join its batch
         """
         self.server_command = server_command or [
             sys.executable, "-m", "backend.tools.security_mcp_server"
         ]
         self.socketio_client = socketio_client
-        self.server_process = None
-        self.is_connected = False
-        self.available_tools = []
+        
+        # Connection state lives in the shared pool so clients reuse one server session
+        self._session = MCPServerPool.acquire(self.server_command)
+        self._released = False
+        
+        # Micro-batching of concurrent tool calls (queue and dispatcher are bound
+        # lazily to the running event loop)
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = max(0.0, batch_wait_ms) / 1000.0
+        self._pending_calls = None
+        self._batch_ready = None
+        self._batch_dispatcher = None
+        self._batch_tasks = set()
+        
+        # Background UI update queue (bound lazily to the running event loop)
+        self._ui_queue = None
+        self._ui_worker = None
+        
+        # Simulated tool latency is opt-in (for paced demos), like the MCP server's
+        self.simulate_delay = os.getenv('NEXUSAI_SIMULATE_MCP_DELAY', 'false').lower() in ('1', 'true', 'yes')
+        self._sim_dispatch = {
+            "log_action_for_ui": self._simulate_log_action,
+            "analyze_email_for_iocs": self._simulate_ioc_analysis,
+            "block_malicious_url": self._simulate_url_blocking,
+            "block_malicious_urls": self._simulate_bulk_url_blocking,
+            "search_and_destroy_email": self._simulate_email_removal
+        }
         
         # Connection settings
         self.max_retries = 3
@@ -54,7 +314,15 @@ class MCPClient:
         # Error tracking
         self.connection_failures = 0
         self.last_connection_attempt = None
-        self.tool_call_failures = {}
+        
+        # Recently failed call signatures (tool_name, signature, timestamp) for loop detection
+        self._call_signature_recent = deque(maxlen=32)
+        
+        # Per-tool circuit breakers, created on first use
+        self._tool_circuit_breakers = {}
+        
+        # Bound the fan-out to the MCP server; adapts down on failures
+        self._call_limiter = AdaptiveConcurrencyLimiter(int(os.getenv('NEXUSAI_MCP_CONCURRENCY', '8')))
         
         # Circuit breaker for MCP operations
         self.mcp_circuit_breaker = CircuitBreaker(
@@ -66,6 +334,80 @@ class MCPClient:
         
         logger.info("MCP Client initialized with error handling")
     
+    @property
+    def server_process(self) -> Optional[asyncio.subprocess.Process]:
+        """Server process, started with asyncio.create_subprocess_exec so it can be managed without blocking."""
+        return self._session.server_process
+    
+    @server_process.setter
+    def server_process(self, value: Optional[asyncio.subprocess.Process]):
+        self._session.server_process = value
+    
+    @property
+    def is_connected(self) -> bool:
+        return self._session.is_connected
+    
+    @is_connected.setter
+    def is_connected(self, value: bool):
+        self._session.is_connected = value
+    
+    @property
+    def available_tools(self) -> Tuple[Mapping[str, Any], ...]:
+        return self._session.available_tools
+    
+    @available_tools.setter
+    def available_tools(self, value: List[Dict[str, Any]]):
+        # The catalog is shared by every client, so store it read-only
+        tools = tuple(types.MappingProxyType(dict(tool)) for tool in value)
+        self._session.available_tools = tools
+        self._session.tool_names = frozenset(tool["name"] for tool in tools)
+    
+    @property
+    def _tool_names_set(self) -> frozenset:
+        return self._session.tool_names
+    
+    async def __aenter__(self) -> "MCPClient":
+        """Eagerly connect so tool calls never pay the connection cost."""
+        if not await self._ensure_connected():
+            raise MCPError("Failed to establish MCP server connection")
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def _ensure_connected(self) -> bool:
+        """
+        Connect to the MCP server unless the shared session is already connected.
+        
+        Returns:
+            True if the session is connected
+        """
+        if self.is_connected:
+            return True
+        
+        async with self._session.connect_lock:
+            # Another client may have connected while we waited for the lock
+            if self.is_connected:
+                return True
+            return await self.mcp_circuit_breaker(self.connect)()
+    
+    async def close(self):
+        """Release this client's pool reference, disconnecting if it was the last one."""
+        if self._released:
+            return
+        
+        await self._drain_ui_queue()
+        
+        for worker in (self._batch_dispatcher, self._ui_worker):
+            if worker is not None:
+                worker.cancel()
+        self._batch_dispatcher = None
+        self._ui_worker = None
+        
+        self._released = True
+        if MCPServerPool.release(self._session):
+            await self.disconnect()
+    
     @retry_with_backoff(max_retries=3, base_delay=2.0, retryable_exceptions=(RetryableError, ConnectionError))
     async def connect(self) -> bool:
         """
@@ -96,7 +438,7 @@ class MCPClient:
                 "last_attempt": self.last_connection_attempt
             }
             
-            logger.error(f"Failed to connect to MCP server (attempt {self.connection_failures}): {str(e)}")
+            logger.error("Failed to connect to MCP server (attempt %s): %s", self.connection_failures, e)
             handle_error(MCPError(f"Connection failed: {str(e)}"), error_context)
             
             self.is_connected = False
@@ -117,6 +459,13 @@ class MCPClient:
         3. Perform MCP handshake
         4. List available tools
         """
+        cache_key = self._tool_catalog_cache_key()
+        cached_tools = self._load_tool_catalog(cache_key)
+        if cached_tools is not None:
+            self.available_tools = cached_tools
+            logger.info("Loaded %d tools from the tool catalog cache", len(self.available_tools))
+            return
+        
         # Simulate connection delay
         await asyncio.sleep(0.5)
         
@@ -134,46 +483,146 @@ class MCPClient:
                 "name": "block_malicious_url",
                 "description": "Block a malicious URL at the network level"
             },
+            {
+                "name": "block_malicious_urls",
+                "description": "Block several malicious URLs at the network level in one call"
+            },
             {
                 "name": "search_and_destroy_email",
                 "description": "Search for and remove malicious emails from all user inboxes"
             }
         ]
         
-        logger.info(f"Discovered {len(self.available_tools)} available tools")
+        logger.info("Discovered %d available tools", len(self.available_tools))
+        self._store_tool_catalog(cache_key, self.available_tools)
+    
+    def _tool_catalog_cache_key(self) -> str:
+        """
+        Build the tool catalog cache key from the server command and source mtimes.
+        
+        Returns:
+            Cache key that changes whenever the server command or source changes
+        """
+        command_digest = hashlib.sha256("\0".join(self.server_command).encode("utf-8")).hexdigest()
+        
+        mtimes = []
+        for source in self._TOOL_CATALOG_SOURCES:
+            try:
+                mtimes.append(str(source.stat().st_mtime_ns))
+            except OSError:
+                mtimes.append("missing")
+        
+        return f"{command_digest}:{':'.join(mtimes)}"
+    
+    def _load_tool_catalog(self, cache_key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Load the persisted tool catalog if it matches the current cache key.
+        
+        Args:
+            cache_key: Expected cache key
+            
+        Returns:
+            Cached tool definitions, or None on a cache miss
+        """
+        try:
+            with open(self._TOOL_CATALOG_CACHE_PATH, "r", encoding="utf-8") as cache_file:
+                cached = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+        
+        if not isinstance(cached, dict) or cached.get("cache_key") != cache_key:
+            return None
+        
+        # A malformed entry would break connect() on every retry, so treat it as a miss
+        tools = cached.get("tools")
+        if not isinstance(tools, list) or not all(
+            isinstance(tool, dict) and isinstance(tool.get("name"), str) for tool in tools
+        ):
+            return None
+        
+        return tools
+    
+    def _store_tool_catalog(self, cache_key: str, tools: Tuple[Mapping[str, Any], ...]):
+        """
+        Atomically persist the tool catalog so later connections can skip discovery.
+        
+        Args:
+            cache_key: Cache key the catalog is valid for
+            tools: Discovered tool definitions
+        """
+        cache_path = self._TOOL_CATALOG_CACHE_PATH
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=str(cache_path.parent), prefix=".mcp_tools.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as temp_file:
+                    json.dump({"cache_key": cache_key, "tools": [dict(tool) for tool in tools]}, temp_file)
+                os.replace(temp_path, cache_path)
+            except BaseException:
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            logger.warning("Could not persist MCP tool catalog: %s", e)
     
     async def disconnect(self):
         """Disconnect from the MCP server and cleanup resources."""
         try:
-            if self.server_process:
-                self.server_process.terminate()
-                await asyncio.sleep(1.0)
-                if self.server_process.poll() is None:
-                    self.server_process.kill()
+            process = self.server_process
+            if process:
+                # Return as soon as the server honours SIGTERM; kill it if it lingers
+                with contextlib.suppress(ProcessLookupError):
+                    process.terminate()
+                try:
+                    await asyncio.wait_for(process.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    with contextlib.suppress(ProcessLookupError):
+                        process.kill()
+                    await process.wait()
                 self.server_process = None
             
             self.is_connected = False
             logger.info("Disconnected from MCP server")
             
         except Exception as e:
-            logger.error(f"Error during MCP server disconnect: {str(e)}")
+            logger.error("Error during MCP server disconnect: %s", e)
     
-    async def list_tools(self) -> List[Dict[str, Any]]:
+    async def list_tools(self) -> Tuple[Mapping[str, Any], ...]:
         """
         List available tools from the MCP server.
         
         Returns:
-            List of available tool definitions
+            Read-only tuple of available tool definitions
         """
         if not self.is_connected:
-            await self.connect()
+            await self._ensure_connected()
         
-        return self.available_tools.copy()
+        return self.available_tools
+    
+    async def has_tool(self, tool_name: str) -> bool:
+        """
+        Check whether the MCP server provides a tool.
+        
+        Args:
+            tool_name: Name of the tool
+            
+        Returns:
+            True if the tool is in the discovered tool catalog
+        """
+        if not self.is_connected:
+            await self._ensure_connected()
+        
+        return tool_name in self._tool_names_set
     
-    @retry_with_backoff(max_retries=2, base_delay=1.0, retryable_exceptions=(RetryableError, ConnectionError))
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Call a tool on the MCP server with comprehensive error handling and logging.
+        Call a tool on the MCP server.
+        
+        With micro-batching enabled (batch_size > 1), calls issued concurrently
+        are coalesced into batches of up to batch_size calls, waiting at most
+        batch_wait_ms for a batch to fill. Otherwise each call is made directly.
         
         Args:
             tool_name: Name of the tool to call
@@ -182,41 +631,211 @@ class MCPClient:
         Returns:
             Tool execution result
         """
-        start_time = time.time()
+        signature = self._call_signature(tool_name, arguments)
+        if self._is_call_loop(tool_name, signature):
+            logger.warning("Loop detected for tool %s; skipping repeated failing call", tool_name)
+            return await self._handle_tool_failure(
+                tool_name, arguments,
+                f"loop detected: identical call failed {self.LOOP_DETECTION_THRESHOLD} times "
+                f"within {self.LOOP_DETECTION_WINDOW:.0f}s"
+            )
+        
+        if self.batch_size <= 1:
+            result = await self._call_tool_now(tool_name, arguments)
+        else:
+            future = asyncio.get_running_loop().create_future()
+            pending_calls = self._get_pending_calls()
+            pending_calls.put_nowait((tool_name, arguments, future))
+            if pending_calls.qsize() >= self.batch_size - 1:
+                self._batch_ready.set()
+            
+            result = await future
+        
+        if not result.get("success", False):
+            self._call_signature_recent.append((tool_name, signature, time.monotonic()))
+        
+        return result
+    
+    @staticmethod
+    def _call_signature(tool_name: str, arguments: Dict[str, Any]) -> int:
+        """
+        Build a hashable signature identifying a tool call.
+        
+        Args:
+            tool_name: Name of the tool
+            arguments: Tool arguments (may contain unhashable values such as lists)
+            
+        Returns:
+            Signature of the call
+        """
+        return hash((tool_name, json.dumps(arguments, sort_keys=True, default=str)))
+    
+    def _is_call_loop(self, tool_name: str, signature: int) -> bool:
+        """
+        Check whether an identical call has been failing repeatedly in a short window.
+        
+        Args:
+            tool_name: Name of the tool
+            signature: Call signature from _call_signature
+            
+        Returns:
+            True if the call should be short-circuited
+        """
+        cutoff = time.monotonic() - self.LOOP_DETECTION_WINDOW
+        repeats = sum(
+            1 for recent_tool, recent_signature, timestamp in self._call_signature_recent
+            if recent_signature == signature and recent_tool == tool_name and timestamp >= cutoff
+        )
+        return repeats >= self.LOOP_DETECTION_THRESHOLD
+    
+    def _tool_circuit_breaker(self, tool_name: str) -> CircuitBreaker:
+        """
+        Get the circuit breaker guarding a single tool, creating it on first use.
+        
+        Args:
+            tool_name: Name of the tool
+            
+        Returns:
+            Circuit breaker for the tool
+        """
+        breaker = self._tool_circuit_breakers.get(tool_name)
+        if breaker is None:
+            breaker = self._tool_circuit_breakers[tool_name] = CircuitBreaker(
+                service_name=f"mcp_tool_{tool_name}",
+                failure_threshold=self.TOOL_FAILURE_THRESHOLD,
+                recovery_timeout=30.0,
+                expected_exception=(MCPError, ToolError, ConnectionError)
+            )
+        return breaker
+    
+    async def _execute_with_breakers(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute a tool behind the concurrency limiter, its own circuit breaker and the server-wide one.
+        
+        Args:
+            tool_name: Name of the tool
+            arguments: Tool arguments
+            
+        Returns:
+            Tool execution result
+        """
+        execute = self._tool_circuit_breaker(tool_name)(self.mcp_circuit_breaker(self._execute_tool_simulation))
+        
+        await self._call_limiter.acquire()
+        success = None
+        try:
+            result = await execute(tool_name, arguments)
+            success = True
+            return result
+        except CircuitBreakerError:
+            # Rejected without reaching the server, so it says nothing about server load
+            raise
+        except Exception:
+            success = False
+            raise
+        finally:
+            self._call_limiter.release(success)
+    
+    def _get_pending_calls(self) -> asyncio.Queue:
+        """
+        Get the pending call queue, starting the batch dispatcher for the running loop if needed.
+        
+        Returns:
+            Queue of (tool_name, arguments, future) tuples awaiting dispatch
+        """
+        loop = asyncio.get_running_loop()
+        dispatcher = self._batch_dispatcher
+        if dispatcher is None or dispatcher.done() or dispatcher.get_loop() is not loop:
+            self._pending_calls = asyncio.Queue()
+            self._batch_ready = asyncio.Event()
+            self._batch_dispatcher = loop.create_task(self._dispatch_pending_calls())
+        return self._pending_calls
+    
+    async def _dispatch_pending_calls(self):
+        """Drain the pending call queue into batches bounded by size and wait time."""
+        pending_calls = self._pending_calls
+        batch_ready = self._batch_ready
+        
+        while True:
+            batch = [await pending_calls.get()]
+            
+            # Give concurrent callers a short window to join this batch
+            if pending_calls.qsize() < self.batch_size - 1 and self.batch_wait > 0:
+                batch_ready.clear()
+                if pending_calls.qsize() < self.batch_size - 1:
+                    try:
+                        await asyncio.wait_for(batch_ready.wait(), self.batch_wait)
+                    except asyncio.TimeoutError:
+                        pass
+            
+            while len(batch) < self.batch_size and not pending_calls.empty():
+                batch.append(pending_calls.get_nowait())
+            
+            # Run the batch in the background so the next one can start filling
+            task = asyncio.ensure_future(self._run_pending_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _run_pending_batch(self, batch: List[Tuple[str, Dict[str, Any], asyncio.Future]]):
+        """
+        Execute a batch of queued tool calls and resolve their futures.
+        
+        Args:
+            batch: Queued (tool_name, arguments, future) tuples
+        """
+        try:
+            if len(batch) == 1:
+                tool_name, arguments, _ = batch[0]
+                results = [await self._call_tool_now(tool_name, arguments)]
+            else:
+                results = await self.call_tools_batch([(tool_name, arguments) for tool_name, arguments, _ in batch])
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+    
+    @retry_with_backoff(max_retries=2, base_delay=1.0, retryable_exceptions=(RetryableError, ConnectionError))
+    async def _call_tool_now(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Call a single tool immediately with comprehensive error handling and logging.
+        
+        Args:
+            tool_name: Name of the tool to call
+            arguments: Arguments to pass to the tool
+            
+        Returns:
+            Tool execution result
+        """
+        start_time = time.perf_counter()
         
         try:
             # Ensure we're connected with circuit breaker protection
-            if not self.is_connected:
-                connection_success = await self.mcp_circuit_breaker(self.connect)()
-                if not connection_success:
-                    raise MCPError("Failed to establish MCP server connection")
+            if not self.is_connected and not await self._ensure_connected():
+                raise MCPError("Failed to establish MCP server connection")
             
             # Validate tool exists
-            tool_names = [tool["name"] for tool in self.available_tools]
-            if tool_name not in tool_names:
-                raise ToolError(tool_name, f"Tool not available. Available tools: {tool_names}")
-            
-            # Track tool call attempts
-            if tool_name not in self.tool_call_failures:
-                self.tool_call_failures[tool_name] = 0
+            if tool_name not in self._tool_names_set:
+                raise ToolError(tool_name, f"Tool not available. Available tools: {sorted(self._tool_names_set)}")
             
             # Log tool invocation
-            logger.info(f"Calling MCP tool: {tool_name} with arguments: {arguments}")
+            logger.info("Calling MCP tool: %s with arguments: %s", tool_name, arguments)
             
             # Emit UI update for tool call
             await self._emit_tool_call_update(tool_name, arguments, "started")
             
             # Execute the tool with circuit breaker protection
-            result = await self.mcp_circuit_breaker(self._execute_tool_simulation)(tool_name, arguments)
+            result = await self._execute_with_breakers(tool_name, arguments)
             
             # Calculate execution time
-            execution_time = time.time() - start_time
-            
-            # Reset failure count on success
-            self.tool_call_failures[tool_name] = 0
+            execution_time = time.perf_counter() - start_time
             
             # Log successful execution
-            logger.info(f"Tool {tool_name} executed successfully in {execution_time:.2f}s")
+            logger.info("Tool %s executed successfully in %.2fs", tool_name, execution_time)
             
             # Emit UI update for completion
             await self._emit_tool_call_update(tool_name, arguments, "completed", result, execution_time)
@@ -224,27 +843,86 @@ class MCPClient:
             return result
             
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             
-            # Track failure
-            if tool_name in self.tool_call_failures:
-                self.tool_call_failures[tool_name] += 1
-            
-            error_context = {
-                "tool_name": tool_name,
-                "arguments": arguments,
-                "execution_time": execution_time,
-                "failure_count": self.tool_call_failures.get(tool_name, 0)
-            }
-            
-            logger.error(f"Tool {tool_name} failed after {execution_time:.2f}s: {str(e)}")
-            handle_error(ToolError(tool_name, f"Tool execution failed: {str(e)}"), error_context)
+            logger.error("Tool %s failed after %.2fs: %s", tool_name, execution_time, e,
+                         extra={"arguments": arguments})
             
             # Emit UI update for failure
             await self._emit_tool_call_update(tool_name, arguments, "failed", {"error": str(e)}, execution_time)
             
             # Handle tool execution failures with retry logic
-            return await self._handle_tool_failure(tool_name, arguments, str(e))
+            return await self._handle_tool_failure(tool_name, arguments, str(e), execution_time)
+
+    async def call_tools_batch(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Call several tools on the MCP server in a single batch.
+
+        The connection check, tool validation and UI updates happen once for the
+        whole batch; the individual calls then execute concurrently. Failed or
+        unknown calls get the same fallback result as call_tool, so one bad call
+        does not sink the rest of the batch.
+
+        Args:
+            calls: List of (tool_name, arguments) tuples
+
+        Returns:
+            Tool execution results, in the same order as calls
+        """
+        if not calls:
+            return []
+
+        start_time = time.perf_counter()
+        batch_arguments = {"calls": [tool_name for tool_name, _ in calls]}
+
+        try:
+            # Ensure we're connected with circuit breaker protection
+            if not self.is_connected and not await self._ensure_connected():
+                raise MCPError("Failed to establish MCP server connection")
+        except Exception as e:
+            logger.error("Tool batch of %d calls failed before execution: %s", len(calls), e)
+            return [
+                await self._handle_tool_failure(tool_name, arguments, str(e))
+                for tool_name, arguments in calls
+            ]
+
+        logger.info("Calling %d MCP tools in one batch: %s", len(calls), batch_arguments["calls"])
+        await self._emit_tool_call_update("tools_batch", batch_arguments, "started")
+
+        # Validate every tool in the batch up front; unknown tools fail individually
+        tool_names = self._tool_names_set
+        outcomes = [
+            ToolError(tool_name, f"Tool not available. Available tools: {sorted(tool_names)}")
+            for tool_name, _ in calls
+        ]
+        valid_indexes = [index for index, (tool_name, _) in enumerate(calls) if tool_name in tool_names]
+
+        executed = await asyncio.gather(
+            *(self._execute_with_breakers(*calls[index])
+              for index in valid_indexes),
+            return_exceptions=True
+        )
+        for index, outcome in zip(valid_indexes, executed):
+            outcomes[index] = outcome
+
+        execution_time = time.perf_counter() - start_time
+        results = []
+        failed_calls = 0
+
+        for (tool_name, arguments), outcome in zip(calls, outcomes):
+            if isinstance(outcome, Exception):
+                failed_calls += 1
+                results.append(await self._handle_tool_failure(tool_name, arguments, str(outcome), execution_time))
+            else:
+                results.append(outcome)
+
+        logger.info("Tool batch of %d calls finished in %.2fs (%d failed)", len(calls), execution_time, failed_calls)
+        await self._emit_tool_call_update(
+            "tools_batch", batch_arguments, "completed",
+            {"total_calls": len(calls), "failed_calls": failed_calls}, execution_time
+        )
+
+        return results
     
     async def _execute_tool_simulation(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -252,25 +930,20 @@ class MCPClient:
         
         In a real implementation, this would send the tool call via MCP protocol.
         """
-        # Simulate realistic execution time
-        await asyncio.sleep(0.5 + (len(str(arguments)) * 0.01))
-        
-        if tool_name == "log_action_for_ui":
-            return await self._simulate_log_action(arguments)
-        elif tool_name == "analyze_email_for_iocs":
-            return await self._simulate_ioc_analysis(arguments)
-        elif tool_name == "block_malicious_url":
-            return await self._simulate_url_blocking(arguments)
-        elif tool_name == "search_and_destroy_email":
-            return await self._simulate_email_removal(arguments)
-        else:
+        simulate = self._sim_dispatch.get(tool_name)
+        if simulate is None:
             raise ValueError(f"Unknown tool: {tool_name}")
+        
+        # Simulate realistic execution time, scaled by the argument size
+        if self.simulate_delay:
+            argument_size = sum(len(key) + len(str(value)) for key, value in arguments.items())
+            await asyncio.sleep(0.5 + argument_size * 0.01)
+        
+        return await simulate(arguments)
     
     async def _simulate_log_action(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Simulate the log_action_for_ui tool."""
         message = arguments.get("message", "")
-        agent = arguments.get("agent", "Unknown Agent")
-        status = arguments.get("status", "working")
         
         return {
             "content": [{
@@ -286,23 +959,14 @@ class MCPClient:
         email_subject = arguments.get("email_subject", "")
         
         # Simulate IOC detection based on subject content
-        suspicious_keywords = ["urgent", "verify", "click", "suspended", "payment"]
-        found_iocs = []
-        
-        subject_lower = email_subject.lower()
-        if any(keyword in subject_lower for keyword in suspicious_keywords):
-            found_iocs = [
-                "http://malicious-phishing-site.com/login",
-                "suspicious-sender@fake-domain.com"
-            ]
+        found_iocs = list(_analyze_subject(email_subject))
         
-        result_text = f"""IOC Analysis Complete:
-- Email Subject: {email_subject}
-- IOCs Found: {len(found_iocs)}
-- Threat Level: {'HIGH' if found_iocs else 'LOW'}
-
-Detected Indicators:
-{chr(10).join(f'  • {ioc}' for ioc in found_iocs) if found_iocs else '  • No malicious indicators detected'}"""
+        result_text = _IOC_ANALYSIS_TEMPLATE.format_map({
+            "subject": email_subject,
+            "ioc_count": len(found_iocs),
+            "threat_level": 'HIGH' if found_iocs else 'LOW',
+            "indicator_lines": "\n".join(f"  • {ioc}" for ioc in found_iocs) if found_iocs else _NO_IOC_LINE
+        })
         
         return {
             "content": [{
@@ -320,16 +984,9 @@ Detected Indicators:
         url = arguments.get("url", "")
         reason = arguments.get("reason", "Malicious content detected")
         
-        block_id = f"BLK-{int(time.time() * 1000) % 1000000}"
+        block_id = f"BLK-{next(_BLOCK_ID_COUNTER)}"
         
-        result_text = f"""URL Blocking Complete:
-- URL: {url}
-- Block ID: {block_id}
-- Method: Firewall rule
-- Reason: {reason}
-- Status: BLOCKED
-
-The malicious URL has been successfully blocked across all network access points."""
+        result_text = _URL_BLOCKING_TEMPLATE.format_map({"url": url, "block_id": block_id, "reason": reason})
         
         return {
             "content": [{
@@ -342,24 +999,48 @@ The malicious URL has been successfully blocked across all network access points
             "url": url
         }
     
+    async def _simulate_bulk_url_blocking(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Simulate the block_malicious_urls tool."""
+        urls = arguments.get("urls", [])
+        reason = arguments.get("reason", "Malicious content detected")
+        
+        results = []
+        for url in urls:
+            block_result = await self._simulate_url_blocking({"url": url, "reason": reason})
+            results.append({
+                "url": url,
+                "block_id": block_result["block_id"],
+                "status": "blocked",
+                "details": block_result["content"][0]["text"]
+            })
+        
+        result_text = _BULK_URL_BLOCKING_TEMPLATE.format_map({"blocked_count": len(results), "reason": reason})
+        
+        return {
+            "content": [{
+                "type": "text",
+                "text": result_text
+            }],
+            "success": True,
+            "tool": "block_malicious_urls",
+            "results": results
+        }
+    
     async def _simulate_email_removal(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Simulate the search_and_destroy_email tool."""
         search_criteria = arguments.get("search_criteria", "")
         search_type = arguments.get("search_type", "subject")
         
         # Simulate realistic numbers
-        import random
-        total_mailboxes = random.randint(150, 300)
-        emails_found = random.randint(5, 25)
+        total_mailboxes = _SIMULATION_RANDOM.randint(150, 300)
+        emails_found = _SIMULATION_RANDOM.randint(5, 25)
         
-        result_text = f"""Email Search and Destroy Complete:
-- Search Criteria: {search_criteria}
-- Search Type: {search_type}
-- Mailboxes Scanned: {total_mailboxes}
-- Malicious Emails Found: {emails_found}
-- Emails Successfully Removed: {emails_found}
-
-All identified malicious emails have been quarantined and removed from user inboxes."""
+        result_text = _EMAIL_REMOVAL_TEMPLATE.format_map({
+            "search_criteria": search_criteria,
+            "search_type": search_type,
+            "total_mailboxes": total_mailboxes,
+            "emails_found": emails_found
+        })
         
         return {
             "content": [{
@@ -400,30 +1081,110 @@ All identified malicious emails have been quarantined and removed from user inbo
                 if execution_time:
                     update_data['execution_time'] = execution_time
                 
-                self.socketio_client.emit('tool_call_update', update_data)
-                logger.debug(f"Emitted tool call update: {tool_name} - {status}")
+                self._queue_ui_update(update_data)
+                logger.debug("Queued tool call update: %s - %s", tool_name, status)
+            
+        except Exception as e:
+            logger.error("Error emitting tool call update: %s", e)
+    
+    def _queue_ui_update(self, update_data: Dict[str, Any]):
+        """
+        Queue a UI update for the background worker, dropping the oldest update when full.
+        
+        Args:
+            update_data: Update payload to emit
+        """
+        loop = asyncio.get_running_loop()
+        worker = self._ui_worker
+        if worker is None or worker.done() or worker.get_loop() is not loop:
+            self._ui_queue = asyncio.Queue(maxsize=self.UI_QUEUE_SIZE)
+            self._ui_worker = loop.create_task(self._drain_ui_updates())
+        
+        ui_queue = self._ui_queue
+        if ui_queue.full():
+            ui_queue.get_nowait()
+            ui_queue.task_done()
+        ui_queue.put_nowait(update_data)
+    
+    async def _drain_ui_updates(self):
+        """Emit queued UI updates in batches without blocking tool calls."""
+        ui_queue = self._ui_queue
+        
+        while True:
+            batch = [await ui_queue.get()]
+            while len(batch) < self.UI_BATCH_SIZE and not ui_queue.empty():
+                batch.append(ui_queue.get_nowait())
             
+            try:
+                await self._emit_ui_batch(batch)
+            finally:
+                for _ in batch:
+                    ui_queue.task_done()
+    
+    async def _emit_ui_batch(self, batch: List[Dict[str, Any]]):
+        """
+        Emit one batch of UI updates to the SocketIO client.
+        
+        Args:
+            batch: Update payloads to emit together
+        """
+        client = self.socketio_client
+        if not client:
+            return
+        
+        try:
+            if asyncio.iscoroutinefunction(client.emit):
+                await client.emit('tool_call_updates', batch)
+            else:
+                # Synchronous clients perform a blocking write; keep it off the event loop
+                await asyncio.get_running_loop().run_in_executor(
+                    None, functools.partial(client.emit, 'tool_call_updates', batch)
+                )
         except Exception as e:
-            logger.error(f"Error emitting tool call update: {str(e)}")
+            logger.error("Error emitting %d tool call updates: %s", len(batch), e)
+    
+    async def _drain_ui_queue(self):
+        """Wait (up to UI_DRAIN_TIMEOUT) for the UI worker to emit every queued update."""
+        worker = self._ui_worker
+        if worker is None or worker.done() or worker.get_loop() is not asyncio.get_running_loop():
+            return
+        
+        try:
+            await asyncio.wait_for(self._ui_queue.join(), self.UI_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Dropping %d undelivered tool call updates on close", self._ui_queue.qsize())
     
     async def _handle_tool_failure(self, tool_name: str, arguments: Dict[str, Any], 
-                                 error_message: str) -> Dict[str, Any]:
+                                 error_message: str, execution_time: Optional[float] = None) -> Dict[str, Any]:
         """
         Handle tool execution failures with retry logic.
         
+        This is where a failure is surfaced to the caller, so it is also where
+        the failure is reported to the error handler.
+        
         Args:
             tool_name: Name of the failed tool
             arguments: Tool arguments
             error_message: Error message from the failure
+            execution_time: Time spent on the failed call, if known
             
         Returns:
             Error result or retry result
         """
+        tool_breaker = self._tool_circuit_breakers.get(tool_name)
+        error_context = {
+            "tool_name": tool_name,
+            "arguments": arguments,
+            "execution_time": execution_time,
+            "failure_count": tool_breaker.failure_count if tool_breaker else 0
+        }
+        handle_error(ToolError(tool_name, f"Tool execution failed: {error_message}"), error_context)
+        
         # For critical tools, we might want to retry
         critical_tools = ["block_malicious_url", "search_and_destroy_email"]
         
         if tool_name in critical_tools:
-            logger.warning(f"Critical tool {tool_name} failed, implementing fallback")
+            logger.warning("Critical tool %s failed, implementing fallback", tool_name)
             
             # Return a fallback result indicating manual intervention needed
             return {
@@ -485,8 +1246,11 @@ All identified malicious emails have been quarantined and removed from user inbo
     
     def __del__(self):
         """Cleanup on object destruction."""
-        if self.server_process:
-            try:
-                self.server_process.terminate()
-            except:
-                pass
\ No newline at end of file
+        if getattr(self, '_released', True):
+            return
+        
+        # Only the last client using the shared session stops the server
+        self._released = True
+        if MCPServerPool.release(self._session) and self.server_process:
+            with contextlib.suppress(ProcessLookupError, OSError):
+                self.server_process.terminate()
\ No newline at end of file
@@ -6,13 +6,16 @@ Implements simulated security tools for demonstration purposes.
 """
 
 import asyncio
+import functools
+import itertools
 import json
 import logging
 import random
+import re
 import time
-import argparse
+import os
 import sys
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Callable, Dict, List
 
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
@@ -33,13 +36,13 @@ logger = logging.getLogger(__name__)
 server = Server("security-tools")
 
 # Simulated data for realistic responses
-SAMPLE_IOCS = [
+SAMPLE_IOCS = (
     "http://malicious-phishing-site.com/login",
     "http://evil-domain.net/steal-credentials",
     "attachment_malware.exe",
     "192.168.1.100",
     "suspicious-sender@fake-domain.com"
-]
+)
 
 SAMPLE_EMAIL_SUBJECTS = [
     "Urgent: Verify your account immediately",
@@ -49,369 +52,281 @@ SAMPLE_EMAIL_SUBJECTS = [
     "Your account will be suspended"
 ]
 
+# Keyword groups for the simulated IOC analysis (substring matches on the lowercased subject)
+_SUSPICIOUS_KEYWORDS = frozenset(("urgent", "verify", "click here", "suspended", "payment", "invoice"))
+_PHISHING_INDICATORS = frozenset(("login", "credentials", "account", "security alert"))
+# One compiled alternation per group so each check is a single scan of the subject
+_SUSPICIOUS_PATTERN = re.compile("|".join(re.escape(keyword) for keyword in sorted(_SUSPICIOUS_KEYWORDS)))
+_PHISHING_PATTERN = re.compile("|".join(re.escape(keyword) for keyword in sorted(_PHISHING_INDICATORS)))
 
-@server.list_tools()
-async def handle_list_tools() -> List[Tool]:
-    """List available security tools."""
-    return [
-        Tool(
-            name="log_action_for_ui",
-            description="Log an action message for display in the UI dashboard",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "message": {
-                        "type": "string",
-                        "description": "The message to log for UI display"
-                    },
-                    "agent": {
-                        "type": "string",
-                        "description": "The name of the agent performing the action"
-                    },
-                    "status": {
-                        "type": "string",
-                        "description": "The current status of the workflow"
-                    }
+# Result text templates for the tool handlers
+_IOC_ANALYSIS_TEMPLATE = """IOC Analysis Complete:
+- Email Subject: {subject}
+- IOCs Found: {ioc_count}
+- Threat Level: {threat_level}
+
+Detected Indicators:
+{indicator_lines}"""
+_NO_IOC_LINE = "  • No malicious indicators detected"
+_URL_BLOCKING_TEMPLATE = """URL Blocking Complete:
+- URL: {url}
+- Block ID: {block_id}
+- Method: {method}
+- Reason: {reason}
+- Status: BLOCKED
+
+The malicious URL has been successfully blocked across all network access points."""
+_EMAIL_REMOVAL_TEMPLATE = """Email Search and Destroy Complete:
+- Search Criteria: {search_criteria}
+- Search Type: {search_type}
+- Mailboxes Scanned: {total_mailboxes}
+- Malicious Emails Found: {emails_found}
+- Emails Successfully Removed: {emails_removed}
+
+Sample Affected Users:
+{user_lines}
+
+All identified malicious emails have been quarantined and removed from user inboxes."""
+
+# Blocking methods reported by the simulated URL block
+_BLOCKING_METHODS = ("DNS blackhole", "Firewall rule", "Proxy filter", "Web gateway block")
+
+# Incident IDs keep the INC-NNNNN look but come from a counter instead of the RNG
+_INCIDENT_ID_COUNTER = itertools.count(10000 + int(time.time()) % 80000)
+
+# Dedicated RNG for simulated results, kept off the shared module-level random state
+_SIMULATION_RANDOM = random.Random()
+
+# Set once main() has entered the stdio session; it lives for the whole process
+_stdio_session_started = False
+
+# Artificial per-call latency is opt-in (for paced demos); tool calls return immediately otherwise.
+# Shares its flag with the client-side simulation in mcp_client.
+SIMULATE_LATENCY = os.getenv("NEXUSAI_SIMULATE_MCP_DELAY", "false").lower() in ("1", "true", "yes")
+
+
+def _text_result(text: str) -> CallToolResult:
+    """Wrap a plain-text tool response in a CallToolResult."""
+    return CallToolResult(content=[TextContent(type="text", text=text)])
+
+
+def _json_result(payload: Dict[str, Any]) -> CallToolResult:
+    """Serialize a tool response payload as JSON text."""
+    # Default json.dumps arguments reuse the module's cached C encoder
+    return _text_result(json.dumps(payload))
+
+
+@functools.lru_cache(maxsize=64)
+def _unknown_tool_result(name: str) -> CallToolResult:
+    """Build (once per name) the response for a call to a tool that does not exist."""
+    return _text_result(f"Error executing {name}: Unknown tool: {name}")
+
+
+# Tool schemas are static, so they are built once at import and shared by every list_tools call
+_TOOLS: List[Tool] = [
+    Tool(
+        name="log_action_for_ui",
+        description="Log an action message for display in the UI dashboard",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "message": {
+                    "type": "string",
+                    "description": "The message to log for UI display"
                 },
-                "required": ["message", "agent"]
-            }
-        ),
-        Tool(
-            name="analyze_email_for_iocs",
-            description="Analyze an email for Indicators of Compromise (IOCs)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "email_subject": {
-                        "type": "string",
-                        "description": "The subject line of the email to analyze"
-                    },
-                    "email_content": {
-                        "type": "string",
-                        "description": "The content of the email to analyze (optional)"
-                    }
+                "agent": {
+                    "type": "string",
+                    "description": "The name of the agent performing the action"
                 },
-                "required": ["email_subject"]
-            }
-        ),
-        Tool(
-            name="block_malicious_url",
-            description="Block a malicious URL at the network level",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "url": {
-                        "type": "string",
-                        "description": "The malicious URL to block"
-                    }
+                "status": {
+                    "type": "string",
+                    "description": "The current status of the workflow"
+                }
+            },
+            "required": ["message", "agent"]
+        }
+    ),
+    Tool(
+        name="analyze_email_for_iocs",
+        description="Analyze an email for Indicators of Compromise (IOCs)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "email_subject": {
+                    "type": "string",
+                    "description": "The subject line of the email to analyze"
                 },
-                "required": ["url"]
-            }
-        ),
-        Tool(
-            name="search_and_remove_emails",
-            description="Search for and remove malicious emails from all inboxes",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "search_criteria": {
-                        "type": "string",
-                        "description": "Criteria to search for malicious emails"
-                    }
+                "email_content": {
+                    "type": "string",
+                    "description": "The content of the email to analyze (optional)"
+                }
+            },
+            "required": ["email_subject"]
+        }
+    ),
+    Tool(
+        name="block_malicious_url",
+        description="Block a malicious URL at the network level",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "url": {
+                    "type": "string",
+                    "description": "The malicious URL to block"
                 },
-                "required": ["search_criteria"]
-            }
-        ),
-        Tool(
-            name="document_incident",
-            description="Document the security incident and resolution",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "incident_summary": {
-                        "type": "string",
-                        "description": "Summary of the security incident"
-                    },
-                    "actions_taken": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of actions taken to resolve the incident"
-                    }
+                "reason": {
+                    "type": "string",
+                    "description": "The reason for blocking this URL"
+                }
+            },
+            "required": ["url", "reason"]
+        }
+    ),
+    Tool(
+        name="block_malicious_urls",
+        description="Block several malicious URLs at the network level in one call",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "urls": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "The malicious URLs to block"
                 },
-                "required": ["incident_summary", "actions_taken"]
-            }
-        )
-    ]
-
-
-@server.call_tool()
-async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
-    """Handle tool execution requests."""
-    
-    # Add realistic delay for demonstration
-    await asyncio.sleep(random.uniform(0.5, 2.0))
-    
-    if name == "log_action_for_ui":
-        message = arguments.get("message", "")
-        agent = arguments.get("agent", "Unknown Agent")
-        status = arguments.get("status", "in_progress")
-        
-        logger.info(f"UI Log - {agent}: {message}")
-        
-        return CallToolResult(
-            content=[
-                TextContent(
-                    type="text",
-                    text=json.dumps({
-                        "success": True,
-                        "message": f"Logged: {message}",
-                        "agent": agent,
-                        "status": status,
-                        "timestamp": time.time()
-                    })
-                )
-            ]
-        )
-    
-    elif name == "analyze_email_for_iocs":
-        email_subject = arguments.get("email_subject", "")
-        
-        # Simulate IOC analysis
-        iocs_found = random.sample(SAMPLE_IOCS, random.randint(2, 4))
-        
-        result = {
-            "success": True,
-            "email_subject": email_subject,
-            "iocs_found": iocs_found,
-            "threat_level": "high" if "suspicious" in email_subject.lower() else "medium",
-            "analysis_time": f"{random.uniform(1.2, 3.5):.1f} seconds"
+                "reason": {
+                    "type": "string",
+                    "description": "The reason for blocking these URLs"
+                }
+            },
+            "required": ["urls", "reason"]
         }
-        
-        logger.info(f"IOC Analysis completed for: {email_subject}")
-        
-        return CallToolResult(
-            content=[
-                TextContent(
-                    type="text",
-                    text=json.dumps(result)
-                )
-            ]
-        )
-    
-    elif name == "block_malicious_url":
-        url = arguments.get("url", "")
-        
-        result = {
-            "success": True,
-            "blocked_url": url,
-            "block_method": "DNS blacklist + Firewall rule",
-            "affected_users": random.randint(15, 150),
-            "block_time": f"{random.uniform(0.8, 2.1):.1f} seconds"
+    ),
+    Tool(
+        name="search_and_destroy_email",
+        description="Search for and remove malicious emails from all user inboxes",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "search_criteria": {
+                    "type": "string",
+                    "description": "The criteria to search for (subject, sender, etc.)"
+                },
+                "search_type": {
+                    "type": "string",
+                    "enum": ["subject", "sender", "attachment", "url"],
+                    "description": "The type of search to perform"
+                }
+            },
+            "required": ["search_criteria", "search_type"]
         }
-        
-        logger.info(f"Blocked malicious URL: {url}")
-        
-        return CallToolResult(
-            content=[
-                TextContent(
-                    type="text",
-                    text=json.dumps(result)
-                )
-            ]
-        )
-    
-    elif name == "search_and_remove_emails":
-        search_criteria = arguments.get("search_criteria", "")
-        
-        emails_found = random.randint(8, 25)
-        
-        result = {
-            "success": True,
-            "search_criteria": search_criteria,
-            "emails_found": emails_found,
-            "emails_removed": emails_found,
-            "inboxes_scanned": random.randint(50, 200),
-            "scan_time": f"{random.uniform(2.5, 5.8):.1f} seconds"
+    ),
+    Tool(
+        name="document_incident",
+        description="Document the security incident and resolution",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "incident_summary": {
+                    "type": "string",
+                    "description": "Summary of the security incident"
+                },
+                "actions_taken": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of actions taken to resolve the incident"
+                }
+            },
+            "required": ["incident_summary", "actions_taken"]
         }
-        
-        logger.info(f"Email removal completed: {emails_found} emails removed")
-        
-        return CallToolResult(
-            content=[
-                TextContent(
-                    type="text",
-                    text=json.dumps(result)
-                )
-            ]
-        )
-    
-    elif name == "document_incident":
-        incident_summary = arguments.get("incident_summary", "")
-        actions_taken = arguments.get("actions_taken", [])
-        
-        incident_id = f"INC-{random.randint(10000, 99999)}"
-        
-        result = {
-            "success": True,
-            "incident_id": incident_id,
-            "incident_summary": incident_summary,
-            "actions_taken": actions_taken,
-            "documentation_complete": True,
-            "compliance_status": "SOC 2 compliant",
-            "created_timestamp": time.time()
+    ),
+    Tool(
+        name="batch_call",
+        description="Run several independent tool calls concurrently and return their results in order",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "calls": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "name": {
+                                "type": "string",
+                                "description": "Name of the tool to call"
+                            },
+                            "arguments": {
+                                "type": "object",
+                                "description": "Arguments for the tool"
+                            }
+                        },
+                        "required": ["name"]
+                    },
+                    "description": "The tool calls to run"
+                }
+            },
+            "required": ["calls"]
         }
-        
-        logger.info(f"Incident documented with ID: {incident_id}")
-        
-        return CallToolResult(
-            content=[
-                TextContent(
-                    type="text",
-                    text=json.dumps(result)
-                )
-            ]
-        )
-    
-    else:
-        return CallToolResult(
-            content=[
-                TextContent(
-                    type="text",
-                    text=json.dumps({
-                        "success": False,
-                        "error": f"Unknown tool: {name}"
-                    })
-                )
-            ]
-        )
-
-
-async def main():
-    """Main entry point for the MCP server."""
-    parser = argparse.ArgumentParser(description="NexusAI Security Tools MCP Server")
-    parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
-    parser.add_argument("--port", type=int, default=8080, help="Port to bind to")
-    
-    args = parser.parse_args()
-    
-    logger.info(f"Starting MCP Security Tools Server on {args.host}:{args.port}")
-    
-    # For now, we'll use stdio server as MCP typically uses stdio
-    # In a real implementation, you might want to use HTTP server
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="security-tools",
-                server_version="1.0.0",
-                capabilities=server.get_capabilities(
-                    notification_options=None,
-                    experimental_capabilities=None,
-                ),
-            ),
-        )
+    )
+]
 
 
-if __name__ == "__main__":
-    try:
-        asyncio.run(main())
-    except KeyboardInterrupt:
-        logger.info("MCP server shutdown requested")
-    except Exception as e:
-        logger.error(f"MCP server error: {e}")
-        sys.exit(1)
-                "type": "object",
-                "properties": {
-                    "url": {
-                        "type": "string",
-                        "description": "The malicious URL to block"
-                    },
-                    "reason": {
-                        "type": "string",
-                        "description": "The reason for blocking this URL"
-                    }
-                },
-                "required": ["url", "reason"]
-            }
-        ),
-        Tool(
-            name="search_and_destroy_email",
-            description="Search for and remove malicious emails from all user inboxes",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "search_criteria": {
-                        "type": "string",
-                        "description": "The criteria to search for (subject, sender, etc.)"
-                    },
-                    "search_type": {
-                        "type": "string",
-                        "enum": ["subject", "sender", "attachment", "url"],
-                        "description": "The type of search to perform"
-                    }
-                },
-                "required": ["search_criteria", "search_type"]
-            }
-        )
-    ]
+@server.list_tools()
+async def handle_list_tools() -> List[Tool]:
+    """List available security tools."""
+    # Shallow copy so the framework can't mutate the shared list; Tool objects are reused
+    return list(_TOOLS)
 
 
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
     """Handle tool calls from agents."""
+    return await _dispatch_tool(name, arguments)
+
+
+async def invoke(name: str, arguments: Dict[str, Any]) -> str:
+    """
+    Run a tool in-process and return its text response.
     
+    Callers in the same process use this to skip the stdio JSON-RPC round
+    trip; external MCP clients still go through the server started by main().
+    
+    Args:
+        name: Name of the tool to run
+        arguments: Tool arguments
+        
+    Returns:
+        str: The tool's text response
+    """
+    result = await _dispatch_tool(name, arguments)
+    return result.content[0].text
+
+
+async def _dispatch_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
+    """Look up and run the handler for a tool call."""
     # Add realistic response time simulation
-    await asyncio.sleep(random.uniform(0.5, 2.0))
+    if SIMULATE_LATENCY:
+        await asyncio.sleep(_SIMULATION_RANDOM.uniform(0.5, 2.0))
+    
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        logger.error("Error executing tool %s: Unknown tool: %s", name, name)
+        return _unknown_tool_result(name)
     
     try:
-        if name == "log_action_for_ui":
-            return await _log_action_for_ui(arguments)
-        elif name == "analyze_email_for_iocs":
-            return await _analyze_email_for_iocs(arguments)
-        elif name == "block_malicious_url":
-            return await _block_malicious_url(arguments)
-        elif name == "search_and_destroy_email":
-            return await _search_and_destroy_email(arguments)
-        else:
-            raise ValueError(f"Unknown tool: {name}")
-            
+        return await handler(arguments)
     except Exception as e:
-        logger.error(f"Error executing tool {name}: {str(e)}")
-        return CallToolResult(
-            content=[
-                TextContent(
-                    type="text",
-                    text=f"Error executing {name}: {str(e)}"
-                )
-            ]
-        )
+        logger.error("Error executing tool %s: %s", name, e)
+        return _text_result(f"Error executing {name}: {str(e)}")
 
 
 async def _log_action_for_ui(arguments: Dict[str, Any]) -> CallToolResult:
     """Log an action message for UI display."""
     message = arguments.get("message", "")
     agent = arguments.get("agent", "Unknown Agent")
-    status = arguments.get("status", "working")
-    
-    # Simulate logging to UI system
-    log_entry = {
-        "timestamp": time.time(),
-        "agent": agent,
-        "message": message,
-        "status": status
-    }
     
-    logger.info(f"UI Log: {agent} - {message}")
+    logger.info("UI Log: %s - %s", agent, message)
     
-    return CallToolResult(
-        content=[
-            TextContent(
-                type="text",
-                text=f"Successfully logged action for UI: {message}"
-            )
-        ]
-    )
+    return _text_result(f"Successfully logged action for UI: {message}")
 
 
 async def _analyze_email_for_iocs(arguments: Dict[str, Any]) -> CallToolResult:
@@ -422,18 +337,14 @@ async def _analyze_email_for_iocs(arguments: Dict[str, Any]) -> CallToolResult:
     # Simulate IOC analysis with realistic results
     found_iocs = []
     
-    # Check for suspicious keywords and patterns
-    suspicious_keywords = ["urgent", "verify", "click here", "suspended", "payment", "invoice"]
-    phishing_indicators = ["login", "credentials", "account", "security alert"]
-    
     subject_lower = email_subject.lower()
     
     # Simulate finding IOCs based on content
-    if any(keyword in subject_lower for keyword in suspicious_keywords):
+    if _SUSPICIOUS_PATTERN.search(subject_lower):
         # Add some sample malicious URLs
-        found_iocs.extend(random.sample(SAMPLE_IOCS[:2], random.randint(1, 2)))
+        found_iocs.extend(_SIMULATION_RANDOM.sample(SAMPLE_IOCS[:2], _SIMULATION_RANDOM.randint(1, 2)))
     
-    if any(indicator in subject_lower for indicator in phishing_indicators):
+    if _PHISHING_PATTERN.search(subject_lower):
         # Add suspicious sender
         found_iocs.append(SAMPLE_IOCS[4])  # suspicious sender
         
@@ -449,27 +360,33 @@ async def _analyze_email_for_iocs(arguments: Dict[str, Any]) -> CallToolResult:
         "email_subject": email_subject,
         "iocs_found": len(found_iocs),
         "indicators": found_iocs,
-        "threat_level": "HIGH" if len(found_iocs) > 2 else "MEDIUM" if found_iocs else "LOW",
-        "analysis_time": f"{random.uniform(1.2, 3.5):.1f}s"
+        "threat_level": "HIGH" if len(found_iocs) > 2 else "MEDIUM" if found_iocs else "LOW"
     }
     
-    result_text = f"""IOC Analysis Complete:
-- Email Subject: {email_subject}
-- IOCs Found: {len(found_iocs)}
-- Threat Level: {analysis_result['threat_level']}
-- Analysis Time: {analysis_result['analysis_time']}
+    result_text = _IOC_ANALYSIS_TEMPLATE.format_map({
+        "subject": email_subject,
+        "ioc_count": len(found_iocs),
+        "threat_level": analysis_result["threat_level"],
+        "indicator_lines": "\n".join("  • " + ioc for ioc in found_iocs) if found_iocs else _NO_IOC_LINE
+    })
+    
+    return _text_result(result_text)
 
-Detected Indicators:
-{chr(10).join(f'  • {ioc}' for ioc in found_iocs) if found_iocs else '  • No malicious indicators detected'}"""
+
+def _simulate_url_block(url: str, reason: str) -> Dict[str, str]:
+    """Simulate blocking one URL, returning its block ID and report text."""
+    # Simulate network blocking operation
+    method = _SIMULATION_RANDOM.choice(_BLOCKING_METHODS)
+    block_id = f"BLK-{_SIMULATION_RANDOM.randint(100000, 999999)}"
     
-    return CallToolResult(
-        content=[
-            TextContent(
-                type="text",
-                text=result_text
-            )
-        ]
-    )
+    result_text = _URL_BLOCKING_TEMPLATE.format_map({
+        "url": url,
+        "block_id": block_id,
+        "method": method,
+        "reason": reason
+    })
+    
+    return {"block_id": block_id, "details": result_text}
 
 
 async def _block_malicious_url(arguments: Dict[str, Any]) -> CallToolResult:
@@ -477,38 +394,32 @@ async def _block_malicious_url(arguments: Dict[str, Any]) -> CallToolResult:
     url = arguments.get("url", "")
     reason = arguments.get("reason", "Malicious content detected")
     
-    # Simulate network blocking operation
-    blocking_methods = [
-        "DNS blackhole",
-        "Firewall rule",
-        "Proxy filter",
-        "Web gateway block"
-    ]
-    
-    method = random.choice(blocking_methods)
-    block_id = f"BLK-{random.randint(100000, 999999)}"
+    return _text_result(_simulate_url_block(url, reason)["details"])
+
+
+async def _block_malicious_urls(arguments: Dict[str, Any]) -> CallToolResult:
+    """Block several malicious URLs at the network level, one result entry per URL."""
+    urls = arguments.get("urls", [])
+    reason = arguments.get("reason", "Malicious content detected")
     
-    # Simulate processing time
-    processing_time = random.uniform(0.8, 2.2)
+    results = []
+    for url in urls:
+        block = _simulate_url_block(url, reason)
+        results.append({
+            "url": url,
+            "block_id": block["block_id"],
+            "status": "blocked",
+            "details": block["details"]
+        })
     
-    result_text = f"""URL Blocking Complete:
-- URL: {url}
-- Block ID: {block_id}
-- Method: {method}
-- Reason: {reason}
-- Processing Time: {processing_time:.1f}s
-- Status: BLOCKED
-
-The malicious URL has been successfully blocked across all network access points."""
+    logger.info("Bulk URL block completed: %d URLs", len(results))
     
-    return CallToolResult(
-        content=[
-            TextContent(
-                type="text",
-                text=result_text
-            )
-        ]
-    )
+    return _json_result({
+        "success": True,
+        "blocked_count": len(results),
+        "reason": reason,
+        "results": results
+    })
 
 
 async def _search_and_destroy_email(arguments: Dict[str, Any]) -> CallToolResult:
@@ -517,59 +428,99 @@ async def _search_and_destroy_email(arguments: Dict[str, Any]) -> CallToolResult
     search_type = arguments.get("search_type", "subject")
     
     # Simulate email search and removal
-    total_mailboxes = random.randint(150, 300)
-    emails_found = random.randint(5, 25)
+    total_mailboxes = _SIMULATION_RANDOM.randint(150, 300)
+    emails_found = _SIMULATION_RANDOM.randint(5, 25)
     emails_removed = emails_found  # Assume all found emails are successfully removed
     
-    # Simulate processing time based on scope
-    processing_time = random.uniform(3.0, 8.0)
-    
     # Generate some sample affected users
+    randint = _SIMULATION_RANDOM.randint
     sample_users = [
-        f"user{random.randint(1, 999)}@company.com" 
+        f"user{randint(1, 999)}@company.com" 
         for _ in range(min(5, emails_found))
     ]
     
-    result_text = f"""Email Search and Destroy Complete:
-- Search Criteria: {search_criteria}
-- Search Type: {search_type}
-- Mailboxes Scanned: {total_mailboxes}
-- Malicious Emails Found: {emails_found}
-- Emails Successfully Removed: {emails_removed}
-- Processing Time: {processing_time:.1f}s
+    result_text = _EMAIL_REMOVAL_TEMPLATE.format_map({
+        "search_criteria": search_criteria,
+        "search_type": search_type,
+        "total_mailboxes": total_mailboxes,
+        "emails_found": emails_found,
+        "emails_removed": emails_removed,
+        "user_lines": "\n".join("  • " + user for user in sample_users)
+    })
+    
+    return _text_result(result_text)
+
+
+async def _document_incident(arguments: Dict[str, Any]) -> CallToolResult:
+    """Document the security incident and its resolution."""
+    incident_summary = arguments.get("incident_summary", "")
+    actions_taken = arguments.get("actions_taken", [])
+    
+    incident_id = f"INC-{next(_INCIDENT_ID_COUNTER):05d}"
+    
+    result = {
+        "success": True,
+        "incident_id": incident_id,
+        "incident_summary": incident_summary,
+        "actions_taken": actions_taken,
+        "documentation_complete": True,
+        "compliance_status": "SOC 2 compliant",
+        "created_timestamp": time.time()
+    }
+    
+    logger.info("Incident documented with ID: %s", incident_id)
+    
+    return _json_result(result)
 
-Sample Affected Users:
-{chr(10).join(f'  • {user}' for user in sample_users)}
 
-All identified malicious emails have been quarantined and removed from user inboxes."""
+async def _batch_call(arguments: Dict[str, Any]) -> CallToolResult:
+    """Run independent tool calls concurrently, one result entry per call."""
+    calls = arguments.get("calls", [])
     
-    return CallToolResult(
-        content=[
-            TextContent(
-                type="text",
-                text=result_text
-            )
-        ]
-    )
+    async def run_call(call: Dict[str, Any]) -> CallToolResult:
+        name = call.get("name", "")
+        if name == "batch_call":
+            return _text_result("Error executing batch_call: batch_call cannot be nested")
+        return await _dispatch_tool(name, call.get("arguments") or {})
+    
+    # The handlers share no state, so the calls can safely overlap
+    results = await asyncio.gather(*(run_call(call) for call in calls))
+    
+    logger.info("Batch call completed: %d tool calls", len(results))
+    
+    return CallToolResult(content=[content for result in results for content in result.content])
+
+
+# Tool name -> handler, built once so dispatch is a single dict lookup
+_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[CallToolResult]]] = {
+    "log_action_for_ui": _log_action_for_ui,
+    "analyze_email_for_iocs": _analyze_email_for_iocs,
+    "block_malicious_url": _block_malicious_url,
+    "block_malicious_urls": _block_malicious_urls,
+    "search_and_destroy_email": _search_and_destroy_email,
+    "document_incident": _document_incident,
+    "batch_call": _batch_call,
+}
 
 
 def run_mcp_server(host: str = "localhost", port: int = 8000):
     """
     Run the MCP server with proper host/port binding and configuration.
     
+    The server holds one stdio session for the life of the process and must
+    not be started more than once per process; in-process callers should use
+    invoke() instead.
+    
     Args:
         host: Host to bind the server to
         port: Port to bind the server to
     """
-    import os
-    import sys
-    
     # Validate environment variables
     required_env_vars = []  # Add any required env vars here
     missing_vars = [var for var in required_env_vars if not os.getenv(var)]
     
     if missing_vars:
-        logger.error(f"Missing required environment variables: {', '.join(missing_vars)}")
+        logger.error("Missing required environment variables: %s", ', '.join(missing_vars))
         sys.exit(1)
     
     # Configure server settings from environment
@@ -580,8 +531,10 @@ def run_mcp_server(host: str = "localhost", port: int = 8000):
     # Set logging level
     logging.getLogger().setLevel(getattr(logging, log_level.upper(), logging.INFO))
     
-    logger.info(f"Starting Security Tools MCP Server on {server_host}:{server_port}")
-    logger.info(f"Log level: {log_level}")
+    logger.info("Starting Security Tools MCP Server on %s:%s", server_host, server_port)
+    logger.info("Log level: %s", log_level)
+    
+    _install_uvloop()
     
     try:
         # Run the server
@@ -589,12 +542,30 @@ def run_mcp_server(host: str = "localhost", port: int = 8000):
     except KeyboardInterrupt:
         logger.info("Server shutdown requested by user")
     except Exception as e:
-        logger.error(f"Server error: {str(e)}")
+        logger.error("Server error: %s", e)
         raise
 
 
+def _install_uvloop():
+    """Use uvloop's event loop for the server when it is installed (it is not available on Windows)."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("Using uvloop event loop")
+
+
 async def main():
     """Main entry point for the MCP server."""
+    global _stdio_session_started
+    
+    # stdio is a single per-process channel, so a second server.run would fight over it
+    if _stdio_session_started:
+        raise RuntimeError("MCP server is already running in this process")
+    _stdio_session_started = True
+    
     logger.info("Starting Security Tools MCP Server...")
     
     try:
@@ -612,7 +583,7 @@ async def main():
                 )
             )
     except Exception as e:
-        logger.error(f"Failed to start MCP server: {str(e)}")
+        logger.error("Failed to start MCP server: %s", e)
         raise
 
 
@@ -623,8 +594,6 @@ def validate_configuration():
     Returns:
         bool: True if configuration is valid, False otherwise
     """
-    import os
-    
     # Check for optional configuration
     config_items = {
         "MCP_SERVER_HOST": os.getenv("MCP_SERVER_HOST", "localhost"),
@@ -634,62 +603,68 @@ def validate_configuration():
     
     logger.info("MCP Server Configuration:")
     for key, value in config_items.items():
-        logger.info(f"  {key}: {value}")
+        logger.info("  %s: %s", key, value)
     
     # Validate port is numeric
     try:
         port = int(config_items["MCP_SERVER_PORT"])
         if not (1 <= port <= 65535):
-            logger.error(f"Invalid port number: {port}. Must be between 1 and 65535.")
+            logger.error("Invalid port number: %d. Must be between 1 and 65535.", port)
             return False
     except ValueError:
-        logger.error(f"Invalid port number: {config_items['MCP_SERVER_PORT']}. Must be numeric.")
+        logger.error("Invalid port number: %s. Must be numeric.", config_items['MCP_SERVER_PORT'])
         return False
     
     # Validate log level
     valid_log_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
     if config_items["MCP_LOG_LEVEL"].upper() not in valid_log_levels:
-        logger.error(f"Invalid log level: {config_items['MCP_LOG_LEVEL']}. Must be one of: {', '.join(valid_log_levels)}")
+        logger.error("Invalid log level: %s. Must be one of: %s", config_items['MCP_LOG_LEVEL'], ', '.join(valid_log_levels))
         return False
     
     return True
 
 
-if __name__ == "__main__":
-    import sys
-    import argparse
-    
-    # Parse command line arguments
-    parser = argparse.ArgumentParser(description="Security Tools MCP Server")
-    parser.add_argument(
-        "--host", 
-        default="localhost", 
-        help="Host to bind the server to (default: localhost)"
-    )
-    parser.add_argument(
-        "--port", 
-        type=int, 
-        default=8000, 
-        help="Port to bind the server to (default: 8000)"
-    )
-    parser.add_argument(
-        "--log-level", 
-        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
-        default="INFO",
-        help="Logging level (default: INFO)"
-    )
-    
-    args = parser.parse_args()
+_USAGE = "usage: security_mcp_server.py [--host HOST] [--port PORT] [--log-level {DEBUG,INFO,WARNING,ERROR,CRITICAL}]"
+
+
+def _parse_cli_args(argv: List[str]) -> Dict[str, str]:
+    """
+    Parse the server's --host/--port/--log-level options.
     
+    Args:
+        argv: Command line arguments, without the program name
+        
+    Returns:
+        Dict[str, str]: Option values keyed by environment variable name
+    """
+    options = {"--host": "MCP_SERVER_HOST", "--port": "MCP_SERVER_PORT", "--log-level": "MCP_LOG_LEVEL"}
+    values = {"MCP_SERVER_HOST": "localhost", "MCP_SERVER_PORT": "8000", "MCP_LOG_LEVEL": "INFO"}
+    
+    args = iter(argv)
+    for arg in args:
+        option, sep, value = arg.partition("=")
+        if option in ("-h", "--help"):
+            print(_USAGE)
+            sys.exit(0)
+        if option not in options:
+            print(_USAGE, file=sys.stderr)
+            sys.exit(f"Unrecognized argument: {arg}")
+        if not sep:
+            value = next(args, None)
+            if value is None:
+                sys.exit(f"Missing value for {option}")
+        values[options[option]] = value
+    
+    return values
+
+
+if __name__ == "__main__":
     # Set environment variables from command line args
-    import os
-    os.environ["MCP_SERVER_HOST"] = args.host
-    os.environ["MCP_SERVER_PORT"] = str(args.port)
-    os.environ["MCP_LOG_LEVEL"] = args.log_level
+    os.environ.update(_parse_cli_args(sys.argv[1:]))
     
-    # Validate configuration before starting
+    # Validate configuration before starting (port and log level are checked here)
     if not validate_configuration():
         sys.exit(1)
     
     # Run the server
-    run_mcp_server(args.host, args.port)
\ No newline at end of file
+    run_mcp_server(os.environ["MCP_SERVER_HOST"], int(os.environ["MCP_SERVER_PORT"]))
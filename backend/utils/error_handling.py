@@ -5,17 +5,48 @@ Provides centralized error handling, retry mechanisms, and logging
 configuration for robust system operation.
 """
 
+import array
 import asyncio
+import atexit
 import functools
+import itertools
 import logging
+import logging.handlers
+import queue
+import random
 import sys
+import threading
 import time
 import traceback
+import weakref
+from collections import OrderedDict, deque
 from typing import Any, Callable, Dict, List, Optional, Type, Union
-from datetime import datetime
 import json
 
 
+# (whole second, "YYYY-MM-DDTHH:MM:SS" for it); replaced as one tuple so threads never see a torn pair
+_iso_second_cache = (None, "")
+
+
+def _utc_isoformat_now() -> str:
+    """
+    Return the current UTC time in ISO 8601 format with microseconds.
+    
+    The date/time part is formatted at most once per second and only the
+    microsecond suffix is rendered per call.
+    """
+    global _iso_second_cache
+    
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _iso_second_cache
+    if cached_second != second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _iso_second_cache = (second, prefix)
+    
+    return f"{prefix}.{int((now - second) * 1000000):06d}"
+
+
 class NexusAIError(Exception):
     """Base exception class for NexusAI system errors."""
     
@@ -24,7 +55,7 @@ class NexusAIError(Exception):
         self.message = message
         self.error_code = error_code or "NEXUS_ERROR"
         self.details = details or {}
-        self.timestamp = datetime.utcnow().isoformat()
+        self.timestamp = _utc_isoformat_now()
 
 
 class AgentError(NexusAIError):
@@ -85,13 +116,184 @@ class CircuitBreakerError(NexusAIError):
         self.service_name = service_name
 
 
+# Error-specific field copied into error_info, keyed by error class
+_ERROR_FIELDS = {
+    AgentError: "agent_name",
+    ToolError: "tool_name",
+    WorkflowError: "workflow_id",
+    APIError: "api_name"
+}
+
+# Log level by error class; anything not listed here is logged as CRITICAL
+_ERROR_LOG_LEVELS = {
+    RetryableError: logging.WARNING,
+    CircuitBreakerError: logging.WARNING,
+    AgentError: logging.ERROR,
+    ToolError: logging.ERROR,
+    WorkflowError: logging.ERROR
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _error_field_for(error_class: type) -> Optional[str]:
+    """Return the error-specific field for an error class (resolved once per class via its MRO)."""
+    for cls in error_class.__mro__:
+        if cls in _ERROR_FIELDS:
+            return _ERROR_FIELDS[cls]
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _log_level_for(error_class: type) -> int:
+    """Return the log level for an error class (resolved once per class via its MRO)."""
+    for cls in error_class.__mro__:
+        if cls in _ERROR_LOG_LEVELS:
+            return _ERROR_LOG_LEVELS[cls]
+    return logging.CRITICAL
+
+
+class _LazyJSON:
+    """Log argument that serializes its value to JSON only when the record is formatted."""
+    
+    __slots__ = ("value",)
+    
+    def __init__(self, value: Any):
+        self.value = value
+    
+    def __str__(self) -> str:
+        return json.dumps(self.value, default=str)
+
+
+class _LazyTraceback:
+    """Traceback holder that renders the formatted traceback only when converted to a string."""
+    
+    __slots__ = ("exc_info",)
+    
+    def __init__(self, exc_info: tuple):
+        self.exc_info = exc_info
+    
+    def __str__(self) -> str:
+        return "".join(traceback.format_exception(*self.exc_info))
+    
+    __repr__ = __str__
+
+
+class ErrorRateCounter:
+    """
+    Rolling per-second error counts over the last hour.
+    
+    Counts live in a ring of one-second buckets, and the 5 minute, 15 minute
+    and 1 hour totals are kept as running sums: each bucket that ages out of a
+    window is subtracted as time advances, so recording an error and reading
+    the totals never rescan individual errors.
+    """
+    
+    BUCKET_COUNT = 3600
+    WINDOWS = (300, 900, 3600)
+    
+    def __init__(self):
+        # Unsigned 32-bit buckets: 14 KiB per error type instead of a list of int objects
+        self._buckets = array.array("I", bytes(4 * self.BUCKET_COUNT))
+        self._window_sums = [0] * len(self.WINDOWS)
+        self._last_second = None
+        self._lock = threading.Lock()
+    
+    def record(self, now: float = None):
+        """Record one error at ``now`` (defaults to the current time)."""
+        second = int(time.time() if now is None else now)
+        with self._lock:
+            self._advance(second)
+            # A clock step backwards is counted in the newest bucket
+            self._buckets[self._last_second % self.BUCKET_COUNT] += 1
+            for index in range(len(self._window_sums)):
+                self._window_sums[index] += 1
+    
+    def counts(self, now: float = None) -> Dict[str, int]:
+        """Return the error totals for the 5 minute, 15 minute and 1 hour windows."""
+        second = int(time.time() if now is None else now)
+        with self._lock:
+            self._advance(second)
+            last_5_min, last_15_min, last_hour = self._window_sums
+        return {"last_hour": last_hour, "last_15_min": last_15_min, "last_5_min": last_5_min}
+    
+    def _advance(self, second: int):
+        """Move the ring forward to ``second``, expiring buckets that leave each window."""
+        if self._last_second is None:
+            self._last_second = second
+            return
+        if second <= self._last_second:
+            return
+        
+        if second - self._last_second >= self.BUCKET_COUNT:
+            # Everything tracked is older than an hour
+            self._buckets = array.array("I", bytes(4 * self.BUCKET_COUNT))
+            self._window_sums = [0] * len(self.WINDOWS)
+        else:
+            buckets = self._buckets
+            for current in range(self._last_second + 1, second + 1):
+                for index, window in enumerate(self.WINDOWS):
+                    self._window_sums[index] -= buckets[(current - window) % self.BUCKET_COUNT]
+                buckets[current % self.BUCKET_COUNT] = 0
+        
+        self._last_second = second
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing ``rate`` events per second with bursts of up to ``capacity``."""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> bool:
+        """Take one token if available; returns False when the bucket is empty."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+# Every live ErrorHandler, so pending suppression summaries can be flushed at exit
+_error_handlers = weakref.WeakSet()
+
+
 class ErrorHandler:
     """Centralized error handling and logging system."""
     
-    def __init__(self, logger_name: str = "nexusai"):
+    def __init__(self, logger_name: str = "nexusai", max_error_types: int = 256,
+                 log_rate: float = 10.0, log_burst: int = 100, summary_interval: float = 10.0):
+        """
+        Initialize the error handler.
+        
+        Args:
+            logger_name: Name of the logger errors are written to
+            max_error_types: Number of distinct error types tracked before the least recently seen is evicted
+            log_rate: Sustained number of errors per second that are fully handled and logged
+            log_burst: Number of errors that can be fully handled in a burst above ``log_rate``
+            summary_interval: Seconds after the first suppressed error before a summary is logged,
+                if logging has not resumed by then
+        """
         self.logger = logging.getLogger(logger_name)
-        self.error_counts = {}
+        self.max_error_types = max_error_types
+        # Least recently seen error type first, so the oldest entry is evicted when full
+        self.error_counts = OrderedDict()
         self.circuit_breakers = {}
+        self._counts_lock = threading.Lock()
+        # Errors over the rate limit are only counted; a summary is logged once logging
+        # resumes, after summary_interval, or at exit, whichever comes first
+        self._rate_limiter = TokenBucket(log_rate, log_burst)
+        self.summary_interval = summary_interval
+        self._suppressed_counts: Dict[str, int] = {}
+        self._suppressed_since: Optional[float] = None
+        self._summary_timer: Optional[threading.Timer] = None
+        _error_handlers.add(self)
         
     def handle_error(self, error: Exception, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -110,10 +312,20 @@ class ErrorHandler:
         error_info = {
             "type": type(error).__name__,
             "message": str(error),
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _utc_isoformat_now(),
             "context": context
         }
         
+        if not self._rate_limiter.acquire():
+            # Over the rate limit: keep the counts accurate but skip traceback capture and logging
+            self._suppress(error_info["type"])
+            self._update_error_counts(error_info["type"])
+            error_info["suppressed"] = True
+            return error_info
+        
+        if self._suppressed_counts:
+            self._log_suppressed()
+        
         # Add specific error details for NexusAI errors
         if isinstance(error, NexusAIError):
             error_info.update({
@@ -122,148 +334,213 @@ class ErrorHandler:
             })
             
             # Add specific fields for different error types
-            if isinstance(error, AgentError):
-                error_info["agent_name"] = error.agent_name
-            elif isinstance(error, ToolError):
-                error_info["tool_name"] = error.tool_name
-            elif isinstance(error, WorkflowError):
-                error_info["workflow_id"] = error.workflow_id
-            elif isinstance(error, APIError):
-                error_info["api_name"] = error.api_name
-        
-        # Add stack trace for debugging
-        error_info["traceback"] = traceback.format_exc()
+            field_name = _error_field_for(type(error))
+            if field_name:
+                error_info[field_name] = getattr(error, field_name)
+        
+        log_level = _log_level_for(type(error))
+        
+        # Keep the raw exception info for debugging; it is only formatted if something stringifies it
+        exc_info = sys.exc_info()
+        if exc_info[0] is None:
+            exc_info = (type(error), error, error.__traceback__)
+        error_info["traceback"] = _LazyTraceback(exc_info)
         
         # Log the error
-        self._log_error(error, error_info)
+        self._log_error(log_level, error_info)
         
         # Update error counts for monitoring
         self._update_error_counts(error_info["type"])
         
         return error_info
     
-    def _log_error(self, error: Exception, error_info: Dict[str, Any]):
+    def _log_error(self, log_level: int, error_info: Dict[str, Any]):
         """Log error with appropriate level and formatting."""
+        if not self.logger.isEnabledFor(log_level):
+            return
         
-        # Determine log level based on error type
-        if isinstance(error, (RetryableError, CircuitBreakerError)):
-            log_level = logging.WARNING
-        elif isinstance(error, (AgentError, ToolError, WorkflowError)):
-            log_level = logging.ERROR
+        # Context is serialized only if a handler actually formats the record
+        if error_info.get("context"):
+            self.logger.log(log_level, "%s: %s | Context: %s", error_info["type"], error_info["message"],
+                            _LazyJSON(error_info["context"]), extra={"error_info": error_info})
         else:
-            log_level = logging.CRITICAL
+            self.logger.log(log_level, "%s: %s", error_info["type"], error_info["message"],
+                            extra={"error_info": error_info})
+    
+    def _suppress(self, error_type: str):
+        """Count an error that was dropped by the rate limiter."""
+        with self._counts_lock:
+            if self._suppressed_since is None:
+                self._suppressed_since = time.monotonic()
+                self._summary_timer = threading.Timer(self.summary_interval, self._log_suppressed)
+                self._summary_timer.daemon = True
+                self._summary_timer.start()
+            self._suppressed_counts[error_type] = self._suppressed_counts.get(error_type, 0) + 1
+    
+    def _log_suppressed(self):
+        """Log a summary of the errors suppressed since the last one, then reset the tally."""
+        with self._counts_lock:
+            suppressed, self._suppressed_counts = self._suppressed_counts, {}
+            since, self._suppressed_since = self._suppressed_since, None
+            timer, self._summary_timer = self._summary_timer, None
         
-        # Format log message
-        log_message = f"{error_info['type']}: {error_info['message']}"
-        if error_info.get("context"):
-            log_message += f" | Context: {json.dumps(error_info['context'])}"
+        if timer is not None:
+            timer.cancel()
         
-        # Log with appropriate level
-        self.logger.log(log_level, log_message, extra={"error_info": error_info})
+        if not suppressed:
+            return
+        elapsed = time.monotonic() - since
+        for error_type, count in suppressed.items():
+            self.logger.warning("Suppressed %d %s errors in the last %.1fs (error rate limit exceeded)",
+                                count, error_type, elapsed)
     
     def _update_error_counts(self, error_type: str):
         """Update error counts for monitoring and circuit breaker logic."""
-        current_time = time.time()
-        
-        if error_type not in self.error_counts:
-            self.error_counts[error_type] = []
-        
-        # Add current error timestamp
-        self.error_counts[error_type].append(current_time)
+        with self._counts_lock:
+            counter = self.error_counts.get(error_type)
+            if counter is None:
+                counter = self.error_counts[error_type] = ErrorRateCounter()
+                if len(self.error_counts) > self.max_error_types:
+                    self.error_counts.popitem(last=False)
+            else:
+                self.error_counts.move_to_end(error_type)
         
-        # Clean up old entries (keep last hour)
-        cutoff_time = current_time - 3600  # 1 hour
-        self.error_counts[error_type] = [
-            timestamp for timestamp in self.error_counts[error_type] 
-            if timestamp > cutoff_time
-        ]
+        counter.record()
     
     def get_error_stats(self) -> Dict[str, Any]:
         """Get current error statistics."""
         current_time = time.time()
         stats = {}
         
-        for error_type, timestamps in self.error_counts.items():
+        for error_type, counter in list(self.error_counts.items()):
             # Count errors in different time windows
-            last_hour = sum(1 for t in timestamps if t > current_time - 3600)
-            last_15_min = sum(1 for t in timestamps if t > current_time - 900)
-            last_5_min = sum(1 for t in timestamps if t > current_time - 300)
-            
-            stats[error_type] = {
-                "last_hour": last_hour,
-                "last_15_min": last_15_min,
-                "last_5_min": last_5_min,
-                "total_tracked": len(timestamps)
-            }
+            window_counts = counter.counts(current_time)
+            window_counts["total_tracked"] = window_counts["last_hour"]
+            stats[error_type] = window_counts
         
         return stats
 
 
 class CircuitBreaker:
-    """Circuit breaker implementation for service protection."""
+    """
+    Circuit breaker implementation for service protection.
+    
+    Outcomes are tracked in one-second buckets over a rolling sampling window.
+    The breaker opens once the window holds at least ``minimum_throughput``
+    calls and the share of failures reaches ``failure_ratio``; with the
+    defaults (minimum throughput = ``failure_threshold``, ratio 0.5) a burst of
+    ``failure_threshold`` straight failures still opens it, while occasional
+    failures spread across a healthy stream of calls no longer add up forever.
+    """
     
     def __init__(self, service_name: str, failure_threshold: int = 5, 
-                 recovery_timeout: float = 60.0, expected_exception: Type[Exception] = Exception):
+                 recovery_timeout: float = 60.0, expected_exception: Type[Exception] = Exception,
+                 sampling_duration: float = 60.0, minimum_throughput: int = None,
+                 failure_ratio: float = 0.5):
         self.service_name = service_name
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
         self.expected_exception = expected_exception
+        # Normalized once so the except clauses below always match against a plain tuple
+        self._exception_tuple = (expected_exception if isinstance(expected_exception, tuple)
+                                 else (expected_exception,))
+        self.sampling_duration = sampling_duration
+        self.minimum_throughput = failure_threshold if minimum_throughput is None else minimum_throughput
+        self.failure_ratio = failure_ratio
         
-        self.failure_count = 0
         self.last_failure_time = None
         self.state = "CLOSED"  # CLOSED, OPEN, HALF_OPEN
         
+        # [second, successes, failures] buckets inside the sampling window, oldest first,
+        # with running totals so tripping decisions never re-sum the window
+        self._window = deque()
+        self._window_successes = 0
+        self._window_failures = 0
+        
+        # Breakers may be shared by agents on different threads; transitions never await,
+        # so a plain lock held for the update is enough
+        self._state_lock = threading.Lock()
+        # Number of HALF_OPEN probe calls currently running (0 or 1)
+        self._half_open_inflight = 0
+        
         self.logger = logging.getLogger(f"circuit_breaker.{service_name}")
     
     def __call__(self, func: Callable) -> Callable:
         """Decorator to wrap functions with circuit breaker logic."""
         
-        @functools.wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            return await self._call_async(func, *args, **kwargs)
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await self._call_async(func, *args, **kwargs)
+            
+            return async_wrapper
         
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
             return self._call_sync(func, *args, **kwargs)
         
-        if asyncio.iscoroutinefunction(func):
-            return async_wrapper
-        else:
-            return sync_wrapper
+        return sync_wrapper
     
     async def _call_async(self, func: Callable, *args, **kwargs):
         """Execute async function with circuit breaker protection."""
-        if self.state == "OPEN":
-            if self._should_attempt_reset():
-                self.state = "HALF_OPEN"
-                self.logger.info(f"Circuit breaker for {self.service_name} entering HALF_OPEN state")
-            else:
-                raise CircuitBreakerError(self.service_name)
+        is_probe = self._admit_call()
         
         try:
             result = await func(*args, **kwargs)
             self._on_success()
             return result
-        except self.expected_exception as e:
+        except self._exception_tuple:
             self._on_failure()
             raise
+        finally:
+            if is_probe:
+                self._release_probe()
     
     def _call_sync(self, func: Callable, *args, **kwargs):
         """Execute sync function with circuit breaker protection."""
-        if self.state == "OPEN":
-            if self._should_attempt_reset():
-                self.state = "HALF_OPEN"
-                self.logger.info(f"Circuit breaker for {self.service_name} entering HALF_OPEN state")
-            else:
-                raise CircuitBreakerError(self.service_name)
+        is_probe = self._admit_call()
         
         try:
             result = func(*args, **kwargs)
             self._on_success()
             return result
-        except self.expected_exception as e:
+        except self._exception_tuple:
             self._on_failure()
             raise
+        finally:
+            if is_probe:
+                self._release_probe()
+    
+    def _admit_call(self) -> bool:
+        """
+        Decide whether a call may run, raising CircuitBreakerError if not.
+        
+        While HALF_OPEN only a single probe call is let through at a time, so a
+        recovering service isn't hit by every waiting caller at once.
+        
+        Returns:
+            bool: True if the admitted call is the HALF_OPEN probe
+        """
+        with self._state_lock:
+            if self.state == "OPEN":
+                if self._should_attempt_reset():
+                    self.state = "HALF_OPEN"
+                    self.logger.info("Circuit breaker for %s entering HALF_OPEN state", self.service_name)
+                else:
+                    raise CircuitBreakerError(self.service_name)
+            
+            if self.state == "HALF_OPEN":
+                if self._half_open_inflight:
+                    raise CircuitBreakerError(self.service_name)
+                self._half_open_inflight = 1
+                return True
+        
+        return False
+    
+    def _release_probe(self):
+        """Free the HALF_OPEN probe slot once the probe call has finished."""
+        with self._state_lock:
+            self._half_open_inflight = 0
     
     def _should_attempt_reset(self) -> bool:
         """Check if enough time has passed to attempt reset."""
@@ -271,26 +548,98 @@ class CircuitBreaker:
             return True
         return time.time() - self.last_failure_time >= self.recovery_timeout
     
+    @property
+    def failure_count(self) -> int:
+        """Failures recorded in the current sampling window."""
+        return self._window_failures
+    
+    def _record_outcome(self, failed: bool):
+        """Add a call outcome to the sampling window (caller holds the state lock)."""
+        second = int(time.time())
+        window = self._window
+        
+        # Expire buckets that have left the sampling window
+        cutoff = second - self.sampling_duration
+        while window and window[0][0] <= cutoff:
+            _, successes, failures = window.popleft()
+            self._window_successes -= successes
+            self._window_failures -= failures
+        
+        # A clock step backwards keeps counting in the newest bucket
+        if not window or window[-1][0] < second:
+            window.append([second, 0, 0])
+        
+        if failed:
+            window[-1][2] += 1
+            self._window_failures += 1
+        else:
+            window[-1][1] += 1
+            self._window_successes += 1
+    
+    def _reset_window(self):
+        """Forget all sampled outcomes (caller holds the state lock)."""
+        self._window.clear()
+        self._window_successes = 0
+        self._window_failures = 0
+    
     def _on_success(self):
         """Handle successful execution."""
-        if self.state == "HALF_OPEN":
-            self.state = "CLOSED"
-            self.failure_count = 0
-            self.logger.info(f"Circuit breaker for {self.service_name} reset to CLOSED state")
+        with self._state_lock:
+            if self.state == "HALF_OPEN":
+                self.state = "CLOSED"
+                self._reset_window()
+                self.logger.info("Circuit breaker for %s reset to CLOSED state", self.service_name)
+            else:
+                self._record_outcome(failed=False)
     
     def _on_failure(self):
         """Handle failed execution."""
-        self.failure_count += 1
-        self.last_failure_time = time.time()
+        with self._state_lock:
+            self._record_outcome(failed=True)
+            self.last_failure_time = time.time()
+            
+            if self.state == "HALF_OPEN":
+                # The probe failed, so the service hasn't recovered yet
+                self.state = "OPEN"
+                self.logger.warning("Circuit breaker for %s reopened after failed probe", self.service_name)
+                return
+            
+            total = self._window_successes + self._window_failures
+            if (self.state == "CLOSED" and total >= self.minimum_throughput
+                    and self._window_failures >= self.failure_ratio * total):
+                self.state = "OPEN"
+                self.logger.warning("Circuit breaker for %s opened after %d failures in %d calls",
+                                    self.service_name, self._window_failures, total)
+
+
+_JITTER_MODES = ("none", "full", "equal")
+
+
+def _backoff_delay(delay: float, max_delay: float, jitter: str, rng: random.Random) -> float:
+    """
+    Compute the sleep before the next retry from the current exponential delay.
+    
+    Args:
+        delay: Current exponential delay in seconds
+        max_delay: Maximum delay between retries in seconds
+        jitter: Jitter mode ("none", "full" or "equal")
+        rng: Random source for the jitter
         
-        if self.failure_count >= self.failure_threshold:
-            self.state = "OPEN"
-            self.logger.warning(f"Circuit breaker for {self.service_name} opened after {self.failure_count} failures")
+    Returns:
+        float: Delay to sleep in seconds
+    """
+    capped_delay = min(delay, max_delay)
+    if jitter == "full":
+        return rng.uniform(0, capped_delay)
+    if jitter == "equal":
+        return capped_delay / 2 + rng.uniform(0, capped_delay / 2)
+    return capped_delay
 
 
 def retry_with_backoff(max_retries: int = 3, base_delay: float = 1.0, 
                       max_delay: float = 60.0, backoff_factor: float = 2.0,
-                      retryable_exceptions: tuple = (RetryableError, ConnectionError, TimeoutError)):
+                      retryable_exceptions: tuple = (RetryableError, ConnectionError, TimeoutError),
+                      jitter: str = "full"):
     """
     Decorator for automatic retry with exponential backoff.
     
@@ -300,88 +649,140 @@ def retry_with_backoff(max_retries: int = 3, base_delay: float = 1.0,
         max_delay: Maximum delay between retries in seconds
         backoff_factor: Multiplier for delay after each retry
         retryable_exceptions: Tuple of exceptions that should trigger retry
+        jitter: Randomization of each delay so concurrent callers don't retry in lockstep:
+            "full" (0 to delay), "equal" (delay/2 to delay) or "none"
     """
+    if jitter not in _JITTER_MODES:
+        raise ValueError(f"jitter must be one of {', '.join(_JITTER_MODES)}, got {jitter!r}")
+    if not isinstance(retryable_exceptions, tuple):
+        retryable_exceptions = (retryable_exceptions,)
+    
     def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            last_exception = None
-            delay = base_delay
+        logger = logging.getLogger(func.__module__)
+        # Per-function RNG (seeded from os.urandom) so retries don't share the global random state
+        rng = random.Random()
+        
+        def retry_delay(attempt: int, error: Exception, delay: float) -> Optional[float]:
+            """Log a failed attempt and return the sleep before the next one, or None to re-raise."""
+            if not isinstance(error, retryable_exceptions):
+                logger.error("Function %s failed with non-retryable error: %s", func.__name__, error)
+                return None
             
-            for attempt in range(max_retries + 1):
-                try:
-                    return await func(*args, **kwargs)
-                except retryable_exceptions as e:
-                    last_exception = e
-                    
-                    if attempt == max_retries:
-                        # Final attempt failed
-                        logger = logging.getLogger(func.__module__)
-                        logger.error(f"Function {func.__name__} failed after {max_retries} retries: {str(e)}")
-                        raise
-                    
-                    # Calculate next delay with exponential backoff
-                    actual_delay = min(delay, max_delay)
-                    
-                    logger = logging.getLogger(func.__module__)
-                    logger.warning(f"Function {func.__name__} failed (attempt {attempt + 1}/{max_retries + 1}), "
-                                 f"retrying in {actual_delay:.1f}s: {str(e)}")
+            if attempt == max_retries:
+                # Final attempt failed
+                logger.error("Function %s failed after %d retries: %s", func.__name__, max_retries, error)
+                return None
+            
+            # Calculate next delay with exponential backoff
+            actual_delay = _backoff_delay(delay, max_delay, jitter, rng)
+            
+            logger.warning("Function %s failed (attempt %d/%d), retrying in %.1fs: %s",
+                           func.__name__, attempt + 1, max_retries + 1, actual_delay, error)
+            return actual_delay
+        
+        # Both wrappers run the same loop; they differ only in how the call and the sleep are made
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                delay = base_delay
+                for attempt in itertools.count():
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception as e:
+                        actual_delay = retry_delay(attempt, e, delay)
+                        if actual_delay is None:
+                            raise
                     
                     await asyncio.sleep(actual_delay)
                     delay *= backoff_factor
-                except Exception as e:
-                    # Non-retryable exception
-                    logger = logging.getLogger(func.__module__)
-                    logger.error(f"Function {func.__name__} failed with non-retryable error: {str(e)}")
-                    raise
             
-            # This should never be reached, but just in case
-            raise last_exception
+            return async_wrapper
         
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
-            last_exception = None
             delay = base_delay
-            
-            for attempt in range(max_retries + 1):
+            for attempt in itertools.count():
                 try:
                     return func(*args, **kwargs)
-                except retryable_exceptions as e:
-                    last_exception = e
-                    
-                    if attempt == max_retries:
-                        # Final attempt failed
-                        logger = logging.getLogger(func.__module__)
-                        logger.error(f"Function {func.__name__} failed after {max_retries} retries: {str(e)}")
-                        raise
-                    
-                    # Calculate next delay with exponential backoff
-                    actual_delay = min(delay, max_delay)
-                    
-                    logger = logging.getLogger(func.__module__)
-                    logger.warning(f"Function {func.__name__} failed (attempt {attempt + 1}/{max_retries + 1}), "
-                                 f"retrying in {actual_delay:.1f}s: {str(e)}")
-                    
-                    time.sleep(actual_delay)
-                    delay *= backoff_factor
                 except Exception as e:
-                    # Non-retryable exception
-                    logger = logging.getLogger(func.__module__)
-                    logger.error(f"Function {func.__name__} failed with non-retryable error: {str(e)}")
-                    raise
-            
-            # This should never be reached, but just in case
-            raise last_exception
+                    actual_delay = retry_delay(attempt, e, delay)
+                    if actual_delay is None:
+                        raise
+                
+                time.sleep(actual_delay)
+                delay *= backoff_factor
         
-        if asyncio.iscoroutinefunction(func):
-            return async_wrapper
-        else:
-            return sync_wrapper
+        return sync_wrapper
     
     return decorator
 
 
+class JSONLogFormatter(logging.Formatter):
+    """Format log records as one JSON object per line, including any attached error_info."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        
+        error_info = getattr(record, "error_info", None)
+        if error_info:
+            entry["error_info"] = error_info
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        
+        # Context values are arbitrary, so anything json can't encode falls back to str()
+        return json.dumps(entry, default=str)
+
+
+class _InProcessQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that enqueues records untouched.
+    
+    The stock QueueHandler formats each record on the calling thread and folds
+    the traceback into the message so the record can cross process boundaries.
+    The queue here never leaves the process, so the record is passed as-is and
+    the listener's formatter (e.g. JSONLogFormatter) still sees exc_info.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+# Background listener that writes queued log records; replaced on each configure_logging call
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _stop_log_listener():
+    """Flush queued log records and stop the background log writer."""
+    global _log_listener
+    
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+atexit.register(_stop_log_listener)
+
+
+def _flush_suppressed_errors():
+    """Log any pending suppression summaries."""
+    for error_handler in list(_error_handlers):
+        error_handler._log_suppressed()
+
+
+# Registered after _stop_log_listener so it runs first and the summaries are still written
+atexit.register(_flush_suppressed_errors)
+
+
 def configure_logging(log_level: str = "INFO", log_format: str = None, 
-                     log_file: str = None, enable_json_logging: bool = False) -> logging.Logger:
+                     log_file: str = None, enable_json_logging: bool = False,
+                     enable_async_logging: bool = True) -> logging.Logger:
     """
     Configure comprehensive logging for the NexusAI system.
     
@@ -390,36 +791,51 @@ def configure_logging(log_level: str = "INFO", log_format: str = None,
         log_format: Custom log format string
         log_file: Optional file path for log output
         enable_json_logging: Enable structured JSON logging
+        enable_async_logging: Hand records to a background thread for writing
         
     Returns:
         Configured logger instance
     """
+    global _log_listener
+    
     # Set up root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
     
-    # Clear existing handlers
+    # Clear existing handlers (flushing anything still queued by a previous configuration)
     root_logger.handlers.clear()
+    _stop_log_listener()
+    output_handlers = []
     
     # Default format
-    if log_format is None:
-        if enable_json_logging:
-            log_format = '{"timestamp": "%(asctime)s", "level": "%(levelname)s", "logger": "%(name)s", "message": "%(message)s"}'
-        else:
+    if enable_json_logging and log_format is None:
+        formatter = JSONLogFormatter()
+    else:
+        if log_format is None:
             log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    
-    formatter = logging.Formatter(log_format)
+        formatter = logging.Formatter(log_format)
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    output_handlers.append(console_handler)
     
     # File handler (if specified)
     if log_file:
         file_handler = logging.FileHandler(log_file)
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        output_handlers.append(file_handler)
+    
+    if enable_async_logging:
+        # Callers only enqueue records; one listener thread does the formatting
+        # and stream writes, so error bursts don't block on console or file I/O
+        log_queue = queue.SimpleQueue()
+        root_logger.addHandler(_InProcessQueueHandler(log_queue))
+        _log_listener = logging.handlers.QueueListener(log_queue, *output_handlers, respect_handler_level=True)
+        _log_listener.start()
+    else:
+        for handler in output_handlers:
+            root_logger.addHandler(handler)
     
     # Configure specific loggers
     loggers_config = {
@@ -439,9 +855,9 @@ def configure_logging(log_level: str = "INFO", log_format: str = None,
     
     # Log configuration
     main_logger = logging.getLogger("nexusai")
-    main_logger.info(f"Logging configured - Level: {log_level}, JSON: {enable_json_logging}")
+    main_logger.info("Logging configured - Level: %s, JSON: %s", log_level, enable_json_logging)
     if log_file:
-        main_logger.info(f"Log file: {log_file}")
+        main_logger.info("Log file: %s", log_file)
     
     return main_logger
 
@@ -454,55 +870,54 @@ def graceful_shutdown_handler(shutdown_callback: Callable = None):
         shutdown_callback: Optional callback function to execute during shutdown
     """
     def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            try:
-                return await func(*args, **kwargs)
-            except KeyboardInterrupt:
-                logger = logging.getLogger(func.__module__)
-                logger.info("Shutdown signal received, initiating graceful shutdown...")
-                
-                if shutdown_callback:
-                    try:
-                        if asyncio.iscoroutinefunction(shutdown_callback):
+        logger = logging.getLogger(func.__module__)
+        # Resolved once here rather than on every shutdown
+        callback_is_async = asyncio.iscoroutinefunction(shutdown_callback)
+        
+        def begin_shutdown():
+            """Log the shutdown and run a synchronous callback (async callbacks are awaited by the async wrapper)."""
+            logger.info("Shutdown signal received, initiating graceful shutdown...")
+            
+            if shutdown_callback and not callback_is_async:
+                try:
+                    shutdown_callback()
+                except Exception as e:
+                    logger.error("Error during shutdown callback: %s", e)
+        
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                except KeyboardInterrupt:
+                    begin_shutdown()
+                    if callback_is_async:
+                        try:
                             await shutdown_callback()
-                        else:
-                            shutdown_callback()
-                    except Exception as e:
-                        logger.error(f"Error during shutdown callback: {str(e)}")
-                
-                logger.info("Graceful shutdown completed")
-                raise
-            except Exception as e:
-                logger = logging.getLogger(func.__module__)
-                logger.error(f"Unexpected error in {func.__name__}: {str(e)}")
-                raise
+                        except Exception as e:
+                            logger.error("Error during shutdown callback: %s", e)
+                    
+                    logger.info("Graceful shutdown completed")
+                    raise
+                except Exception as e:
+                    logger.error("Unexpected error in %s: %s", func.__name__, e)
+                    raise
+            
+            return async_wrapper
         
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
             try:
                 return func(*args, **kwargs)
             except KeyboardInterrupt:
-                logger = logging.getLogger(func.__module__)
-                logger.info("Shutdown signal received, initiating graceful shutdown...")
-                
-                if shutdown_callback:
-                    try:
-                        shutdown_callback()
-                    except Exception as e:
-                        logger.error(f"Error during shutdown callback: {str(e)}")
-                
+                begin_shutdown()
                 logger.info("Graceful shutdown completed")
                 raise
             except Exception as e:
-                logger = logging.getLogger(func.__module__)
-                logger.error(f"Unexpected error in {func.__name__}: {str(e)}")
+                logger.error("Unexpected error in %s: %s", func.__name__, e)
                 raise
         
-        if asyncio.iscoroutinefunction(func):
-            return async_wrapper
-        else:
-            return sync_wrapper
+        return sync_wrapper
     
     return decorator
 
@@ -3,17 +3,31 @@ NexusAI Flask Application - Simple Working Version
 """
 
 import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Green-thread servers have to patch the stdlib before Flask and friends import it
+SOCKETIO_ASYNC_MODE = os.getenv('SOCKETIO_ASYNC_MODE', 'threading')
+if SOCKETIO_ASYNC_MODE == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+elif SOCKETIO_ASYNC_MODE == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+
 import sys
+import gzip
+import hashlib
+import itertools
+import re
 import time
 import json
 import logging
 from pathlib import Path
-from flask import Flask, render_template_string, request, jsonify
+from flask import Flask, request
 from flask_socketio import SocketIO, emit
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
 
 # Set defaults
 os.environ.setdefault('SECRET_KEY', 'demo_secret_key_for_testing')
@@ -30,8 +44,13 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY')
 
-# Initialize SocketIO
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+# Initialize SocketIO (a message queue such as redis:// lets several server processes share clients)
+socketio = SocketIO(
+    app,
+    cors_allowed_origins="*",
+    async_mode=SOCKETIO_ASYNC_MODE,
+    message_queue=os.getenv('SOCKETIO_MESSAGE_QUEUE') or None
+)
 
 # Demo HTML template (embedded for simplicity)
 DEMO_HTML = """
@@ -132,7 +151,6 @@ DEMO_HTML = """
 
     <script>
         const socket = io();
-        let ticketCounter = 1;
         
         function useScenario(scenario) {
             document.getElementById('ticketSubject').value = scenario;
@@ -142,66 +160,122 @@ DEMO_HTML = """
             const subject = document.getElementById('ticketSubject').value.trim();
             if (!subject) { alert('Please enter a ticket subject'); return; }
             
-            const ticketId = ticketCounter++;
             document.getElementById('workflowDisplay').innerHTML = '';
-            simulateWorkflow({id: ticketId, subject: subject});
-        }
-        
-        function simulateWorkflow(ticket) {
-            const isPhishing = /suspicious|phishing|malware|ceo|wire transfer|fake|malicious/i.test(ticket.subject);
-            
-            const steps = [
-                { title: '📥 Ticket Received', description: `Ticket #${ticket.id}: "${ticket.subject}"`, delay: 0 },
-                { title: '🤖 Master Agent Analysis', description: 'Using Google Gemini AI to classify ticket...', delay: 1500 },
-                { title: '🎯 Classification Complete', 
-                  description: isPhishing ? 'Classified as "Phishing/Security" - Routing to PhishGuard Agent' : 'Classified as "General Inquiry" - Routing to Support Team', 
-                  delay: 3000 }
-            ];
-            
-            if (isPhishing) {
-                steps.push(
-                    { title: '🛡️ PhishGuard Agent Activated', description: 'Specialized security agent analyzing threat...', delay: 4500 },
-                    { title: '🔍 Threat Analysis', description: 'Extracting IOCs, analyzing URLs via MCP tools...', delay: 6000 },
-                    { title: '🚫 Network Protection', description: 'Blocking malicious URLs at network level...', delay: 7500 },
-                    { title: '📧 Email Remediation', description: 'Removing similar emails from all inboxes...', delay: 9000 },
-                    { title: '✅ Resolution Complete', description: 'Threat neutralized. Full audit trail documented.', delay: 10500 }
-                );
-            } else {
-                steps.push(
-                    { title: '👥 General Support Routing', description: 'Routing to appropriate IT support team...', delay: 4500 },
-                    { title: '✅ Ticket Escalated', description: 'Successfully routed for manual handling.', delay: 6000 }
-                );
-            }
-            
-            steps.forEach(step => {
-                setTimeout(() => addWorkflowStep(step), step.delay);
-            });
+            socket.emit('create_ticket', {subject: subject});
         }
         
         function addWorkflowStep(step) {
             const display = document.getElementById('workflowDisplay');
             const stepEl = document.createElement('div');
             stepEl.className = 'workflow-step';
-            stepEl.innerHTML = `<div class="step-title">${step.title}</div><div>${step.description}</div>`;
+            const titleEl = document.createElement('div');
+            titleEl.className = 'step-title';
+            titleEl.textContent = step.title;
+            const descriptionEl = document.createElement('div');
+            descriptionEl.textContent = step.description;
+            stepEl.append(titleEl, descriptionEl);
             display.appendChild(stepEl);
             stepEl.scrollIntoView({ behavior: 'smooth' });
         }
         
         socket.on('connect', () => console.log('Connected to NexusAI'));
+        socket.on('workflow_step', addWorkflowStep);
+        socket.on('ticket_error', (data) => alert(data.message));
     </script>
 </body>
 </html>
 """
 
-@app.route('/')
-def index():
-    """Serve the main demo page"""
-    return render_template_string(DEMO_HTML)
+# The page has no template variables, so it is encoded, compressed and hashed once at import
+_DEMO_BYTES = DEMO_HTML.encode('utf-8')
+_DEMO_GZIP = gzip.compress(_DEMO_BYTES, compresslevel=9)
+_DEMO_ETAG = hashlib.sha256(_DEMO_BYTES).hexdigest()[:32]
+
+# Precomputed response headers for each encoding of the demo page
+_DEMO_COMMON_HEADERS = [
+    ('Content-Type', 'text/html; charset=utf-8'),
+    ('Vary', 'Accept-Encoding'),
+    ('Cache-Control', 'public, max-age=300'),
+]
+_DEMO_GZIP_HEADERS = _DEMO_COMMON_HEADERS + [
+    ('Content-Encoding', 'gzip'),
+    ('Content-Length', str(len(_DEMO_GZIP))),
+    # Each encoding is its own representation, so it gets its own entity tag
+    ('ETag', f'"{_DEMO_ETAG}-gz"'),
+]
+_DEMO_PLAIN_HEADERS = _DEMO_COMMON_HEADERS + [
+    ('Content-Length', str(len(_DEMO_BYTES))),
+    ('ETag', f'"{_DEMO_ETAG}"'),
+]
+
+# Only the timestamp varies between health probes, so the rest of the JSON body is prebuilt
+_HEALTH_PREFIX = b'{"service":"NexusAI","status":"healthy","timestamp":'
+_HEALTH_SUFFIX = b'}'
+
+_STATIC_ALLOW_HEADER = ('Allow', 'GET, HEAD, OPTIONS')
+
+class StaticFastPath:
+    """
+    WSGI middleware that serves / (the demo page) and /health.
+    
+    Both responses are precomputed, so they are answered here without Flask's
+    URL matching, request context and signals. This is the only implementation
+    of the two endpoints; every other path is passed to the wrapped application.
+    """
+    
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+    
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO')
+        if path == '/':
+            handler = self._index
+        elif path == '/health':
+            handler = self._health
+        else:
+            return self.wsgi_app(environ, start_response)
+        
+        method = environ.get('REQUEST_METHOD')
+        if method == 'GET' or method == 'HEAD':
+            body = handler(environ, start_response)
+            return [b''] if method == 'HEAD' else body
+        
+        # Same answers Flask gives for a GET-only route
+        if method == 'OPTIONS':
+            start_response('200 OK', [_STATIC_ALLOW_HEADER, ('Content-Length', '0')])
+        else:
+            start_response('405 Method Not Allowed', [_STATIC_ALLOW_HEADER, ('Content-Length', '0')])
+        return [b'']
+    
+    @staticmethod
+    def _index(environ, start_response):
+        """Serve the demo page, honouring Accept-Encoding and If-None-Match."""
+        if 'gzip' in environ.get('HTTP_ACCEPT_ENCODING', ''):
+            body, headers = _DEMO_GZIP, _DEMO_GZIP_HEADERS
+        else:
+            body, headers = _DEMO_BYTES, _DEMO_PLAIN_HEADERS
+        
+        # Answer If-None-Match revalidations with 304 Not Modified
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH')
+        if if_none_match and (if_none_match.strip() == '*' or headers[-1][1] in if_none_match):
+            start_response('304 Not Modified', [h for h in headers if h[0] != 'Content-Length'])
+            return [b'']
+        
+        start_response('200 OK', headers)
+        return [body]
+    
+    @staticmethod
+    def _health(environ, start_response):
+        """Health check endpoint"""
+        body = _HEALTH_PREFIX + f"{time.time():.3f}".encode('ascii') + _HEALTH_SUFFIX
+        start_response('200 OK', [
+            ('Content-Type', 'application/json'),
+            ('Content-Length', str(len(body))),
+        ])
+        return [body]
 
-@app.route('/health')
-def health():
-    """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'service': 'NexusAI', 'timestamp': time.time()})
+# Wraps outside the Socket.IO middleware; /socket.io/ traffic never matches these paths
+app.wsgi_app = StaticFastPath(app.wsgi_app)
 
 @socketio.on('connect')
 def handle_connect():
@@ -209,12 +283,81 @@ def handle_connect():
     logger.info('Client connected')
     emit('status', {'message': 'Connected to NexusAI Multi-Agent System'})
 
+# Demo classification keywords, compiled once rather than per ticket
+_PHISH_RE = re.compile(r"suspicious|phishing|malware|ceo|wire transfer|fake|malicious", re.IGNORECASE)
+
+# Seconds between workflow steps, so the demo can be followed on screen
+_DEMO_STEP_INTERVAL = 1.5
+
+_CLASSIFICATION_STEPS = (
+    ('🤖 Master Agent Analysis', 'Using Google Gemini AI to classify ticket...'),
+)
+
+_PHISHING_STEPS = (
+    ('🎯 Classification Complete', 'Classified as "Phishing/Security" - Routing to PhishGuard Agent'),
+    ('🛡️ PhishGuard Agent Activated', 'Specialized security agent analyzing threat...'),
+    ('🔍 Threat Analysis', 'Extracting IOCs, analyzing URLs via MCP tools...'),
+    ('🚫 Network Protection', 'Blocking malicious URLs at network level...'),
+    ('📧 Email Remediation', 'Removing similar emails from all inboxes...'),
+    ('✅ Resolution Complete', 'Threat neutralized. Full audit trail documented.'),
+)
+
+_GENERAL_STEPS = (
+    ('🎯 Classification Complete', 'Classified as "General Inquiry" - Routing to Support Team'),
+    ('👥 General Support Routing', 'Routing to appropriate IT support team...'),
+    ('✅ Ticket Escalated', 'Successfully routed for manual handling.'),
+)
+
+_ticket_ids = itertools.count(1)
+
+def run_demo_workflow(sid, ticket_id, subject):
+    """
+    Stream the demo workflow steps for a ticket to the client that created it.
+    
+    Args:
+        sid: Socket.IO session ID of the requesting client
+        ticket_id: Sequential demo ticket number
+        subject: Ticket subject line
+    """
+    is_phishing = _PHISH_RE.search(subject) is not None
+    steps = (
+        (('📥 Ticket Received', f'Ticket #{ticket_id}: "{subject}"'),)
+        + _CLASSIFICATION_STEPS
+        + (_PHISHING_STEPS if is_phishing else _GENERAL_STEPS)
+    )
+    
+    for index, (title, description) in enumerate(steps):
+        if index:
+            socketio.sleep(_DEMO_STEP_INTERVAL)
+        socketio.emit('workflow_step', {'title': title, 'description': description}, to=sid)
+    
+    logger.info("Demo ticket #%d classified as %s", ticket_id,
+                'Phishing/Security' if is_phishing else 'General Inquiry')
+
+@socketio.on('create_ticket')
+def handle_create_ticket(data):
+    """
+    Classify a demo ticket and stream its workflow steps back to the client
+    Expected data: {'subject': 'ticket subject'}
+    """
+    subject = data.get('subject') if isinstance(data, dict) else None
+    subject = subject.strip() if isinstance(subject, str) else ''
+    if not subject:
+        emit('ticket_error', {
+            'error': 'Empty ticket subject',
+            'message': 'Please enter a ticket subject'
+        })
+        return
+    
+    # Steps are paced with socketio.sleep, so run them off the event handler
+    socketio.start_background_task(run_demo_workflow, request.sid, next(_ticket_ids), subject)
+
 def main():
     """Main entry point"""
     host = os.getenv('FLASK_HOST', '127.0.0.1')
     port = int(os.getenv('FLASK_PORT', '5000'))
     
-    logger.info(f"Starting NexusAI on {host}:{port}")
+    logger.info(f"Starting NexusAI on {host}:{port} (async mode: {socketio.async_mode})")
     logger.info("Multi-Agent System: Master Agent + PhishGuard Agent Ready")
     
     try:
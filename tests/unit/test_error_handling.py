@@ -0,0 +1,321 @@
+"""
+Unit tests for the NexusAI error handling and logging utilities.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from utils import error_handling
+from utils.error_handling import (
+    CircuitBreaker, CircuitBreakerError, ErrorHandler, ErrorRateCounter, configure_logging
+)
+
+
+class FakeClock:
+    """Settable stand-in for time.time and time.monotonic."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(error_handling.time, "time", fake)
+    monkeypatch.setattr(error_handling.time, "monotonic", fake)
+    return fake
+
+
+def call_through(breaker, fail=False):
+    """Make one synchronous call through the breaker, swallowing the service error."""
+    @breaker
+    def service():
+        if fail:
+            raise ConnectionError("service down")
+        return "ok"
+
+    try:
+        return service()
+    except ConnectionError:
+        return "failed"
+
+
+@pytest.fixture
+def restore_root_logger():
+    """Put the root logger back the way it was after configure_logging tests."""
+    root_logger = logging.getLogger()
+    handlers, level = root_logger.handlers[:], root_logger.level
+    yield
+    error_handling._stop_log_listener()
+    root_logger.handlers[:] = handlers
+    root_logger.setLevel(level)
+
+
+class TestConfigureLogging:
+    """Structured logging through the background log listener."""
+
+    @pytest.mark.parametrize("enable_async_logging", [True, False])
+    def test_json_logging_keeps_exception_separate(self, capsys, restore_root_logger, enable_async_logging):
+        configure_logging(enable_json_logging=True, enable_async_logging=enable_async_logging)
+        logger = logging.getLogger("nexusai.tests")
+
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Lookup failed for %s", "ticket-1")
+
+        # Stopping the listener flushes every queued record
+        error_handling._stop_log_listener()
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        entry = next(line for line in lines if line["logger"] == "nexusai.tests")
+
+        assert entry["message"] == "Lookup failed for ticket-1"
+        assert entry["level"] == "ERROR"
+        assert "ValueError: boom" in entry["exception"]
+        assert "Traceback" not in entry["message"]
+
+
+class TestCircuitBreaker:
+    """State transitions and tripping rules."""
+
+    def test_opens_after_threshold_failures_and_rejects_calls(self, clock):
+        breaker = CircuitBreaker("svc", failure_threshold=3, recovery_timeout=30)
+
+        for _ in range(2):
+            call_through(breaker, fail=True)
+        assert breaker.state == "CLOSED"
+
+        call_through(breaker, fail=True)
+        assert breaker.state == "OPEN"
+        assert breaker.failure_count == 3
+
+        with pytest.raises(CircuitBreakerError):
+            call_through(breaker)
+
+    def test_successful_probe_closes_breaker(self, clock):
+        breaker = CircuitBreaker("svc", failure_threshold=2, recovery_timeout=30)
+        call_through(breaker, fail=True)
+        call_through(breaker, fail=True)
+
+        clock.advance(29)
+        with pytest.raises(CircuitBreakerError):
+            call_through(breaker)
+
+        clock.advance(1)
+        assert call_through(breaker) == "ok"
+        assert breaker.state == "CLOSED"
+        assert breaker.failure_count == 0
+
+    def test_failed_probe_reopens_breaker(self, clock):
+        breaker = CircuitBreaker("svc", failure_threshold=2, recovery_timeout=30)
+        call_through(breaker, fail=True)
+        call_through(breaker, fail=True)
+
+        clock.advance(30)
+        assert call_through(breaker, fail=True) == "failed"
+        assert breaker.state == "OPEN"
+
+        # The failed probe restarts the recovery timeout
+        clock.advance(29)
+        with pytest.raises(CircuitBreakerError):
+            call_through(breaker)
+
+    @pytest.mark.asyncio
+    async def test_half_open_admits_a_single_probe(self, clock):
+        breaker = CircuitBreaker("svc", failure_threshold=1, recovery_timeout=30)
+        call_through(breaker, fail=True)
+        clock.advance(30)
+
+        release = asyncio.Event()
+
+        @breaker
+        async def service():
+            await release.wait()
+            return "ok"
+
+        probe = asyncio.ensure_future(service())
+        await asyncio.sleep(0)
+        assert breaker.state == "HALF_OPEN"
+
+        with pytest.raises(CircuitBreakerError):
+            await service()
+
+        release.set()
+        assert await probe == "ok"
+        assert breaker.state == "CLOSED"
+
+    def test_minimum_throughput_gates_tripping(self, clock):
+        breaker = CircuitBreaker("svc", failure_threshold=2, minimum_throughput=6, failure_ratio=0.5)
+
+        for _ in range(5):
+            call_through(breaker, fail=True)
+        assert breaker.state == "CLOSED"
+
+        call_through(breaker, fail=True)
+        assert breaker.state == "OPEN"
+
+    def test_failures_below_ratio_do_not_trip(self, clock):
+        breaker = CircuitBreaker("svc", failure_threshold=4, failure_ratio=0.5)
+
+        for _ in range(10):
+            call_through(breaker)
+            call_through(breaker)
+            call_through(breaker, fail=True)
+
+        assert breaker.state == "CLOSED"
+        assert breaker.failure_count == 10
+
+    def test_failures_expire_from_sampling_window(self, clock):
+        breaker = CircuitBreaker("svc", failure_threshold=3, sampling_duration=60)
+        call_through(breaker, fail=True)
+        call_through(breaker, fail=True)
+
+        clock.advance(60)
+        call_through(breaker, fail=True)
+
+        assert breaker.state == "CLOSED"
+        assert breaker.failure_count == 1
+
+    def test_unexpected_exceptions_are_not_counted(self, clock):
+        breaker = CircuitBreaker("svc", failure_threshold=1, expected_exception=ConnectionError)
+
+        @breaker
+        def service():
+            raise ValueError("bad input")
+
+        with pytest.raises(ValueError):
+            service()
+
+        assert breaker.state == "CLOSED"
+        assert breaker.failure_count == 0
+
+
+class TestErrorRateCounter:
+    """Rolling window totals."""
+
+    def test_errors_expire_from_each_window(self):
+        counter = ErrorRateCounter()
+        start = 1_000_000
+        counter.record(start)
+        counter.record(start)
+
+        assert counter.counts(start + 299) == {"last_hour": 2, "last_15_min": 2, "last_5_min": 2}
+        assert counter.counts(start + 300) == {"last_hour": 2, "last_15_min": 2, "last_5_min": 0}
+        assert counter.counts(start + 900) == {"last_hour": 2, "last_15_min": 0, "last_5_min": 0}
+        assert counter.counts(start + 3600) == {"last_hour": 0, "last_15_min": 0, "last_5_min": 0}
+
+    def test_matches_brute_force_count(self):
+        counter = ErrorRateCounter()
+        start = 1_000_000
+        timestamps = [start + offset for offset in (0, 5, 5, 120, 301, 899, 1500, 3599, 3700, 5000)]
+        for index, timestamp in enumerate(timestamps):
+            counter.record(timestamp)
+
+            for window, key in ((300, "last_5_min"), (900, "last_15_min"), (3600, "last_hour")):
+                expected = sum(1 for recorded in timestamps[:index + 1] if recorded > timestamp - window)
+                assert counter.counts(timestamp)[key] == expected
+
+    def test_long_idle_gap_resets_counts(self):
+        counter = ErrorRateCounter()
+        counter.record(1_000_000)
+
+        assert counter.counts(1_000_000 + 10 * 3600)["last_hour"] == 0
+
+
+class TestErrorHandlerRateLimit:
+    """Token-bucket suppression of error bursts."""
+
+    @pytest.fixture(autouse=True)
+    def error_handlers(self, monkeypatch):
+        """Keep this test's handlers out of the process-wide exit flush."""
+        handlers = error_handling.weakref.WeakSet()
+        monkeypatch.setattr(error_handling, "_error_handlers", handlers)
+        yield handlers
+        for handler in list(handlers):
+            if handler._summary_timer is not None:
+                handler._summary_timer.cancel()
+
+    def test_errors_over_the_limit_are_counted_but_not_logged(self, clock, caplog):
+        handler = ErrorHandler("nexusai.tests.errors", log_rate=1.0, log_burst=2)
+
+        with caplog.at_level(logging.WARNING, logger="nexusai.tests.errors"):
+            results = [handler.handle_error(ValueError("boom")) for _ in range(5)]
+
+        assert [result.get("suppressed", False) for result in results] == [False, False, True, True, True]
+        assert len(caplog.records) == 2
+        assert handler.get_error_stats()["ValueError"]["last_5_min"] == 5
+
+    def test_summary_is_logged_when_logging_resumes(self, clock, caplog):
+        handler = ErrorHandler("nexusai.tests.errors", log_rate=1.0, log_burst=1)
+        handler.handle_error(ValueError("first"))
+        handler.handle_error(ValueError("dropped"))
+        handler.handle_error(KeyError("dropped"))
+        handler.handle_error(ValueError("dropped"))
+
+        clock.advance(1)
+        with caplog.at_level(logging.WARNING, logger="nexusai.tests.errors"):
+            result = handler.handle_error(ValueError("after"))
+
+        assert "suppressed" not in result
+        messages = [record.getMessage() for record in caplog.records]
+        assert "Suppressed 2 ValueError errors in the last 1.0s (error rate limit exceeded)" in messages
+        assert "Suppressed 1 KeyError errors in the last 1.0s (error rate limit exceeded)" in messages
+        assert messages[-1] == "ValueError: after"
+
+        # The tally starts over after the summary
+        clock.advance(1)
+        with caplog.at_level(logging.WARNING, logger="nexusai.tests.errors"):
+            caplog.clear()
+            handler.handle_error(ValueError("again"))
+        assert [record.getMessage() for record in caplog.records] == ["ValueError: again"]
+
+    def test_summary_is_logged_if_logging_does_not_resume(self, clock, caplog):
+        handler = ErrorHandler("nexusai.tests.errors", log_rate=1.0, log_burst=1, summary_interval=0.01)
+
+        with caplog.at_level(logging.WARNING, logger="nexusai.tests.errors"):
+            handler.handle_error(ValueError("first"))
+            handler.handle_error(ValueError("dropped"))
+            handler.handle_error(ValueError("dropped"))
+            handler._summary_timer.join()
+
+        messages = [record.getMessage() for record in caplog.records]
+        assert messages == [
+            "ValueError: first",
+            "Suppressed 2 ValueError errors in the last 0.0s (error rate limit exceeded)",
+        ]
+
+    def test_pending_summary_is_flushed_at_exit(self, clock, caplog):
+        handler = ErrorHandler("nexusai.tests.errors", log_rate=1.0, log_burst=1)
+        handler.handle_error(ValueError("first"))
+        handler.handle_error(KeyError("dropped"))
+
+        caplog.clear()
+        with caplog.at_level(logging.WARNING, logger="nexusai.tests.errors"):
+            error_handling._flush_suppressed_errors()
+
+        assert [record.getMessage() for record in caplog.records] == [
+            "Suppressed 1 KeyError errors in the last 0.0s (error rate limit exceeded)"
+        ]
+        assert handler._summary_timer is None
+
+    def test_least_recently_seen_error_type_is_evicted(self, clock):
+        handler = ErrorHandler("nexusai.tests.errors", max_error_types=2)
+        handler.handle_error(ValueError("a"))
+        handler.handle_error(KeyError("b"))
+        handler.handle_error(ValueError("a again"))
+        handler.handle_error(TypeError("c"))
+
+        assert list(handler.error_counts) == ["ValueError", "TypeError"]
@@ -0,0 +1,156 @@
+"""
+Unit tests for the MCP client's direct and micro-batched tool call paths.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# backend.tools imports the MCP server module, which needs the mcp package
+pytest.importorskip("mcp")
+
+from backend.tools.mcp_client import MCPClient
+
+
+CALLS = [
+    ("analyze_email_for_iocs", {"email_subject": "URGENT: verify your payment details"}),
+    ("analyze_email_for_iocs", {"email_subject": "Team lunch on Friday"}),
+    ("log_action_for_ui", {"message": "Analysis started", "agent": "PhishGuard"}),
+    ("unknown_tool", {}),
+]
+
+
+@pytest.fixture
+def make_client(monkeypatch, tmp_path):
+    """Build MCP clients without simulated latency or a shared tool catalog cache."""
+    monkeypatch.setenv("NEXUSAI_SIMULATE_MCP_DELAY", "false")
+    monkeypatch.setattr(MCPClient, "_TOOL_CATALOG_CACHE_PATH", tmp_path / "mcp_tools.json")
+    clients = []
+
+    def factory(**kwargs):
+        client = MCPClient(**kwargs)
+        clients.append(client)
+        return client
+
+    yield factory
+
+    for client in clients:
+        client._released = True
+
+
+async def call_concurrently(client):
+    return await asyncio.gather(*(client.call_tool(tool_name, arguments) for tool_name, arguments in CALLS))
+
+
+def test_micro_batching_is_opt_in(make_client):
+    assert make_client().batch_size == 1
+
+
+@pytest.mark.asyncio
+async def test_direct_calls_do_not_use_batch_path(make_client):
+    client = make_client()
+    batch_calls = []
+    original = client.call_tools_batch
+
+    async def spy(calls):
+        batch_calls.append(calls)
+        return await original(calls)
+
+    client.call_tools_batch = spy
+    await call_concurrently(client)
+    await client.close()
+
+    assert batch_calls == []
+
+
+@pytest.mark.asyncio
+async def test_batched_and_direct_calls_return_same_results(make_client):
+    direct = make_client()
+    batched = make_client(batch_size=len(CALLS), batch_wait_ms=50)
+    batch_calls = []
+    original = batched.call_tools_batch
+
+    async def spy(calls):
+        batch_calls.append(calls)
+        return await original(calls)
+
+    batched.call_tools_batch = spy
+
+    direct_results = await call_concurrently(direct)
+    batched_results = await call_concurrently(batched)
+    await direct.close()
+    await batched.close()
+
+    # The concurrent calls really were coalesced into a single batch
+    assert [len(calls) for calls in batch_calls] == [len(CALLS)]
+    assert batched_results == direct_results
+    assert [result["success"] for result in direct_results] == [True, True, True, False]
+    assert direct_results[0]["iocs_found"] == 2
+    assert direct_results[1]["iocs_found"] == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cached_tools", [
+    ["log_action_for_ui"],
+    [{"description": "no name"}],
+    [{"name": 42}],
+    {"name": "log_action_for_ui"},
+])
+async def test_malformed_tool_catalog_cache_is_a_miss(make_client, cached_tools):
+    client = make_client()
+    cache_key = client._tool_catalog_cache_key()
+    with open(MCPClient._TOOL_CATALOG_CACHE_PATH, "w", encoding="utf-8") as cache_file:
+        json.dump({"cache_key": cache_key, "tools": cached_tools}, cache_file)
+
+    client.is_connected = False
+    assert await client.connect()
+    await client.close()
+
+    assert "analyze_email_for_iocs" in client._tool_names_set
+    # The rediscovered catalog replaces the malformed one
+    with open(MCPClient._TOOL_CATALOG_CACHE_PATH, "r", encoding="utf-8") as cache_file:
+        assert client._load_tool_catalog(cache_key) == json.load(cache_file)["tools"]
+
+
+@pytest.mark.asyncio
+async def test_has_tool_checks_discovered_catalog(make_client):
+    client = make_client()
+
+    assert await client.has_tool("block_malicious_urls")
+    assert not await client.has_tool("unknown_tool")
+    await client.close()
+
+
+def test_connect_lock_is_per_event_loop(make_client):
+    session = make_client()._session
+
+    async def get_locks():
+        return session.connect_lock, session.connect_lock
+
+    first_a, first_b = asyncio.run(get_locks())
+    second, _ = asyncio.run(get_locks())
+
+    assert first_a is first_b
+    assert first_a is not second
+
+
+@pytest.mark.asyncio
+async def test_close_delivers_queued_ui_updates(make_client):
+    emitted = []
+
+    class SlowSocketIO:
+        async def emit(self, event, batch):
+            await asyncio.sleep(0.01)
+            emitted.extend(update["status"] for update in batch)
+
+    client = make_client(socketio_client=SlowSocketIO())
+    result = await client.call_tool("log_action_for_ui", {"message": "done"})
+    await client.close()
+
+    assert result["success"]
+    assert emitted == ["started", "completed"]
@@ -0,0 +1,47 @@
+"""
+Unit tests for the security tools MCP server.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+pytest.importorskip("mcp")
+
+from backend.tools import security_mcp_server
+from backend.tools.mcp_client import MCPClient
+
+
+@pytest.mark.asyncio
+async def test_server_serves_every_simulated_client_tool(monkeypatch, tmp_path):
+    monkeypatch.setattr(MCPClient, "_TOOL_CATALOG_CACHE_PATH", tmp_path / "mcp_tools.json")
+    listed = {tool.name for tool in await security_mcp_server.handle_list_tools()}
+
+    client = MCPClient()
+    client_tools = set(client._sim_dispatch)
+    await client.close()
+
+    assert client_tools <= listed
+    assert listed == set(security_mcp_server._HANDLERS)
+
+
+@pytest.mark.asyncio
+async def test_block_malicious_urls_reports_each_url():
+    urls = ["http://evil-domain.net/steal-credentials", "http://malicious-phishing-site.com/login"]
+
+    response = json.loads(await security_mcp_server.invoke(
+        "block_malicious_urls", {"urls": urls, "reason": "Phishing threat from ticket SIM-1"}
+    ))
+
+    assert response["success"] is True
+    assert response["blocked_count"] == 2
+    assert [result["url"] for result in response["results"]] == urls
+    for result in response["results"]:
+        assert result["status"] == "blocked"
+        assert result["block_id"].startswith("BLK-")
+        assert f"- URL: {result['url']}" in result["details"]
+        assert f"- Block ID: {result['block_id']}" in result["details"]
@@ -0,0 +1,117 @@
+"""
+Unit tests for the demo page and health endpoints served by the web app.
+"""
+
+import gzip
+import json
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_socketio")
+pytest.importorskip("dotenv")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend', 'web'))
+
+import main
+
+
+@pytest.fixture
+def client():
+    return main.app.test_client()
+
+
+class TestDemoPage:
+    """GET/HEAD / with content negotiation and revalidation."""
+
+    def test_identity_encoding(self, client):
+        response = client.get('/')
+
+        assert response.status_code == 200
+        assert response.headers['Content-Type'] == 'text/html; charset=utf-8'
+        assert 'Content-Encoding' not in response.headers
+        assert response.headers['Vary'] == 'Accept-Encoding'
+        assert response.data == main.DEMO_HTML.encode('utf-8')
+
+    def test_gzip_encoding(self, client):
+        response = client.get('/', headers={'Accept-Encoding': 'gzip, deflate'})
+
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert int(response.headers['Content-Length']) == len(response.data)
+        assert gzip.decompress(response.data) == main.DEMO_HTML.encode('utf-8')
+
+    def test_encodings_have_distinct_etags(self, client):
+        plain = client.get('/')
+        gzipped = client.get('/', headers={'Accept-Encoding': 'gzip'})
+
+        assert plain.headers['ETag'] != gzipped.headers['ETag']
+
+    def test_head_has_headers_but_no_body(self, client):
+        response = client.head('/')
+
+        assert response.status_code == 200
+        assert response.data == b''
+        assert int(response.headers['Content-Length']) == len(main.DEMO_HTML.encode('utf-8'))
+
+    @pytest.mark.parametrize("accept_encoding", ['', 'gzip'])
+    def test_if_none_match_returns_not_modified(self, client, accept_encoding):
+        headers = {'Accept-Encoding': accept_encoding}
+        etag = client.get('/', headers=headers).headers['ETag']
+
+        response = client.get('/', headers={**headers, 'If-None-Match': etag})
+
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == etag
+
+    def test_etag_of_other_encoding_does_not_match(self, client):
+        gzip_etag = client.get('/', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+
+        response = client.get('/', headers={'If-None-Match': gzip_etag})
+
+        assert response.status_code == 200
+
+    def test_other_methods_are_not_allowed(self, client):
+        response = client.post('/')
+
+        assert response.status_code == 405
+        assert 'GET' in response.headers['Allow']
+
+
+class TestHealth:
+    """GET/HEAD /health."""
+
+    def test_health(self, client):
+        response = client.get('/health')
+
+        assert response.status_code == 200
+        assert response.headers['Content-Type'] == 'application/json'
+        payload = json.loads(response.data)
+        assert payload['status'] == 'healthy'
+        assert payload['service'] == 'NexusAI'
+        assert isinstance(payload['timestamp'], float)
+
+    def test_head_health(self, client):
+        response = client.head('/health')
+
+        assert response.status_code == 200
+        assert response.data == b''
+
+
+def test_unknown_paths_reach_flask(client):
+    assert client.get('/does-not-exist').status_code == 404
+
+
+@pytest.mark.parametrize("payload", [{'subject': None}, {'subject': 123}, {'subject': '   '}, {}, 'subject'])
+def test_create_ticket_rejects_missing_subject(payload):
+    socket_client = main.socketio.test_client(main.app)
+
+    socket_client.emit('create_ticket', payload)
+    errors = [message for message in socket_client.get_received() if message['name'] == 'ticket_error']
+    socket_client.disconnect()
+
+    assert len(errors) == 1
+    assert errors[0]['args'][0]['error'] == 'Empty ticket subject'